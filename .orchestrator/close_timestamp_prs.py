@@ -1,23 +1,35 @@
-﻿from github import Github, Auth
-import os, re
-gh = Github(auth=Auth.Token(os.environ["GITHUB_TOKEN"]))
-repo = gh.get_repo(os.environ.get("AIO_TARGET_REPO","carfinancinghub/cfh"))
+﻿import os, re, sys
+from pathlib import Path
+
+# repo root on sys.path so app.* imports when run as a script
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from app.services.github_api import open_api  # noqa: E402
+
+repo_name = os.environ.get("AIO_TARGET_REPO","carfinancinghub/cfh")
+api = open_api(repo_name, os.environ["GITHUB_TOKEN"])
+if api is None:
+    raise SystemExit("no HTTP client available (pip install requests)")
 
 rolling = "ts-migration/generated-staging"
 stamp_re = re.compile(r"^ts-migration/generated-\d{8}_\d{6}$")
 closed = []
 kept   = []
 
-for pr in repo.get_pulls(state="open"):
-    ref = pr.head.ref or ""
+# one ETag-revalidated listing (pages come back as 304s when nothing changed)
+for pr in api.open_pulls():
+    ref = pr["head"]["ref"] or ""
     if ref == rolling:
-        kept.append((pr.number, ref, "rolling"))
+        kept.append((pr["number"], ref, "rolling"))
         continue
     if stamp_re.match(ref):
-        pr.edit(state="closed")
-        closed.append((pr.number, ref))
+        api.close_pull(pr["number"])
+        closed.append((pr["number"], ref))
     else:
-        kept.append((pr.number, ref, "non-migration-or-fixed"))
+        kept.append((pr["number"], ref, "non-migration-or-fixed"))
 
 print("Closed:", closed)
 print("Kept:", kept)
+print("GitHub:", api.stats())
@@ -6,11 +6,13 @@ Routes for AI Orchestrator:
 - Providers info (placeholder)
 - Convert endpoints (tree/file)
 - Reports helper to fetch latest summary
+- Run store queries (runs, latest PR, gate pass rate)
 """
 
 import json
 import os
 import re
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -235,3 +237,36 @@ def reports_latest(
         "preview": preview,
         "label": label,
     }
+
+
+# ---------------------------
+# Run store (core/storage.py)
+# ---------------------------
+
+@router.get("/runs", tags=["reports"], name="runs_query")
+def runs_query(
+    run_id: Optional[str] = Query(None, description="Return this run with its files, gates, PRs and timings"),
+    limit: int = Query(20, ge=1, le=500, description="Recent runs to list when run_id is omitted"),
+    days: float = Query(7.0, gt=0, le=365, description="Window for the gate pass rate"),
+    step: Optional[str] = Query(None, description="Scope the pass rate to one gate step (build/test/lint)"),
+) -> Dict[str, Any]:
+    """
+    Indexed lookups against the run store instead of scanning reports/:
+    one run (with its latest PR), or recent runs plus the gate pass rate.
+    """
+    from core.storage import open_store
+
+    store = open_store()
+    if store is None:
+        return {"ok": False, "error": "run_store_disabled"}
+    if run_id:
+        run = store.run(run_id)
+        if run is None:
+            return {"ok": False, "error": "run_not_found", "run_id": run_id}
+        return {"ok": True, "run": run, "latest_pr": store.latest_pr(run_id)}
+    return {
+        "ok": True,
+        "runs": store.recent_runs(limit),
+        "latest_pr": store.latest_pr(),
+        "pass_rate": store.pass_rate(time.time() - days * 86400, step),
+    }
@@ -142,6 +142,34 @@ def _repo_rel(p: Path, base: Path | None = None) -> str:
 def _ensure_dir(d: Path) -> None:
     d.mkdir(parents=True, exist_ok=True)
 
+def _dependency_finder(repo_root: str):
+    """
+    (src, text) -> dependency list. Real resolved imports from the import
+    index (repo-relative paths) when the index is enabled and `src` lives
+    under `repo_root`; the keyword heuristic otherwise.
+    """
+    idx = None
+    root = Path(repo_root)
+    if root.is_dir():
+        try:
+            from app.import_index import open_index
+            idx = open_index()
+            if idx is not None:
+                idx.sync(root)
+        except Exception:
+            idx = None
+
+    def find(src: Path, text: str) -> list[str]:
+        if idx is not None:
+            try:
+                src.resolve().relative_to(root.resolve())
+            except ValueError:
+                return _infer_dependencies(text)
+            return [_repo_rel(d, root) for d in idx.dependencies(src)]
+        return _infer_dependencies(text)
+
+    return find
+
 def _infer_dependencies(text: str) -> list[str]:
     # VERY lightweight heuristic—extend over time
     deps: list[str] = []
@@ -233,6 +261,7 @@ def review_batch(paths: list[str], tier: str, label: str | None, reports_dir: Pa
     batch_lines.append(f"_Label:_ `{label}`  •  _Count:_ `{len(paths)}`")
     batch_lines.append("")
 
+    find_deps = _dependency_finder(os.getenv("FRONTEND_ROOT", r"C:\CFH\frontend"))
     for p_str in paths:
         p = Path(p_str)
         text = _read_text(p)
@@ -249,7 +278,7 @@ def review_batch(paths: list[str], tier: str, label: str | None, reports_dir: Pa
             except Exception:
                 dest = None
 
-        deps = _infer_dependencies(text)
+        deps = find_deps(p, text)
         deps_map[rel] = deps
 
         # Per-file .md
@@ -396,6 +425,7 @@ def review_batch(paths: List[str],
     batch_lines.append(f"_Label:_ `{label}`  •  _Count:_ `{len(paths)}`")
     batch_lines.append("")
 
+    find_deps = _dependency_finder(os.getenv("FRONTEND_ROOT", r"C:\CFH\frontend"))
     for p_str in paths:
         p = Path(p_str)
         text = _read_text(p)
@@ -412,7 +442,7 @@ def review_batch(paths: List[str],
             except Exception:
                 dest = None
 
-        deps = _infer_dependencies(text)
+        deps = find_deps(p, text)
         deps_map[rel] = deps
 
         md_body = _tiers_block(p, text, tier=tier, dest_path=dest, deps=deps)
@@ -1,39 +1,13 @@
-import { globby } from "globby";
 import fs from "node:fs/promises";
 import path from "node:path";
 import * as babel from "@babel/parser";
 import traverse from "@babel/traverse";
 import * as t from "@babel/types";
+import { pathToFileURL } from "node:url";
 
-const FRONTEND = process.env.FRONTEND_PATH || "C:/Backup_Projects/CFH/frontend";
-const stamp = (process.env.stamp && process.env.stamp.trim())
-  ? process.env.stamp.trim()
-  : new Date().toISOString().replace(/[-:TZ]/g,"").slice(0,15);
-
-const outDir = path.join(process.cwd(), "reports", "analysis", stamp);
-await fs.mkdir(outDir, { recursive: true });
-
-// IMPORTANT: use cwd = FRONTEND and relative patterns. Ask for absolute paths back.
-const files = await globby(
-  ["src/**/*.{ts,tsx,js,jsx}"],
-  {
-    cwd: FRONTEND.replace(/\\/g,"/"),
-    absolute: true,
-    gitignore: true,
-    ignore: [
-      "**/node_modules/**",
-      "**/dist/**",
-      "**/.{git,idea,cache,output,temp}/**",
-      "**/conversion/**",
-      "**/backend/**"
-    ]
-  }
-);
-
-const results = [];
-for (const f of files) {
-  const code = await fs.readFile(f, "utf8").catch(() => "");
-  if (!code) { results.push({ file: f, parseError: "empty or unreadable" }); continue; }
+// Per-file analysis; also served by the persistent worker (app/services/node_worker.mjs).
+export function analyzeSource(f, code) {
+  if (!code) return { file: f, parseError: "empty or unreadable" };
 
   let ast;
   try {
@@ -50,8 +24,7 @@ for (const f of files) {
       ],
     });
   } catch (e) {
-    results.push({ file: f, parseError: String(e.message || e) });
-    continue;
+    return { file: f, parseError: String(e.message || e) };
   }
 
   const info = {
@@ -133,30 +106,67 @@ for (const f of files) {
   info.imports = [...new Set(info.imports)].sort();
   info.exports = [...new Set(info.exports)].sort();
 
-  results.push(info);
+  return info;
 }
 
-await fs.writeFile(path.join(outDir, "plan.json"), JSON.stringify(results, null, 2), "utf8");
+async function main() {
+  const FRONTEND = process.env.FRONTEND_PATH || "C:/Backup_Projects/CFH/frontend";
+  const stamp = (process.env.stamp && process.env.stamp.trim())
+    ? process.env.stamp.trim()
+    : new Date().toISOString().replace(/[-:TZ]/g,"").slice(0,15);
+
+  const outDir = path.join(process.cwd(), "reports", "analysis", stamp);
+  await fs.mkdir(outDir, { recursive: true });
+
+  const { globby } = await import("globby");
+  // IMPORTANT: use cwd = FRONTEND and relative patterns. Ask for absolute paths back.
+  const files = await globby(
+    ["src/**/*.{ts,tsx,js,jsx}"],
+    {
+      cwd: FRONTEND.replace(/\\/g,"/"),
+      absolute: true,
+      gitignore: true,
+      ignore: [
+        "**/node_modules/**",
+        "**/dist/**",
+        "**/.{git,idea,cache,output,temp}/**",
+        "**/conversion/**",
+        "**/backend/**"
+      ]
+    }
+  );
+
+  const results = [];
+  for (const f of files) {
+    const code = await fs.readFile(f, "utf8").catch(() => "");
+    results.push(analyzeSource(f, code));
+  }
+
+  await fs.writeFile(path.join(outDir, "plan.json"), JSON.stringify(results, null, 2), "utf8");
+
+  const lines = [];
+  lines.push(`# Frontend Analysis (${stamp})\n`);
+  lines.push(`Scanned files: ${results.length}\n`);
+  for (const r of results) {
+    const rel = path.relative(FRONTEND, r.file).replace(/\\/g,"/");
+    lines.push(`## ${rel}`);
+    if (r.parseError) { lines.push(`- ❌ Parse error: \`${r.parseError}\`\n`); continue; }
+    lines.push(`- Exports: ${r.exports.length ? '\`' + r.exports.join('\`, \`') + '\`' : '_none_'}${r.hasDefaultExport ? ' (default export)' : ''}`);
+    lines.push(`- React component: ${r.reactComponent ? 'yes' : 'no'}`);
+    if (r.hooks.length) lines.push(`- Hooks: \`${r.hooks.join('`, `')}\``);
+    if (r.apis.length)  lines.push(`- API: \`${r.apis.join('`, `')}\``);
+    if (r.sideEffects.length) lines.push(`- Side-effects: \`${r.sideEffects.join('`, `')}\``);
+    if (r.imports.length) lines.push(`- Imports: \`${r.imports.slice(0,10).join('`, `')}${r.imports.length>10?'` …':''}\``);
+    const sugg = [];
+    if (r.reactComponent && !rel.endsWith('.tsx')) sugg.push('🔁 consider `.tsx`');
+    if (r.exports.length === 0) sugg.push('🧹 dead code check');
+    if (sugg.length) lines.push(`- Suggestions: ${sugg.join('; ')}`);
+    lines.push('');
+  }
+  await fs.writeFile(path.join(outDir, "report.md"), lines.join("\n"), "utf8");
 
-const lines = [];
-lines.push(`# Frontend Analysis (${stamp})\n`);
-lines.push(`Scanned files: ${results.length}\n`);
-for (const r of results) {
-  const rel = path.relative(FRONTEND, r.file).replace(/\\/g,"/");
-  lines.push(`## ${rel}`);
-  if (r.parseError) { lines.push(`- ❌ Parse error: \`${r.parseError}\`\n`); continue; }
-  lines.push(`- Exports: ${r.exports.length ? '\`' + r.exports.join('\`, \`') + '\`' : '_none_'}${r.hasDefaultExport ? ' (default export)' : ''}`);
-  lines.push(`- React component: ${r.reactComponent ? 'yes' : 'no'}`);
-  if (r.hooks.length) lines.push(`- Hooks: \`${r.hooks.join('`, `')}\``);
-  if (r.apis.length)  lines.push(`- API: \`${r.apis.join('`, `')}\``);
-  if (r.sideEffects.length) lines.push(`- Side-effects: \`${r.sideEffects.join('`, `')}\``);
-  if (r.imports.length) lines.push(`- Imports: \`${r.imports.slice(0,10).join('`, `')}${r.imports.length>10?'` …':''}\``);
-  const sugg = [];
-  if (r.reactComponent && !rel.endsWith('.tsx')) sugg.push('🔁 consider `.tsx`');
-  if (r.exports.length === 0) sugg.push('🧹 dead code check');
-  if (sugg.length) lines.push(`- Suggestions: ${sugg.join('; ')}`);
-  lines.push('');
+  console.log(`Wrote: ${path.join(outDir, "report.md")}`);
 }
-await fs.writeFile(path.join(outDir, "report.md"), lines.join("\n"), "utf8");
 
-console.log(`Wrote: ${path.join(outDir, "report.md")}`);
+const isMain = process.argv[1] && import.meta.url === pathToFileURL(path.resolve(process.argv[1])).href;
+if (isMain) await main();
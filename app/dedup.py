@@ -1,8 +1,10 @@
 from __future__ import annotations
 import os, csv, shutil
-from collections import defaultdict
 from typing import List, Tuple
 
+from core.dedup_engine import group_by_content
+from core.walker import walk_files
+
 SKIP_DIRS = {".git","node_modules","dist","build","coverage",".next",".turbo",".yarn",".pnpm-store",".cache"}
 PREF = (".ts",".tsx",".js",".jsx")
 
@@ -14,26 +16,21 @@ def _pref_key(p: str) -> int:
     return len(PREF) + 1
 
 def duplicate_elimination(scan_roots: List[str], consolidated_dir: str=r"C:\cfh_consolidated") -> Tuple[str,str]:
-    groups: dict[tuple[str,int], list[str]] = defaultdict(list)
-    for root in scan_roots or []:
-        root = os.path.abspath(root)
-        for dirpath, dirnames, filenames in os.walk(root):
-            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
-            for fn in filenames:
-                fp = os.path.join(dirpath, fn)
-                try:
-                    sz = os.path.getsize(fp)
-                except OSError:
-                    continue
-                groups[(os.path.basename(fn), sz)].append(fp)
+    # byte-identical groups: size -> 4 KB head hash -> full hash (only on collisions)
+    roots = [os.path.abspath(r) for r in (scan_roots or [])]
+    entries = [(e.path, e.size) for e in walk_files(roots, skip_dirs=SKIP_DIRS)]
+    content_groups, _stats = group_by_content(entries)
 
     rows = []
     conv = []
     os.makedirs("reports", exist_ok=True)
     os.makedirs(consolidated_dir, exist_ok=True)
 
-    for (base, sz), paths in groups.items():
+    for g in content_groups:
+        paths = [str(p) for p in g.paths]
+        sz = g.size
         winner = sorted(paths, key=_pref_key)[0]
+        base = os.path.basename(winner)
         losers = [p for p in paths if p != winner]
         if winner.lower().endswith((".js",".jsx")) and not any(p.lower().endswith((".ts",".tsx")) for p in paths):
             conv.append(winner)
@@ -1,7 +1,11 @@
 from __future__ import annotations
 import argparse, csv, hashlib, os, re, shutil, sys
 from pathlib import Path
-from typing import Iterable, Dict, List, Tuple
+from typing import Iterable, List, Tuple
+
+from core.dedup_engine import group_by_content
+from core.near_dedup import NearDupConfig, cluster_files
+from core.walker import WalkEntry, walk_files
 
 NUMERIC_RUN = re.compile(r"\d{3,}")  # any 3+ consecutive digits
 
@@ -19,29 +23,30 @@ def is_numeric_junk(stem: str) -> bool:
         return True
     return False
 
+def iter_entries(roots: Iterable[Path], exts: Iterable[str], skip_dirs: Iterable[str]) -> List[WalkEntry]:
+    # skip dirs are pruned before descent; roots are walked concurrently
+    return walk_files(roots, skip_dirs=skip_dirs, exts=exts,
+                      skip_file=lambda name: is_numeric_junk(Path(name).stem))
+
 def iter_files(roots: Iterable[Path], exts: Iterable[str], skip_dirs: Iterable[str]) -> Iterable[Path]:
-    exts_l = {("." + e.lower().lstrip(".")) for e in exts}
-    skip_set = {d.lower() for d in skip_dirs}
-    for root in roots:
-        root = Path(root)
-        if not root.exists():
-            continue
-        for p in root.rglob("*"):
-            if p.is_dir():
-                # skip by directory name anywhere in path
-                if any(part.lower() in skip_set for part in p.parts):
-                    continue
-                continue
-            if any(part.lower() in skip_set for part in p.parts):
-                continue
-            ext = p.suffix.lower()
-            if ext in exts_l and not is_numeric_junk(p.stem):
-                yield p
+    for e in iter_entries(roots, exts, skip_dirs):
+        yield e.path
 
-def choose_best(files: List[Path]) -> Path:
+def _best_key(p: Path) -> Tuple[int, int]:
     # prefer by extension order; tie-break by shortest path (stable)
-    files = sorted(files, key=lambda p: (PREF_ORDER.index(p.suffix.lower()) if p.suffix.lower() in PREF_ORDER else 99, len(str(p))))
-    return files[0]
+    return (PREF_ORDER.index(p.suffix.lower()) if p.suffix.lower() in PREF_ORDER else 99, len(str(p)))
+
+def choose_best(files: List[Path]) -> Path:
+    return sorted(files, key=_best_key)[0]
+
+def write_near_dup_report(clusters, path: Path) -> None:
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=["cluster", "representative", "member", "similarity"])
+        w.writeheader()
+        for i, c in enumerate(sorted(clusters, key=lambda c: str(c.representative).lower())):
+            for m in c.members:
+                w.writerow({"cluster": i, "representative": str(c.representative),
+                            "member": str(m), "similarity": f"{c.similarity.get(m, 0.0):.3f}"})
 
 def main(argv: List[str]) -> int:
     ap = argparse.ArgumentParser(description="CFH dedup + numeric junk filter")
@@ -50,6 +55,9 @@ def main(argv: List[str]) -> int:
     ap.add_argument("--exts", default="js,jsx,ts,tsx")
     ap.add_argument("--out", default=r"C:\cfh_consolidated")
     ap.add_argument("--reports", default="reports")
+    ap.add_argument("--near-dup", action="store_true", default=os.getenv("AIO_NEAR_DUP", "0") == "1",
+                    help="collapse near-duplicate keepers (MinHash/LSH; needs numpy)")
+    ap.add_argument("--near-threshold", type=float, default=float(os.getenv("AIO_NEAR_DUP_THRESHOLD", "0.8")))
     args = ap.parse_args(argv)
 
     roots = []
@@ -69,23 +77,25 @@ def main(argv: List[str]) -> int:
     reports_root.mkdir(parents=True, exist_ok=True)
     reports_root.joinpath("debug").mkdir(parents=True, exist_ok=True)
 
-    groups: Dict[Tuple[str,int], List[Path]] = {}
     candidates: List[Path] = []
 
-    for f in iter_files(roots, exts, skip_dirs):
-        key = (f.stem.lower(), f.stat().st_size)
-        groups.setdefault(key, []).append(f)
+    # byte-identical groups; full reads only for size + 4 KB head-hash collisions
+    entries = [(e.path, e.size) for e in iter_entries(roots, exts, skip_dirs)]
+    groups, stats = group_by_content(entries)
+    print(f"[dedup] files={stats.files} head_hashed={stats.head_hashed} "
+          f"full_hashed={stats.full_hashed} dup_groups={stats.duplicate_groups}", file=sys.stderr)
 
     keepers: List[Path] = []
     eliminated_rows = []
 
-    for key, files in groups.items():
+    for g in groups:
+        files = g.paths
         keep = choose_best(files)
         keepers.append(keep)
         discarded = [p for p in files if p != keep]
         eliminated_rows.append({
-            "stem": key[0],
-            "size": key[1],
+            "stem": keep.stem.lower(),
+            "size": g.size,
             "keep": str(keep),
             "kept_ext": keep.suffix.lower(),
             "discard_count": len(discarded),
@@ -94,6 +104,16 @@ def main(argv: List[str]) -> int:
         if keep.suffix.lower() in (".js", ".jsx"):
             candidates.append(keep)
 
+    # near-duplicate pass over keepers: one canonical representative per cluster
+    if args.near_dup:
+        clusters = cluster_files(keepers, _best_key, NearDupConfig(threshold=args.near_threshold))
+        near = [c for c in clusters if len(c.members) > 1]
+        write_near_dup_report(near, reports_root / "near_duplicate_clusters.csv")
+        candidates = [c.representative for c in clusters
+                      if c.representative.suffix.lower() in (".js", ".jsx")]
+        print(f"[near-dup] keepers={len(keepers)} clusters={len(clusters)} "
+              f"collapsed={sum(len(c.members) - 1 for c in near)}", file=sys.stderr)
+
     # Copy keepers into out_dir (ensure uniqueness)
     for i, src in enumerate(keepers):
         digest = hashlib.sha1(str(src).encode("utf-8")).hexdigest()[:8]
@@ -24,6 +24,14 @@ class Health(BaseModel):
     consolidation_uniques: int | None
 
 def _latest_run_id() -> str | None:
+    try:
+        from core.storage import open_store
+        st = open_store()
+        run_id = st.latest_run_id() if st else None
+        if run_id:
+            return run_id
+    except Exception:
+        pass
     p = REPORTS / "latest_run_id.txt"
     if p.exists():
         try:
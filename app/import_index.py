@@ -0,0 +1,277 @@
+# Path: app/import_index.py
+"""
+Persistent, incremental import-graph index of a frontend tree (SQLite).
+
+Per file it stores size / mtime / sha1 and the raw import specifiers from
+the lexer; resolved edges (importer -> imported file) live in their own
+table, indexed both ways, so "dependencies of X" and "dependents of X" are
+single index lookups.
+
+sync(root) re-lexes only files whose size or mtime moved (and whose sha1
+actually changed). Edges are re-resolved for changed files only, unless a
+file was added or removed or the alias map changed, in which case every
+stored specifier is re-resolved (no re-lexing; linear in the edge count).
+Resolution rules (relative paths, tsconfig paths/baseUrl aliases, index
+files) are core.affected.resolve_import.
+
+batches() gives a leaf-first topological order: no file comes before
+anything it imports, directly or through files outside the requested set.
+Import cycles are emitted together as one final batch.
+
+Env:
+  AIO_IMPORT_INDEX : SQLite path (default reports/import_index.sqlite);
+                     "0" / "off" / "false" disables the index.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.affected import ImportGraph, aliases_for, resolve_import
+from core.js_lexer import scan_sources
+from core.walker import SOURCE_EXTS, walk_files
+
+SCHEMA_VERSION = "1"
+DEFAULT_DB = Path("reports") / "import_index.sqlite"
+
+
+@dataclass
+class SyncStats:
+    seen: int = 0
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    resolved: int = 0  # files whose edges were recomputed
+    elapsed_ms: float = 0.0
+
+
+def index_path_from_env() -> Optional[Path]:
+    raw = os.getenv("AIO_IMPORT_INDEX", "").strip()
+    if raw.lower() in {"0", "off", "false", "no"}:
+        return None
+    return Path(raw) if raw else DEFAULT_DB
+
+
+class ImportIndex:
+    """Thread-safe wrapper around the on-disk graph."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            row = self._conn.execute("SELECT value FROM meta WHERE key='schema'").fetchone()
+            if row and row[0] != SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS files")
+                self._conn.execute("DROP TABLE IF EXISTS edges")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path     TEXT PRIMARY KEY,
+                    root     TEXT NOT NULL,
+                    size     INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    sha1     TEXT NOT NULL,
+                    specs    TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS files_root ON files(root);
+                CREATE TABLE IF NOT EXISTS edges (
+                    src TEXT NOT NULL,
+                    dst TEXT NOT NULL,
+                    PRIMARY KEY (src, dst)
+                );
+                CREATE INDEX IF NOT EXISTS edges_dst ON edges(dst);
+                """
+            )
+            self._conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('schema', ?)", (SCHEMA_VERSION,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---- refresh ------------------------------------------------------------
+    def sync(self, root: Path, aliases: Optional[Dict[str, str]] = None) -> SyncStats:
+        """Bring the graph for everything under `root` up to date."""
+        t0 = time.perf_counter()
+        root = Path(root).resolve()
+        aliases = aliases if aliases is not None else aliases_for(root)
+        stats = SyncStats()
+        entries = [(e.path.resolve(), e.size, e.mtime_ns) for e in walk_files([root], exts=SOURCE_EXTS)]
+        with self._lock:
+            known = {r[0]: (r[1], r[2], r[3], r[4]) for r in self._conn.execute(
+                "SELECT path, size, mtime_ns, sha1, specs FROM files WHERE root=?", (str(root),))}
+            alias_key = f"aliases:{root}"
+            row = self._conn.execute("SELECT value FROM meta WHERE key=?", (alias_key,)).fetchone()
+            aliases_json = json.dumps(aliases, sort_keys=True)
+            aliases_changed = row is None or row[0] != aliases_json
+
+            todo: List[Tuple[Path, int, int, str, str]] = []  # path, size, mtime, sha1, text
+            touches: List[Tuple[int, int, str]] = []
+            for path, size, mtime in entries:
+                stats.seen += 1
+                k = known.get(str(path))
+                if k and k[0] == size and k[1] == mtime:
+                    continue
+                try:
+                    data = path.read_bytes()
+                except OSError:
+                    continue
+                sha1 = hashlib.sha1(data).hexdigest()
+                if k and k[2] == sha1:
+                    touches.append((size, mtime, str(path)))
+                    continue
+                todo.append((path, size, mtime, sha1, data.decode("utf-8", errors="ignore")))
+            facts = scan_sources([(text, p.suffix) for p, _s, _m, _h, text in todo])
+            seen = {str(p) for p, _s, _m in entries}
+            gone = [p for p in known if p not in seen]
+            stats.added = sum(1 for p, *_ in todo if str(p) not in known)
+            stats.changed = len(todo) - stats.added
+            stats.removed = len(gone)
+
+            specs: Dict[str, List[str]] = {p: json.loads(v[3]) for p, v in known.items() if p in seen}
+            for (p, _s, _m, _h, _t), f in zip(todo, facts):
+                specs[str(p)] = list(f.imports)
+            membership_changed = bool(stats.added or stats.removed)
+            redo = list(specs) if (membership_changed or aliases_changed) else [str(p) for p, *_ in todo]
+            exists = set(specs).__contains__
+            edges = [(src, str(dst)) for src in redo for dst in {
+                resolve_import(s, Path(src), root, lambda c: exists(str(c)), aliases) for s in specs[src]} if dst]
+            stats.resolved = len(redo)
+
+            with self._conn:
+                if todo:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO files(path, root, size, mtime_ns, sha1, specs) VALUES (?,?,?,?,?,?)",
+                        [(str(p), str(root), s, m, h, json.dumps(specs[str(p)])) for p, s, m, h, _t in todo])
+                if touches:
+                    self._conn.executemany("UPDATE files SET size=?, mtime_ns=? WHERE path=?", touches)
+                if gone:
+                    self._conn.executemany("DELETE FROM files WHERE path=?", [(g,) for g in gone])
+                    self._conn.executemany("DELETE FROM edges WHERE src=?", [(g,) for g in gone])
+                self._conn.executemany("DELETE FROM edges WHERE src=?", [(r,) for r in redo])
+                self._conn.executemany("INSERT OR IGNORE INTO edges(src, dst) VALUES (?,?)", edges)
+                self._conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES(?, ?)", (alias_key, aliases_json))
+        stats.elapsed_ms = round((time.perf_counter() - t0) * 1000.0, 2)
+        return stats
+
+    # ---- queries ------------------------------------------------------------
+    def dependencies(self, path: Path) -> List[Path]:
+        """Files `path` imports directly."""
+        with self._lock:
+            return [Path(r[0]) for r in self._conn.execute(
+                "SELECT dst FROM edges WHERE src=? ORDER BY dst", (str(Path(path).resolve()),))]
+
+    def dependents(self, path: Path, transitive: bool = False) -> List[Path]:
+        """Files importing `path` (directly, or at any depth with transitive=True)."""
+        start = str(Path(path).resolve())
+        seen: Set[str] = set()
+        todo = [start]
+        with self._lock:
+            while todo:
+                cur = todo.pop()
+                for (src,) in self._conn.execute("SELECT src FROM edges WHERE dst=?", (cur,)):
+                    if src not in seen and src != start:
+                        seen.add(src)
+                        if transitive:
+                            todo.append(src)
+        return sorted(Path(s) for s in seen)
+
+    def graph(self, root: Path) -> ImportGraph:
+        """In-memory ImportGraph for `root` (for affected / related-test queries)."""
+        root = Path(root).resolve()
+        g = ImportGraph(root)
+        with self._lock:
+            for (p,) in self._conn.execute("SELECT path FROM files WHERE root=?", (str(root),)):
+                g.imports[Path(p)] = set()
+            for src, dst in self._conn.execute(
+                    "SELECT e.src, e.dst FROM edges e JOIN files f ON f.path = e.src WHERE f.root=?", (str(root),)):
+                g.imports[Path(src)].add(Path(dst))
+                g.importers.setdefault(Path(dst), set()).add(Path(src))
+        return g
+
+    def batches(self, paths: Iterable[Path]) -> List[List[Path]]:
+        """
+        Leaf-first topological batches of `paths`. Ordering follows imports
+        transitively, also through files outside the set (a -> x -> b puts b
+        before a). Kahn's algorithm, linear in nodes + edges of that closure;
+        files in an import cycle come last, together.
+        """
+        wanted = {str(Path(p).resolve()): Path(p) for p in paths}
+        deps: Dict[str, Set[str]] = {}
+        with self._lock:
+            frontier = list(wanted)
+            while frontier:
+                for n in frontier:
+                    deps.setdefault(n, set())
+                nxt: List[str] = []
+                for i in range(0, len(frontier), 500):
+                    chunk = frontier[i:i + 500]
+                    marks = ",".join("?" * len(chunk))
+                    for src, dst in self._conn.execute(f"SELECT src, dst FROM edges WHERE src IN ({marks})", chunk):
+                        if dst != src:
+                            deps[src].add(dst)
+                            if dst not in deps:
+                                deps[dst] = set()
+                                nxt.append(dst)
+                frontier = nxt
+        users: Dict[str, List[str]] = {n: [] for n in deps}
+        for n, ds in deps.items():
+            for d in ds:
+                users[d].append(n)
+        pending = {n: len(ds) for n, ds in deps.items()}
+        level = sorted(n for n, c in pending.items() if c == 0)
+        out: List[List[Path]] = []
+        while level:
+            batch = [wanted[n] for n in level if n in wanted]
+            if batch:
+                out.append(batch)
+            nxt = []
+            for n in level:
+                del pending[n]
+                for u in users[n]:
+                    pending[u] -= 1
+                    if pending[u] == 0:
+                        nxt.append(u)
+            level = sorted(nxt)
+        stuck = [wanted[n] for n in sorted(pending) if n in wanted]
+        if stuck:
+            out.append(stuck)
+        return out
+
+    def leaf_first(self, paths: Iterable[Path]) -> List[Path]:
+        return [p for batch in self.batches(paths) for p in batch]
+
+
+_OPEN: Dict[str, ImportIndex] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def open_index(db_path: Optional[Path] = None) -> Optional[ImportIndex]:
+    """
+    Return a process-wide ImportIndex for `db_path` (or the env default).
+    Returns None when the index is disabled or cannot be opened.
+    """
+    path = db_path or index_path_from_env()
+    if path is None:
+        return None
+    key = str(Path(path).resolve())
+    with _OPEN_LOCK:
+        idx = _OPEN.get(key)
+        if idx is None:
+            try:
+                idx = ImportIndex(Path(path))
+            except sqlite3.Error:
+                return None
+            _OPEN[key] = idx
+        return idx
@@ -7,6 +7,9 @@
 # - AIO_TARGET_REPO        : e.g. "carfinancinghub/cfh"
 # - AIO_FRONTEND_DIR       : local path to CFH frontend (vite project)
 # - AIO_RUN_GATES          : "1" to run build/test/lint gates
+# - AIO_GATES_MODE         : "full" (default) or "affected" (changed files, importers, related tests)
+# - AIO_GATES_PARALLEL     : "0" runs gate steps one after another (default parallel)
+# - AIO_GATE_CACHE         : gate result cache path (default reports/gate_cache.sqlite; "0" disables)
 # - AIO_UPLOAD_TS          : "1" = timestamp branches, "0" = rolling branch
 # - AIO_UPLOAD_BRANCH      : branch name when using rolling mode
 # - OPENAI_API_KEY         : (present check only)
@@ -14,6 +17,13 @@
 # - GROK_API_KEY           : (present check only)
 # - GITHUB_TOKEN           : required for uploads/comments/labels
 # - AIO_NPM_BIN            : optional full path to npm(.cmd) if npm not in PATH
+# - AIO_SOURCE_INDEX       : SQLite source index path (default reports/source_index.sqlite; "0" disables)
+# - AIO_NODE_WORKERS       : persistent Node worker processes for acorn/bridge calls (default 2)
+# - AIO_RUN_STORE          : SQLite run store path (default reports/runs.sqlite; "0" disables)
+# - AIO_RANK_WEIGHTS       : JSON overrides for worth ranking weights (see core/ranking.py)
+# - AIO_MAX_WORKERS        : parallel Cod1 file workers (default 8)
+# - AIO_DISPATCH_MODE      : Cod1 worker kind, "thread" (default) or "process"
+# - AIO_DISPATCH_TIMEOUT   : per-file Cod1 timeout in seconds (default 0 = none)
 #
 # Rolling PR logic (Cod1)
 # - If AIO_UPLOAD_TS == "0" and AIO_UPLOAD_BRANCH is non-empty,
@@ -25,6 +35,8 @@
 # - reports/gates_<run_id>.json   : build/test/lint results
 # - reports/debug/*.md            : human-readable status bundles
 # - reports/inv_*.csv             : inventories (when generated)
+# - reports/source_index.sqlite  : incremental scan index (size/mtime/sha1 + cached scores)
+# - reports/runs.sqlite          : run store (runs, file results, gates, PR URLs; core/storage.py)
 #
 # Sections (by marker):
 #   0) STANDARD FILE HEADER
@@ -58,16 +70,26 @@ import json
 import time
 import shlex
 import queue
-import hashlib
 import logging
 import random
 import string
 import subprocess
 from pathlib import Path
+from types import SimpleNamespace
 from typing import List, Dict, Any, Optional, Tuple
 
 # GitHub API (PyGithub)
 from github import Github, Auth
+# Conditional-request (ETag) client for PR / label / comment bookkeeping
+from app.services import github_api
+
+# Shared pruning scandir walker, hashing/dedup engines and JS/TS lexer
+from core.walker import walk_files, SOURCE_EXTS
+from core.hashing import hash_file
+from core.dedup_engine import group_by_content, choose_keeper
+from core.js_lexer import scan_source, scan_sources
+from core import storage as run_store
+from core.ranking import RankWeights, ext_code, rank as rank_features, score_one
 
 # Constants
 AIO_REPO   = os.environ.get("AIO_TARGET_REPO", "carfinancinghub/cfh")
@@ -93,12 +115,8 @@ def log(msg: str) -> None:
 
 
 def sha1_of_file(path: Path) -> str:
-    """Return SHA1 hex digest of a file."""
-    h = hashlib.sha1()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    """Return SHA1 hex digest of a file (single read / mmap via core.hashing)."""
+    return hash_file(path, "sha1")
 
 
 def write_json_report(obj: Any, dest: Path) -> None:
@@ -148,16 +166,14 @@ def exclude_node_modules(files: List[Path]) -> List[Path]:
 # ==== 3) AIO-OPS | GROUPING & FILTERS - END ===================================
 # ==== 4) AIO-OPS | FUNCTION EXTRACTION - START ================================
 
-import re as _re
-
-_FUNC_PATTERN = _re.compile(r'function\s+([A-Za-z0-9_]+)\s*\(')
-
 def extract_functions_js(src: str) -> List[str]:
     """
     Extract function names from a JavaScript/TypeScript source string.
-    Uses a naive regex that matches `function name(...)`.
+    Uses the in-process lexer (core.js_lexer): function declarations, arrow /
+    function-valued bindings and class methods ("Class.method"); strings,
+    comments, templates and regex literals are skipped.
     """
-    return _FUNC_PATTERN.findall(src)
+    return scan_source(src).functions
 
 def extract_functions_from_file(path: Path) -> List[str]:
     """Read a file and extract function names if it's source-like."""
@@ -172,11 +188,18 @@ def extract_functions_from_file(path: Path) -> List[str]:
 
 import subprocess as _subp
 
-def acorn_extract(path: Path) -> Dict[str, Any]:
-    """
-    Run acorn (JS parser) on a given file path and return parsed JSON AST.
-    Requires `acorn` installed globally or locally in node_modules/.bin.
-    """
+def _node_pool():
+    """Shared persistent Node worker pool (None when node is unavailable)."""
+    try:
+        from app.services.node_pool import get_pool
+    except Exception:
+        return None
+    return get_pool()
+
+def _acorn_missing(err: str) -> bool:
+    return err.startswith("acorn not installed")
+
+def _acorn_extract_npx(path: Path) -> Dict[str, Any]:
     acorn_bin = "npx"
     args = ["acorn", "--ecma2020", "--locations", "--sourceType", "module", "--json", str(path)]
     try:
@@ -185,6 +208,43 @@ def acorn_extract(path: Path) -> Dict[str, Any]:
     except Exception as e:
         return {"error": str(e), "file": str(path)}
 
+def acorn_extract(path: Path) -> Dict[str, Any]:
+    """
+    Run acorn (JS parser) on a given file path and return parsed JSON AST.
+    Parses on the warm Node worker pool; falls back to a one-off `npx acorn`
+    when node (or acorn in node_modules) is not available to the pool.
+    """
+    pool = _node_pool()
+    if pool is not None:
+        from app.services.node_pool import NodeUnavailable
+        try:
+            return pool.call("acorn.parse", {"path": str(path)})
+        except NodeUnavailable:
+            pass
+        except Exception as e:
+            if not _acorn_missing(str(e)):
+                return {"error": str(e), "file": str(path)}
+    return _acorn_extract_npx(path)
+
+def acorn_extract_many(paths: List[Path]) -> List[Dict[str, Any]]:
+    """Batch acorn_extract(): one pipelined request per chunk instead of a spawn per file."""
+    pool = _node_pool()
+    if pool is None:
+        return [acorn_extract(p) for p in paths]
+    try:
+        res = pool.map("acorn.parseBatch", [{"path": str(p)} for p in paths])
+    except Exception:
+        return [acorn_extract(p) for p in paths]
+    out: List[Dict[str, Any]] = []
+    for p, r in zip(paths, res):
+        if r.get("ok"):
+            out.append(r["result"])
+        elif _acorn_missing(str(r.get("error"))):
+            out.append(_acorn_extract_npx(p))
+        else:
+            out.append({"error": r.get("error"), "file": str(p)})
+    return out
+
 def acorn_extract_safe(path: Path) -> Dict[str, Any]:
     """Safe wrapper that never raises, returns dict with 'functions' if possible."""
     ast = acorn_extract(path)
@@ -199,37 +259,74 @@ def acorn_extract_safe(path: Path) -> Dict[str, Any]:
 # ==== 5) AIO-OPS | ACORN EXTRACTOR - END ======================================
 # ==== 6) AIO-OPS | WORTH SCORE & RECOMMENDATION - START =======================
 
-def worth_score(path: Path, functions: Optional[List[str]] = None) -> float:
+def worth_score(path: Path, functions: Optional[List[str]] = None,
+                size_bytes: Optional[int] = None) -> float:
     """
     Naive heuristic:
       + ext weight: .ts/.tsx > .js/.jsx
       + size penalty beyond 50 KB
       + bonus per discovered function (capped)
+    Pass `size_bytes` when the caller already has it to skip the stat().
     """
-    ext = path.suffix.lower()
-    ext_w = {".tsx": 1.0, ".ts": 0.9, ".jsx": 0.7, ".js": 0.6}.get(ext, 0.3)
+    if size_bytes is None:
+        try:
+            size_bytes = path.stat().st_size
+        except Exception:
+            size_bytes = 0
+    # same formula/weights as the vectorized ranker (core.ranking)
+    return score_one(ext_code(path), size_bytes, len(functions or []), w=RankWeights.from_env())
+
+
+def _analyze_source(path: Path, text: str, size: int) -> Tuple[List[str], float, int, bool]:
+    """Derived facts cached by the source index: (functions, worth score, import count, JSX)."""
+    f = scan_source(text, path.suffix)
+    return f.functions, worth_score(path, f.functions, size_bytes=size), len(f.imports), f.has_jsx
+
+
+def _analyze_sources(items: List[Tuple[Path, str, int]]) -> List[Tuple[List[str], float, int, bool]]:
+    """Batch _analyze_source(): one lexer batch (process pool when large)."""
+    facts = scan_sources([(text, path.suffix) for path, text, _size in items])
+    return [(f.functions, worth_score(path, f.functions, size_bytes=size), len(f.imports), f.has_jsx)
+            for (path, _text, size), f in zip(items, facts)]
 
+
+def _source_index():
+    """Shared on-disk source index (None when AIO_SOURCE_INDEX disables it)."""
     try:
-        size_kb = path.stat().st_size / 1024.0
+        from app.source_index import open_index
     except Exception:
-        size_kb = 0.0
+        return None
+    return open_index()
 
-    size_pen = max(0.0, (size_kb - 50.0) / 200.0)  # gentle penalty
-    fn_bonus = min(0.4, 0.04 * (len(functions or [])))  # cap at +0.4
 
-    return round(ext_w + fn_bonus - size_pen, 4)
+def _rank(rows: List[Any], limit: Optional[int] = None) -> List[Tuple[Path, float]]:
+    """Top `limit` IndexedFile rows (all when None) by descending score, vectorized."""
+    return rank_features([(r.path, r.size, len(r.functions), r.imports, r.jsx) for r in rows], limit)
 
 
-def recommend(files: List[Path]) -> List[Tuple[Path, float]]:
+def recommend(files: List[Path], limit: Optional[int] = None) -> List[Tuple[Path, float]]:
     """
-    Return files sorted by descending worth score.
-    Uses regex extraction (fast) as function signal.
+    Return files sorted by descending worth score (only the best `limit` when given).
+    Uses the in-process lexer (batch API) for features; facts are served from
+    the source index when enabled, so only new/changed files are re-read.
+    Scoring + top-k run over a NumPy feature matrix (core.ranking).
     """
-    scored: List[Tuple[Path, float]] = []
+    idx = _source_index()
+    if idx is not None:
+        from app.source_index import stat_entries
+        rows, _stats = idx.update(stat_entries(files), _analyze_source, _analyze_sources)
+        return _rank(rows, limit)
+
+    texts: List[Tuple[Path, str, int]] = []
     for p in files:
-        fns = extract_functions_from_file(p)
-        scored.append((p, worth_score(p, fns)))
-    return sorted(scored, key=lambda t: t[1], reverse=True)
+        try:
+            data = p.read_bytes()
+        except Exception:
+            data = b""
+        texts.append((p, data.decode("utf-8", errors="ignore"), len(data)))
+    feats = [(p, size, len(fns), n_imports, jsx)
+             for (p, _t, size), (fns, _score, n_imports, jsx) in zip(texts, _analyze_sources(texts))]
+    return rank_features(feats, limit)
 
 # ==== 6) AIO-OPS | WORTH SCORE & RECOMMENDATION - END =========================
 # ==== 7) AIO-OPS | GATES - START ==============================================
@@ -251,42 +348,174 @@ def _run_cmd(cmd: List[str], cwd: Path) -> Dict[str, Any]:
         return {"cmd": " ".join(cmd), "exit": 1, "stdout": "", "stderr": repr(e), "pass": False}
 
 
-def run_gates(run_id: str) -> Path:
+def _gate_steps_parallel(cmds: Dict[str, Optional[List[str]]], cwd: Path) -> Dict[str, Dict[str, Any]]:
+    """Run independent gate commands at once (None = step skipped); same per-step shape as _run_cmd."""
+    from core.dag import Step, run_dag
+
+    def _step(cmd: Optional[List[str]]):
+        if cmd is None:
+            return lambda _in: {"cmd": "", "exit": 0, "stdout": "", "stderr": "", "pass": True, "skipped": True}
+        return lambda _in: _run_cmd(cmd, cwd)
+
+    run = run_dag([Step(name, _step(cmd)) for name, cmd in cmds.items()])
+    steps = {name: run.results[name] for name in cmds}
+    for name, ms in run.timings_ms().items():
+        steps[name]["ms"] = ms
+    return steps
+
+
+def _gates_status(steps: Dict[str, Dict[str, Any]]) -> str:
+    """Run-store status for a gates-only run: done when every step passed."""
+    return "done" if all(step.get("pass") for step in steps.values()) else "failed"
+
+
+def _import_graph(root: Path):
+    """Import graph of `root`: from the incremental index when enabled, else a full scan."""
+    from app.import_index import open_index
+    from core.affected import ImportGraph
+
+    idx = open_index()
+    if idx is None:
+        return ImportGraph.build(root)
+    idx.sync(root)
+    return idx.graph(root)
+
+
+def _leaf_first_batches(paths: List[Path]) -> List[List[Path]]:
+    """
+    `paths` as leaf-first levels: no file shares a level with, or precedes,
+    a file it imports. One level in input order when the index is disabled.
+    """
+    from app.import_index import open_index
+
+    idx = open_index()
+    if idx is None or len(paths) < 2 or not FRONTEND.is_dir():
+        return [paths]
+    try:
+        idx.sync(FRONTEND)
+        return idx.batches(paths)
+    except Exception as e:
+        log(f"import index unavailable, keeping input order: {e}")
+        return [paths]
+
+
+def _changed_for_run(run_id: str) -> List[Path]:
+    """Frontend files recorded for `run_id` in the run store (absolute, existing)."""
+    st = run_store.open_store()
+    rec = st.run(run_id) if st else None
+    out: List[Path] = []
+    for f in (rec or {}).get("files", []):
+        p = Path(f["path"])
+        p = p if p.is_absolute() else FRONTEND / p
+        if p.is_file():
+            out.append(p.resolve())
+    return out
+
+
+def run_gates(run_id: str, changed: Optional[List[str]] = None) -> Path:
     """
     Run build/test/lint gates (when AIO_RUN_GATES == '1') in FRONTEND.
     Writes reports/gates_<run_id>.json and returns that path.
+
+    AIO_GATES_MODE=affected limits the gates to what the run touched:
+    `changed` (or the run's files from the run store) -> importers -> related
+    tests; build is an incremental `tsc --noEmit`, test runs only the related
+    test files and lint only the changed files. With no known changed files
+    it falls back to the full gates. build/test/lint run in parallel
+    (AIO_GATES_PARALLEL, default on); per-step shape is unchanged.
+
+    Results are cached by an input fingerprint (core/gate_cache.py); on an
+    unchanged tree the stored steps are reused, marked "cached": true.
     """
     gates_path = REPORTS / f"gates_{run_id}.json"
 
     should_run = (os.environ.get("AIO_RUN_GATES", "0") == "1")
     npm_bin = os.environ.get("AIO_NPM_BIN", "npm")
+    mode = os.environ.get("AIO_GATES_MODE", "full").strip().lower()
+    parallel = os.environ.get("AIO_GATES_PARALLEL", "1") != "0"
 
     data: Dict[str, Any] = {
         "run_id": run_id,
         "frontend": str(FRONTEND),
         "tooling": {"npm_bin": npm_bin},
+        "mode": "full",
         "steps": {},
     }
 
     if not should_run:
         data["skipped"] = True
         write_json_report(data, gates_path)
+        run_store.record("start_run", run_id, source="gates")
+        run_store.record("finish_run", run_id, "skipped", source="gates")
         return gates_path
 
+    cmds: Dict[str, Optional[List[str]]] = {
+        "build": [npm_bin, "run", "build", "--silent"],
+        # Test (vitest, allow project scripts to wire it)
+        "test": [npm_bin, "run", "test", "--silent", "--", "-r"],
+        # Lint (eslint, allow project scripts)
+        "lint": [npm_bin, "run", "lint", "--silent"],
+    }
+
+    if mode == "affected":
+        files = [Path(c).resolve() for c in changed] if changed is not None else _changed_for_run(run_id)
+        files = [f for f in files if f.suffix.lower() in SOURCE_EXTS]
+        if files:
+            graph = _import_graph(FRONTEND)
+            affected = graph.affected(files)
+            tests = graph.related_tests(files)
+
+            def rel(p: Path) -> str:
+                return os.path.relpath(p, FRONTEND)
+
+            data["mode"] = "affected"
+            data["affected"] = {"changed": [rel(f) for f in files], "modules": len(affected),
+                                "tests": [rel(t) for t in tests]}
+            tsbuildinfo = FRONTEND / "node_modules" / ".cache" / "aio-gates.tsbuildinfo"
+            cmds = {
+                "build": [npm_bin, "exec", "--", "tsc", "--noEmit", "--incremental",
+                          "--tsBuildInfoFile", str(tsbuildinfo)],
+                "test": [npm_bin, "run", "test", "--silent", "--", *map(rel, tests)] if tests else None,
+                "lint": [npm_bin, "exec", "--", "eslint", *map(rel, files)],
+            }
+        else:
+            data["affected"] = {"fallback": "no changed files known for this run"}
+
+    # Unchanged inputs (tree, lockfile, tool versions, commands) -> reuse the stored results
+    from core.gate_cache import open_cache, tool_versions
+    cache = open_cache()
+    key = None
+    if cache is not None:
+        key = cache.fingerprint(FRONTEND, cmds, tool_versions(("node", npm_bin)), {"mode": data["mode"]})
+        hit = cache.get(key)
+        if hit is not None:
+            data["steps"] = {name: {**step, "cached": True} for name, step in hit["steps"].items()}
+            data["cache"] = {"hit": True, "key": key, "from_run": hit["run_id"]}
+            write_json_report(data, gates_path)
+            run_store.record("start_run", run_id, source="gates")
+            run_store.record("add_gates", run_id, data["steps"])
+            run_store.record("finish_run", run_id, _gates_status(data["steps"]), source="gates")
+            return gates_path
+
     # Ensure node_modules present (best effort)
     if not (FRONTEND / "node_modules").exists():
         data["steps"]["ci"] = _run_cmd([npm_bin, "ci", "--no-audit", "--no-fund"], FRONTEND)
 
-    # Build
-    data["steps"]["build"] = _run_cmd([npm_bin, "run", "build", "--silent"], FRONTEND)
-
-    # Test (vitest, allow project scripts to wire it)
-    data["steps"]["test"] = _run_cmd([npm_bin, "run", "test", "--silent", "--", "-r"], FRONTEND)
+    if parallel:
+        data["steps"].update(_gate_steps_parallel(cmds, FRONTEND))
+    else:
+        for name, cmd in cmds.items():
+            data["steps"][name] = _gate_steps_parallel({name: cmd}, FRONTEND)[name]
 
-    # Lint (eslint, allow project scripts)
-    data["steps"]["lint"] = _run_cmd([npm_bin, "run", "lint", "--silent"], FRONTEND)
+    if cache is not None and key is not None:
+        data["cache"] = {"hit": False, "key": key}
+        # only all-green gates are stored (failures may be flaky); `npm ci` is setup, not a gate result
+        cache.put(key, run_id, {name: step for name, step in data["steps"].items() if name != "ci"})
 
     write_json_report(data, gates_path)
+    run_store.record("start_run", run_id, source="gates")
+    run_store.record("add_gates", run_id, data["steps"])
+    run_store.record("finish_run", run_id, _gates_status(data["steps"]), source="gates")
     return gates_path
 
 # ==== 7) AIO-OPS | GATES - END ================================================
@@ -294,27 +523,42 @@ def run_gates(run_id: str) -> Path:
 
 PREFERRED_EXT_RANK = {".ts": 0, ".tsx": 0, ".js": 1, ".jsx": 1}
 
-def _dedupe_prefer_ts(paths: List[Path]) -> List[Path]:
+def _dedupe_prefer_ts(paths: List[Path],
+                      sizes: Optional[Dict[Path, int]] = None,
+                      digests: Optional[Dict[Path, str]] = None) -> List[Path]:
     """
-    Group by (basename,size). Within each group prefer .ts/.tsx over .js/.jsx.
+    Collapse byte-identical files. Within each group prefer .ts/.tsx over .js/.jsx.
+    Grouping is staged (size -> first 4 KB hash -> full hash, see core.dedup_engine)
+    so only real collision candidates are read in full.
+    `sizes` (path -> bytes) lets callers that already walked the tree skip the stat();
+    `digests` (path -> full sha1, e.g. from the source index) skips hashing entirely.
     """
-    groups: Dict[Tuple[str, int], List[Path]] = {}
+    entries: List[Tuple[Path, int]] = []
     for p in paths:
-        try:
-            size = p.stat().st_size
-        except Exception:
-            size = -1
-        key = (p.stem.lower(), size)
-        groups.setdefault(key, []).append(p)
+        if sizes is not None and p in sizes:
+            size = sizes[p]
+        else:
+            try:
+                size = p.stat().st_size
+            except Exception:
+                size = -1
+        entries.append((p, size))
+
+    if digests is not None and all(p in digests for p, _s in entries):
+        by_key: Dict[Tuple[int, str], List[Path]] = {}
+        for p, size in entries:
+            by_key.setdefault((size, digests[p]), []).append(p)
+        groups = list(by_key.values())
+    else:
+        groups = [g.paths for g in group_by_content(entries)[0]]
 
     kept: List[Path] = []
-    for key, items in groups.items():
+    for items in groups:
         # Rank by preferred extension, then shortest path for determinism
-        items_sorted = sorted(
-            items,
-            key=lambda ip: (PREFERRED_EXT_RANK.get(ip.suffix.lower(), 99), len(str(ip)))
+        keep, _dropped = choose_keeper(
+            items, rank=lambda ip: (PREFERRED_EXT_RANK.get(ip.suffix.lower(), 99), len(str(ip)))
         )
-        kept.append(items_sorted[0])
+        kept.append(keep)
     return kept
 
 
@@ -337,10 +581,50 @@ def _load_conversion_candidates_list() -> Optional[List[Path]]:
     return out or None
 
 
+_SCAN_SKIP_DIRS = ("node_modules", "dist")
+
+
+def _walk_sources(roots: List[Path]) -> List[Tuple[Path, List[Any]]]:
+    """Walk roots with the shared pruning walker; returns [(root, [WalkEntry, ...]), ...]."""
+    entries = walk_files(roots, skip_dirs=_SCAN_SKIP_DIRS, exts=SOURCE_EXTS)
+    per_root: Dict[Path, List[Any]] = {r: [] for r in roots}
+    for e in entries:
+        per_root.setdefault(e.root, []).append(e)
+    return list(per_root.items())
+
+
+def _scan_and_rank(per_root: List[Tuple[Path, List[Any]]],
+                   limit: Optional[int] = None) -> Tuple[List[Path], List[Tuple[Path, float]]]:
+    """
+    Dedupe + score full root listings (WalkEntry lists) and return the best
+    `limit` (all when None). With the source index enabled each root is synced
+    (new/changed files re-read, vanished rows dropped) and the ranking comes
+    from cached features; otherwise fall back to recommend().
+    """
+    idx = _source_index()
+    if idx is None:
+        sizes = {e.path: e.size for (_root, es) in per_root for e in es}
+        uniques = _dedupe_prefer_ts(list(sizes), sizes=sizes)
+        return uniques, recommend(uniques, limit)
+
+    rows: List[Any] = []
+    for root, walked in per_root:
+        entries = [(e.path, e.size, e.mtime_ns) for e in walked]
+        synced, stats = idx.sync(root, entries, _analyze_source, _analyze_sources)
+        log(f"source-index: {root} seen={stats.seen} added={stats.added} changed={stats.changed} "
+            f"removed={stats.removed} ({stats.elapsed_ms} ms)")
+        rows.extend(synced)
+    by_path = {r.path: r for r in rows}
+    uniques = _dedupe_prefer_ts(list(by_path),
+                                sizes={p: r.size for p, r in by_path.items()},
+                                digests={p: r.sha1 for p, r in by_path.items()})
+    return uniques, _rank([by_path[p] for p in uniques], limit)
+
+
 def scan_frontend_sources(limit: int = BATCH_SIZE) -> List[Path]:
     """
     Scan FRONTEND/src for source-like files, exclude node_modules and dist,
-    dedupe by (basename,size) preferring TS/TSX, and return up to `limit`.
+    dedupe identical content preferring TS/TSX, and return up to `limit`.
     """
     src_root = FRONTEND / "src"
     if not src_root.exists():
@@ -350,21 +634,13 @@ def scan_frontend_sources(limit: int = BATCH_SIZE) -> List[Path]:
     # 1) Start from explicit candidate list if present
     explicit = _load_conversion_candidates_list()
     if explicit:
-        base = explicit
+        uniques = _dedupe_prefer_ts(explicit)
+        scored = recommend(uniques, limit)
     else:
-        # 2) Walk src tree
-        all_files: List[Path] = [
-            p for p in src_root.rglob("*")
-            if p.is_file()
-               and p.suffix.lower() in (".js", ".jsx", ".ts", ".tsx")
-               and "node_modules" not in p.parts
-               and "dist" not in p.parts
-        ]
-        base = all_files
-
-    # 3) Dedupe and sort by heuristic score
-    uniques = _dedupe_prefer_ts(base)
-    scored = recommend(uniques)
+        # 2) Walk src tree (node_modules/dist pruned; stat reused by the index)
+        uniques, scored = _scan_and_rank(_walk_sources([src_root]), limit)
+
+    # 3) Take the top of the heuristic ranking
     chosen = [p for (p, _s) in scored[:limit]]
 
     log(f"scan_frontend_sources: selected {len(chosen)} (of {len(uniques)} uniques)")
@@ -399,18 +675,8 @@ def fetch_candidates(limit: Optional[int] = None,
     if not scan_roots:
         return scan_frontend_sources(limit=lim)
 
-    files: List[Path] = []
-    for root in scan_roots:
-        if not root.exists():
-            continue
-        for p in root.rglob("*"):
-            if p.is_file() and p.suffix.lower() in (".js", ".jsx", ".ts", ".tsx"):
-                if "node_modules" in p.parts or "dist" in p.parts:
-                    continue
-                files.append(p)
-
-    uniques = _dedupe_prefer_ts(files)
-    scored  = recommend(uniques)
+    # Roots are walked concurrently by the shared walker
+    uniques, scored = _scan_and_rank(_walk_sources([r for r in scan_roots if r.exists()]), lim)
     chosen  = [p for (p, _s) in scored[:lim]]
 
     log(f"fetch_candidates: selected {len(chosen)} from {len(uniques)} uniques across {len(scan_roots)} roots")
@@ -526,16 +792,31 @@ def process_batch_ext(source: str,
         log("process_batch_ext: no candidates after filtering.")
         return []
 
+    run_store.record("start_run", run_id, source=source, mode=mode, count=len(paths))
+
     # ---- Mode dispatch -------------------------------------------------------
     if mode == "cod1":
         # Use Cod1 continuity pipeline dispatcher (defined at end of file).
         # It expects absolute file paths.
-        gh_repo = opts.get("gh_repo") if isinstance(opts, dict) else None
+        o = opts if isinstance(opts, dict) else {}
+        # One import level at a time: a level starts only once every file it
+        # depends on has been converted; files within a level run concurrently.
+        levels = _leaf_first_batches(paths)
+        paths = [p for level in levels for p in level]
+        res: List[Dict[str, Any]] = []
         try:
-            res = cod1([str(p) for p in paths], gh_repo=gh_repo)  # returns list of dicts
+            for level in levels:
+                res.extend(cod1([str(p) for p in level], gh_repo=o.get("gh_repo"),
+                                workers=o.get("workers"), mode=o.get("dispatch_mode"),
+                                timeout=o.get("file_timeout")))  # list of dicts, input order
         except NameError:
             log("process_batch_ext[cod1]: cod1 dispatcher not available; falling back to no-op.")
             res = []
+        run_store.record("add_file_results", run_id, [
+            {"path": str(p), "status": "error" if "error" in r else "ok",
+             **({"error": r["error"]} if "error" in r else {})}
+            for p, r in zip(paths, res)])
+        run_store.record("finish_run", run_id, "done" if all("error" not in r for r in res) else "partial")
         return res
     # -------------------------------------------------------------------------
 
@@ -554,6 +835,9 @@ def process_batch_ext(source: str,
     except Exception as e:
         log(f"ERROR: upload_to_github failed: {e!r}")
 
+    run_store.record("add_file_results", run_id, [{"path": rel, "status": "staged"} for (rel, _lp) in staged])
+    run_store.record("finish_run", run_id)
+
     # Return concise group summary
     return [{
         "run_id": run_id,
@@ -592,21 +876,15 @@ def upload_to_github(run_id: str,
     # 1) Resolve base commit
     base_ref = _repo.get_branch(base_branch)
     base_commit = base_ref.commit
-    base_tree = base_commit.commit.tree
-
-    # 2) Prepare blobs and tree elements
-    from github import InputGitTreeElement as _IGTE  # local import to avoid top-level dependency
-    elements = []
-    for repo_rel, local_path in repo_files:
-        content = local_path.read_text(encoding="utf-8", errors="ignore")
-        blob = _repo.create_git_blob(content, "utf-8")
-        elements.append(_IGTE(repo_rel, "100644", "blob", sha=blob.sha))
 
-    new_tree = _repo.create_git_tree(elements, base_tree=base_tree)
-
-    # 3) Create commit
+    # 2-3) Delta-only tree push: unchanged files skipped, small ones inline,
+    #    the rest uploaded concurrently; huge sets split over several commits
+    from app.services.github_tree import push_files, read_files
     msg = pr_title or f"TS migration stubs (run {run_id})"
-    new_commit = _repo.create_git_commit(msg, new_tree, [base_commit.commit])
+    pushed = push_files(_repo, base_commit.commit, read_files(repo_files), msg)
+    new_commit = pushed.commit
+    log(f"upload_to_github: {len(repo_files)} file(s): {pushed.inline} inline, {pushed.blobs} blob(s), "
+        f"{pushed.unchanged} unchanged; {len(pushed.commits)} commit(s), {pushed.requests} request(s), {pushed.ms} ms")
 
     # 4) Decide head branch (rolling vs timestamp) — uses Cod1 chooser
     default_head = f"ts-migration/generated-{run_id}"
@@ -621,32 +899,40 @@ def upload_to_github(run_id: str,
         full_ref = ref_name if ref_name.startswith("refs/") else f"refs/{ref_name}"
         ref = _repo.create_git_ref(ref=full_ref, sha=new_commit.sha)  # MUST be "refs/heads/<...>"
 
-    # 6) Reuse or open a draft PR
-    existing = None
-    for pr in _repo.get_pulls(state="open"):
-        if pr.head.ref == head_branch and pr.base.ref == base_branch:
-            existing = pr
-            break
-
-    if existing:
-        pr = existing
+    # 6) Reuse or open a draft PR (branch->PR map + head-filtered query, no open-PR scan)
+    title = msg if head_branch == default_head else "TS migration stubs (rolling)"
+    body = pr_body or f"Automated stubs upload for run {run_id}"
+    api = github_api.open_api(AIO_REPO)
+    if api is not None:
+        found = api.find_or_create_pr(title, body, head_branch, base_branch, draft=True)
+        pr = SimpleNamespace(number=found["number"], html_url=found["html_url"])
     else:
-        pr = _repo.create_pull(
-            title=msg if head_branch == default_head else "TS migration stubs (rolling)",
-            body=pr_body or f"Automated stubs upload for run {run_id}",
-            head=head_branch,
-            base=base_branch,
-            draft=True,
-        )
+        hits = list(_repo.get_pulls(state="open", head=f"{AIO_REPO.split('/')[0]}:{head_branch}", base=base_branch))
+        pr = hits[0] if hits else _repo.create_pull(title=title, body=body, head=head_branch,
+                                                    base=base_branch, draft=True)
 
     # 7) Record PR URL for this run
     (REPORTS / f"upload_{run_id}.txt").write_text(pr.html_url, encoding="utf-8")
+    run_store.record("add_pr", run_id, pr.html_url, head_branch)
 
     log(f"upload_to_github: PR #{pr.number}  head={head_branch}  base={base_branch}")
     return pr.html_url
 # ==== 11) AIO-OPS | GITHUB UPLOAD - END =======================================
 # ==== 12) AIO-OPS | SG-Man multi-AI review hook - START =======================
 
+def _latest_pr_url(run_id: Optional[str] = None) -> Optional[str]:
+    """
+    PR URL recorded last (for `run_id`, or overall): a run store lookup,
+    falling back to the upload_*.txt files for runs that predate the store.
+    """
+    st = run_store.open_store()
+    url = st.latest_pr(run_id) if st else None
+    if url:
+        return url
+    up = (REPORTS / f"upload_{run_id}.txt") if run_id else _latest_upload_txt()
+    return up.read_text(encoding="utf-8").strip() if up and up.exists() else None
+
+
 def _latest_upload_txt() -> Optional[Path]:
     """Return the newest reports/upload_*.txt path (if any)."""
     if not REPORTS.exists():
@@ -685,9 +971,12 @@ def _comment_gates_to_pr(pr_number: int, run_id: str) -> None:
         f"(Frontend: `{data.get('frontend','?')}`; npm: `{(data.get('tooling') or {}).get('npm_bin','?')}`)"
     )
 
-    pr = _repo.get_pull(pr_number)
-    pr.create_issue_comment(body)
-    log(f"commented gates on PR #{pr.number}")
+    api = github_api.open_api(AIO_REPO)
+    if api is not None:
+        api.comment(pr_number, body)
+    else:
+        _repo.get_pull(pr_number).create_issue_comment(body)
+    log(f"commented gates on PR #{pr_number}")
 
 
 def sgman_after_append(run_id: str, also_label: bool = True) -> None:
@@ -702,11 +991,10 @@ def sgman_after_append(run_id: str, also_label: bool = True) -> None:
     log(f"sgman_after_append: wrote {gates_path}")
 
     # 2) Resolve newest upload PR URL
-    up = _latest_upload_txt()
-    if not up:
-        log("sgman_after_append: no upload_*.txt files found; cannot comment.")
+    pr_url = _latest_pr_url()
+    if not pr_url:
+        log("sgman_after_append: no recorded upload PR found; cannot comment.")
         return
-    pr_url = up.read_text(encoding="utf-8").strip()
     pr_num = _read_pr_number_from_url(pr_url)
     if not pr_num:
         log(f"sgman_after_append: cannot parse PR number from {pr_url!r}")
@@ -718,15 +1006,20 @@ def sgman_after_append(run_id: str, also_label: bool = True) -> None:
     # 4) Labels (idempotent)
     if also_label:
         try:
-            def _ensure_label(name: str, color: str):
-                try:
-                    return _repo.get_label(name)
-                except Exception:
-                    return _repo.create_label(name=name, color=color)
-            pr = _repo.get_pull(pr_num)
-            pr.add_to_labels(_ensure_label("ts-migration", "0E8A16"),
-                             _ensure_label("analysis", "5319E7"))
-            log(f"sgman_after_append: labeled PR #{pr.number}")
+            labels = {"ts-migration": "0E8A16", "analysis": "5319E7"}
+            api = github_api.open_api(AIO_REPO)
+            if api is not None:
+                added = api.add_labels(pr_num, labels)  # cached 304s once the labels are on the PR
+                log(f"sgman_after_append: labeled PR #{pr_num} (+{len(added)}); github {api.stats()}")
+            else:
+                def _ensure_label(name: str, color: str):
+                    try:
+                        return _repo.get_label(name)
+                    except Exception:
+                        return _repo.create_label(name=name, color=color)
+                pr = _repo.get_pull(pr_num)
+                pr.add_to_labels(*(_ensure_label(n, c) for n, c in labels.items()))
+                log(f"sgman_after_append: labeled PR #{pr.number}")
         except Exception as e:
             log(f"sgman_after_append: label step skipped ({e!r})")
 
@@ -836,9 +1129,8 @@ def _cli() -> int:
         mode=args.mode,
     )
 
-    # Try to find the PR URL written by upload_to_github
-    upload_txt = REPORTS / f"upload_{run_id}.txt"
-    pr_url = upload_txt.read_text(encoding="utf-8").strip() if upload_txt.exists() else None
+    # PR URL recorded by upload_to_github
+    pr_url = _latest_pr_url(run_id)
 
     # Gates + comment + labels
     try:
@@ -870,25 +1162,41 @@ try:
 except Exception as _e:
     cod1_pipeline_for_file = None  # fallback if module missing
 
-# Lightweight dispatcher used by process_batch_ext(mode="cod1").
-# Accepts absolute file paths and optional gh_repo.
+# Parallel dispatcher used by process_batch_ext(mode="cod1").
+# Accepts absolute file paths and optional gh_repo. Files run on AIO_MAX_WORKERS
+# isolated workers (AIO_DISPATCH_MODE thread|process) with an optional per-file
+# timeout (AIO_DISPATCH_TIMEOUT); results keep input order.
+def _cod1_one(job: Tuple[str, Optional[str]]) -> Any:
+    fp, gh_repo = job
+    return cod1_pipeline_for_file(Path(fp), gh_repo=gh_repo)
+
+
 if "cod1" not in globals():
     from typing import Optional, List
 
-    def cod1(file_paths: List[str], gh_repo: Optional[str] = None) -> List[Dict[str, Any]]:
+    def cod1(file_paths: List[str], gh_repo: Optional[str] = None,
+             workers: Optional[int] = None, mode: Optional[str] = None,
+             timeout: Optional[float] = None) -> List[Dict[str, Any]]:
         results: List[Dict[str, Any]] = []
         if cod1_pipeline_for_file is None:
             return results
-        for fp in file_paths:
-            try:
-                res = cod1_pipeline_for_file(Path(fp), gh_repo=gh_repo)
-                # ensure a dict result shape
-                if isinstance(res, dict):
-                    results.append(res)
-                else:
-                    results.append({"file": fp, "result": res})
-            except Exception as e:
-                results.append({"error": str(e), "file": fp})
+        from core.config import get_settings
+        from core.dispatch import dispatch
+
+        workers = workers or get_settings().MAX_WORKERS
+        for o in dispatch(_cod1_one, [(fp, gh_repo) for fp in file_paths],
+                          workers=min(workers, max(1, len(file_paths))), mode=mode, timeout=timeout):
+            fp = file_paths[o.index]
+            if not o.ok:
+                err = {"error": o.error, "file": fp}
+                if o.timed_out:
+                    err["timed_out"] = True
+                results.append(err)
+            # ensure a dict result shape
+            elif isinstance(o.value, dict):
+                results.append(o.value)
+            else:
+                results.append({"file": fp, "result": o.value})
         return results
 
 # ==== 14) AIO-OPS | COD1 CONTINUITY HOOKS - END ==============================
@@ -6,6 +6,8 @@ import re
 import time
 from typing import Dict, List, Tuple
 
+from core.walker import iter_files
+
 REPORTS = Path("reports")
 REPORTS.mkdir(parents=True, exist_ok=True)
 
@@ -20,15 +22,9 @@ class LocalCandidate:
         self.src_path = src_path
         self.size = size
 
-def _should_skip(path: Path) -> bool:
-    parts = {p.lower() for p in path.parts}
-    if parts & RECYCLE_TOKENS:
-        return True
-    if any(d in JUNK_DIRS for d in parts):
-        return True
-    if NUM_NAME_RE.match(path.name):
-        return True
-    return False
+def _skip_name(name: str) -> bool:
+    # numeric/cryptic file names (junk dirs are pruned by the walker)
+    return bool(NUM_NAME_RE.match(name))
 
 def _has_ts_sibling(p: Path) -> bool:
     base = p.with_suffix("")
@@ -50,11 +46,9 @@ def scan_local(root: str, run_id: str, cap: int = 2000) -> Tuple[List[LocalCandi
     cands: List[LocalCandidate] = []
     bundles: Dict[str, List[str]] = {}
     count_by_ext = {"js":0, "jsx":0, "ts":0, "tsx":0, "md":0}
-    for p in rootp.rglob("*"):
-        if not p.is_file():
-            continue
-        if _should_skip(p):
-            continue
+    # junk dirs are pruned before descent; the walker yields files lazily so `cap` exits early
+    for e in iter_files(rootp, skip_dirs=JUNK_DIRS | RECYCLE_TOKENS, skip_file=_skip_name):
+        p = e.path
         ext = p.suffix.lower()
         if ext in (".ts", ".tsx", ".js", ".jsx", ".md"):
             count_by_ext[ext.lstrip(".")] = count_by_ext.get(ext.lstrip("."), 0) + 1
@@ -62,7 +56,7 @@ def scan_local(root: str, run_id: str, cap: int = 2000) -> Tuple[List[LocalCandi
             continue
         if _has_ts_sibling(p):
             continue
-        cand = LocalCandidate(repo="local", branch="local", src_path=str(p), size=p.stat().st_size)
+        cand = LocalCandidate(repo="local", branch="local", src_path=str(p), size=e.size)
         bundles[str(p)] = _bundle_for(p)
         cands.append(cand)
         if len(cands) >= cap:
@@ -1,7 +1,8 @@
 # app/review_multi.py
 from __future__ import annotations
-import json, os, time, pathlib
-from typing import Iterable, Dict, Any, List
+import contextlib, hashlib, json, os, threading, time, pathlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Dict, Any, List, Optional
 
 # ---------- Tier routing ----------
 TIERS = ("Free", "Premium", "Wow++")
@@ -27,41 +28,54 @@ def _allow(provider_name: str) -> bool:
     allowed = {p.strip().lower() for p in raw.split(",") if p.strip()}
     return provider_name.lower() in allowed
 
+def _parse_review(content: str, provider: str, model: str, default_score: int) -> Dict[str, Any]:
+    # try parse JSON from content; fallback to summary only
+    try:
+        data = json.loads(content)
+        score = int(data.get("score", default_score))
+        summary = str(data.get("summary", "")).strip()
+    except Exception:
+        score, summary = default_score, content.strip()
+    return {"ok": True, "provider": provider, "model": model, "summary": summary, "score": max(0, min(100, score))}
+
+OPENAI_REVIEW_SYSTEM = "You are a strict TypeScript code reviewer. Respond JSON with fields: summary, score(0-100)."
+
 def _openai_chat(prompt: str, model: str="gpt-4o-mini") -> Dict[str, Any]:
     if not _allow("OpenAI"): return {"ok": False, "note": "disabled via AIO_PROVIDERS"}
     key = os.getenv("OPENAI_API_KEY")
     if not key: return {"ok": False, "note": "OPENAI_API_KEY missing"}
+    system = OPENAI_REVIEW_SYSTEM
     try:
-        # prefer new SDK if available
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=key)
-            resp = client.chat.completions.create(
-                model=model,
-                messages=[{"role":"system","content":"You are a strict TypeScript code reviewer. Respond JSON with fields: summary, score(0-100)."},
-                          {"role":"user",   "content": prompt}],
-                temperature=0.2,
-            )
-            content = resp.choices[0].message.content or ""
-        except Exception:
-            # fallback to legacy SDK if installed as `openai`
-            import openai  # type: ignore
-            openai.api_key = key
-            resp = openai.ChatCompletion.create(
-                model=model,
-                messages=[{"role":"system","content":"You are a strict TypeScript code reviewer. Respond JSON with fields: summary, score(0-100)."},
-                          {"role":"user",   "content": prompt}],
-                temperature=0.2,
-            )
-            content = resp.choices[0].message["content"] or ""
-        # try parse JSON from content; fallback to summary only
-        try:
-            data = json.loads(content)
-            score = int(data.get("score", 60))
-            summary = str(data.get("summary", "")).strip()
-        except Exception:
-            score, summary = 60, content.strip()
-        return {"ok": True, "provider": "openai", "model": model, "summary": summary, "score": max(0, min(100, score))}
+        from app.services import llm_cache
+
+        def _live() -> str:
+            # prefer new SDK if available
+            try:
+                from app.services.http_transport import openai_client
+                from app.services import rate_limiter
+                client = openai_client(api_key=key)
+                resp = rate_limiter.call("openai", lambda: client.chat.completions.create(
+                    model=model,
+                    messages=[{"role":"system","content":system},
+                              {"role":"user",   "content": prompt}],
+                    temperature=0.2,
+                ), tokens=rate_limiter.estimate_tokens(prompt) * 2)
+                return resp.choices[0].message.content or ""
+            except Exception:
+                # fallback to legacy SDK if installed as `openai`
+                import openai  # type: ignore
+                openai.api_key = key
+                resp = openai.ChatCompletion.create(
+                    model=model,
+                    messages=[{"role":"system","content":system},
+                              {"role":"user",   "content": prompt}],
+                    temperature=0.2,
+                )
+                return resp.choices[0].message["content"] or ""
+
+        # unchanged file + same prompt/model -> answered from the response cache
+        content = llm_cache.cached_text("openai", model, system, prompt, 0.2, _live)
+        return _parse_review(content, "openai", model, 60)
     except Exception as e:
         return {"ok": False, "note": f"openai err: {e.__class__.__name__}: {e}"}
 
@@ -70,11 +84,18 @@ def _gemini_review(prompt: str, model: str="gemini-1.5-flash") -> Dict[str, Any]
     key = os.getenv("GEMINI_API_KEY")
     if not key: return {"ok": False, "note": "GEMINI_API_KEY missing"}
     try:
-        import google.generativeai as genai  # type: ignore
-        genai.configure(api_key=key)
-        m = genai.GenerativeModel(model)
-        r = m.generate_content(prompt)
-        text = (getattr(r, "text", None) or getattr(r, "candidates", [{}])[0].get("content", "") or "").strip()
+        from app.services import llm_cache
+
+        def _live() -> str:
+            import google.generativeai as genai  # type: ignore
+            from app.services import rate_limiter
+            genai.configure(api_key=key)
+            m = genai.GenerativeModel(model)
+            r = rate_limiter.call("gemini", lambda: m.generate_content(prompt),
+                                  tokens=rate_limiter.estimate_tokens(prompt) * 2)
+            return (getattr(r, "text", None) or getattr(r, "candidates", [{}])[0].get("content", "") or "").strip()
+
+        text = llm_cache.cached_text("gemini", model, "", prompt, None, _live)
         # naive score scrape
         score = 65
         return {"ok": True, "provider":"gemini", "model": model, "summary": text, "score": score}
@@ -86,8 +107,8 @@ def _grok_review(prompt: str, model: str="grok-beta") -> Dict[str, Any]:
     key = os.getenv("GROK_API_KEY") or os.getenv("XAI_API_KEY")
     if not key: return {"ok": False, "note": "GROK_API_KEY/XAI_API_KEY missing"}
     try:
-        # simple HTTPS call; avoid requiring a specific SDK
-        import requests  # type: ignore
+        # simple HTTPS call on the shared keep-alive pool (rate-limited); avoid requiring a specific SDK
+        from app.services import llm_cache, rate_limiter
         url = "https://api.x.ai/v1/chat/completions"
         payload = {
             "model": model,
@@ -97,16 +118,16 @@ def _grok_review(prompt: str, model: str="grok-beta") -> Dict[str, Any]:
             ],
             "temperature": 0.2
         }
-        resp = requests.post(url, headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"}, json=payload, timeout=30)
-        resp.raise_for_status()
-        content = resp.json()["choices"][0]["message"]["content"]
-        try:
-            data = json.loads(content)
-            score = int(data.get("score", 70))
-            summary = str(data.get("summary", "")).strip()
-        except Exception:
-            score, summary = 70, content.strip()
-        return {"ok": True, "provider":"grok", "model": model, "summary": summary, "score": max(0, min(100, score))}
+
+        def _live() -> str:
+            resp = rate_limiter.post("grok", url, tokens=rate_limiter.estimate_tokens(prompt) * 2,
+                                     headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
+                                     json=payload, timeout=30)
+            resp.raise_for_status()
+            return resp.json()["choices"][0]["message"]["content"]
+
+        content = llm_cache.cached_text("grok", model, payload["messages"][0]["content"], prompt, 0.2, _live)
+        return _parse_review(content, "grok", model, 70)
     except Exception as e:
         return {"ok": False, "note": f"grok err: {e.__class__.__name__}: {e}"}
 
@@ -116,79 +137,311 @@ def _mk_prompt(kind: str, rel_path: str, text: str) -> str:
         return f"""File: {rel_path}
 Task: Quick value check and function/type sanity. Return JSON: {{ "summary": "...", "score": 0-100 }}.
 Code:
-{text[:6000]}"""
+{text}"""
     if kind == "premium":
         return f"""File: {rel_path}
 Task: Type inference & refactor suggestions focusing on props, event handlers, and state. Return JSON: {{ "summary": "...", "score": 0-100 }}.
 Code:
-{text[:6000]}"""
+{text}"""
     # wow++
     return f"""File: {rel_path}
 Task: System-level & perf insights (structure, lazy-loading, memoization, bundle impact). Return JSON: {{ "summary": "...", "score": 0-100 }}.
 Code:
-{text[:6000]}"""
+{text}"""
+
+def _mk_reduce_prompt(kind: str, rel_path: str, parts: List[tuple]) -> str:
+    findings = "\n".join(
+        f"- Part {c.index + 1}/{len(parts)} (lines {c.start_line}-{c.end_line}, score {r.get('score')}): "
+        f"{r.get('summary', '')}"
+        for c, r in parts
+    )
+    return f"""File: {rel_path}
+Task: Merge these {kind} review findings for consecutive parts of one file into a single review of the whole file. Drop duplicates, keep concrete issues. Return JSON: {{ "summary": "...", "score": 0-100 }}.
+Findings:
+{findings}"""
+
+# ---------- Chunked map-reduce ----------
+def _stitch(parts: List[tuple], n_chunks: int) -> Dict[str, Any]:
+    """Merge (chunk, ok result) pairs without a reduce call: joined summaries, mean score."""
+    first = parts[0][1]
+    return {
+        "ok": True, "provider": first.get("provider"), "model": first.get("model"), "chunks": n_chunks,
+        "summary": "\n".join(f"[lines {c.start_line}-{c.end_line}] {r.get('summary', '')}" for c, r in parts),
+        "score": _avg([r.get("score", 0) for _c, r in parts]),
+    }
+
+def _review(fn, kind: str, rel: str, text: str, gate=None, **kw) -> Dict[str, Any]:
+    """
+    One provider review of `text`. Files over AIO_REVIEW_CHUNK_TOKENS (default
+    1500) are split at declaration boundaries, the parts reviewed in parallel
+    and merged by one small reduce call, so nothing past the old 6000-char cut
+    is ignored. Smaller files get exactly one call, as before.
+
+    Every provider call (part, reduce or whole file) is made while holding
+    `gate`, the provider's in-flight semaphore, so chunk fan-out stays within
+    the per-provider cap.
+    """
+    from core.chunking import count_tokens, split_source
+    gate = gate if gate is not None else contextlib.nullcontext()
+
+    def fn_gated(prompt: str, **k) -> Dict[str, Any]:
+        with gate:
+            return fn(prompt, **k)
+
+    budget = _env_int("AIO_REVIEW_CHUNK_TOKENS", 1500)
+    chunks = split_source(text, budget) if count_tokens(text) > budget else []
+    if len(chunks) <= 1:
+        return fn_gated(_mk_prompt(kind, rel, text), **kw)
+
+    def _part(c) -> Dict[str, Any]:
+        label = f"{rel} (part {c.index + 1}/{len(chunks)}, lines {c.start_line}-{c.end_line})"
+        return fn_gated(_mk_prompt(kind, label, c.text), **kw)
+
+    with ThreadPoolExecutor(max_workers=min(len(chunks), _env_int("AIO_REVIEW_CHUNK_WORKERS", 8)),
+                            thread_name_prefix="review-chunk") as ex:
+        results = list(ex.map(_part, chunks))
+    parts = [(c, r) for c, r in zip(chunks, results) if r.get("ok")]
+    if not parts:
+        return results[0]
+    reduce_kw = dict(kw)
+    if "model" in kw and os.getenv("AIO_REVIEW_REDUCE_MODEL"):
+        reduce_kw["model"] = os.getenv("AIO_REVIEW_REDUCE_MODEL")
+    merged = fn_gated(_mk_reduce_prompt(kind, rel, parts), **reduce_kw)
+    if merged.get("ok"):
+        return {**merged, "chunks": len(chunks)}
+    # reduce failed: stitch the part findings together locally
+    return _stitch(parts, len(chunks))
+
+# ---------- Concurrency ----------
+# Per-provider caps (max in-flight calls) and files in flight; env-tunable.
+PROVIDER_CAPS = {"openai": 4, "gemini": 2, "grok": 2}
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, "") or default))
+    except ValueError:
+        return default
+
+def _provider_cap(name: str) -> int:
+    return _env_int(f"AIO_REVIEW_CAP_{name.upper()}", PROVIDER_CAPS[name])
+
+def _provider_pools() -> Dict[str, ThreadPoolExecutor]:
+    """One executor per provider, sized to its cap (AIO_REVIEW_CAP_<PROVIDER>)."""
+    return {
+        name: ThreadPoolExecutor(max_workers=_provider_cap(name), thread_name_prefix=f"review-{name}")
+        for name in PROVIDER_CAPS
+    }
+
+def _provider_gates() -> Dict[str, threading.BoundedSemaphore]:
+    """
+    One semaphore per provider, sized to the same cap. The pools bound how
+    many file reviews run per provider; the gates bound the actual calls,
+    including the chunk parts a single review fans out.
+    """
+    return {name: threading.BoundedSemaphore(_provider_cap(name)) for name in PROVIDER_CAPS}
+
+def _load(f: str, root_abs: str) -> tuple:
+    """(abs path, path relative to root, source text) for one input file."""
+    absf = os.path.abspath(f)
+    try:
+        rel = os.path.relpath(absf, root_abs) if absf.startswith(root_abs) else os.path.basename(absf)
+    except Exception:
+        rel = os.path.basename(absf)
+    # read source
+    try:
+        with open(absf, "r", encoding="utf-8", errors="ignore") as fh:
+            text = fh.read()
+    except Exception:
+        text = ""
+    return absf, rel, text
+
+def _write_tiers(out_root: str, rel: str, base_score: int, free_res: Dict[str, Any], premium_res: Dict[str, Any],
+                 wow_gem: Dict[str, Any], wow_grk: Dict[str, Any]) -> List[str]:
+    """Score and write the Free / Premium / Wow++ JSONs for one file; returns their paths in that order."""
+    links: List[str] = []
+
+    # aggregate scores per tier
+    free_score   = _avg([base_score] + ([free_res.get("score", 0)] if free_res.get("ok") else []))
+    prem_score   = _avg([base_score] + ([premium_res.get("score", 0)] if premium_res.get("ok") else []))
+    wow_scores   = [base_score] + [r.get("score", 0) for r in (wow_gem, wow_grk) if r.get("ok")]
+    wow_score    = _avg(wow_scores)
+
+    # write each tier JSON
+    def _write(tier: str, payload: Dict[str, Any]) -> None:
+        outp = os.path.join(out_root, tier, rel + ".json")
+        os.makedirs(os.path.dirname(outp), exist_ok=True)
+        with open(outp, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=2)
+        links.append(outp)
+
+    _write("Free", {
+        "file": rel, "tier": "Free", "provider": "openai", "ok": bool(free_res.get("ok")),
+        "model": free_res.get("model", os.getenv("AIO_MODEL","gpt-4o-mini")),
+        "summary": free_res.get("summary") or free_res.get("note", "offline/stub"),
+        "worth_score": free_score, "ts": int(time.time()),
+    })
+    _write("Premium", {
+        "file": rel, "tier": "Premium", "provider": "openai", "ok": bool(premium_res.get("ok")),
+        "model": premium_res.get("model", os.getenv("AIO_MODEL","gpt-4o-mini")),
+        "summary": premium_res.get("summary") or premium_res.get("note", "offline/stub"),
+        "worth_score": prem_score, "ts": int(time.time()),
+    })
+    _write("Wow++", {
+        "file": rel, "tier": "Wow++", "providers": {
+            "gemini": {"ok": bool(wow_gem.get("ok")), "model": wow_gem.get("model"),
+                       "note": wow_gem.get("note"), "summary": wow_gem.get("summary")},
+            "grok":   {"ok": bool(wow_grk.get("ok")), "model": wow_grk.get("model"),
+                       "note": wow_grk.get("note"), "summary": wow_grk.get("summary")},
+        },
+        "worth_score": wow_score, "ts": int(time.time()),
+    })
+    return links
+
+def _submit(pools: Dict[str, ThreadPoolExecutor], gates: Dict[str, threading.BoundedSemaphore], provider: str,
+            label: str, fn, *args, **kw) -> Future:
+    """Run `fn(*args, **kw)` on the provider's pool, passing it that provider's gate."""
+    if _allow(label):
+        return pools[provider].submit(fn, *args, gate=gates[provider], **kw)
+    done: Future = Future()
+    done.set_result({"ok": False, "note": f"{label} disabled"})
+    return done
+
+def _review_file(f: str, root_abs: str, out_root: str, pools: Dict[str, ThreadPoolExecutor],
+                 gates: Dict[str, threading.BoundedSemaphore]) -> List[str]:
+    """Fan the four tier calls for one file out to the provider pools, then write its tier JSONs."""
+    absf, rel, text = _load(f, root_abs)
+    base_score = _baseline_score(absf)
+    model = os.getenv("AIO_MODEL","gpt-4o-mini")
+
+    # --- Free / Premium: OpenAI quick + deeper pass; Wow++: Gemini + Grok (all in flight together)
+    free_f    = _submit(pools, gates, "openai", "OpenAI", _review, _openai_chat, "free", rel, text, model=model)
+    premium_f = _submit(pools, gates, "openai", "OpenAI", _review, _openai_chat, "premium", rel, text, model=model)
+    gem_f     = _submit(pools, gates, "gemini", "Gemini", _review, _gemini_review, "wow", rel, text)
+    grk_f     = _submit(pools, gates, "grok",   "Grok",   _review, _grok_review,   "wow", rel, text)
+    free_res, premium_res, wow_gem, wow_grk = (x.result() for x in (free_f, premium_f, gem_f, grk_f))
+    return _write_tiers(out_root, rel, base_score, free_res, premium_res, wow_gem, wow_grk)
 
 # ---------- Main entry ----------
-def run(files: Iterable[str], run_id: str, root: str) -> list[str]:
-    out_links: List[str] = []
+def run(files: Iterable[str], run_id: str, root: str, file_workers: Optional[int] = None) -> list[str]:
+    """
+    Review `files` into artifacts/reviews/<run_id>/<tier>/. Several files are
+    in flight at once (AIO_REVIEW_FILE_WORKERS, default 4) and each file's
+    tier calls run concurrently, capped per provider. Output paths, payloads
+    and the returned link order match a sequential run.
+    """
+    root_abs = os.path.abspath(root)
+    out_root = os.path.join("artifacts", "reviews", run_id)
+    n_files = file_workers or _env_int("AIO_REVIEW_FILE_WORKERS", 4)
+
+    pools, gates = _provider_pools(), _provider_gates()
+    try:
+        with ThreadPoolExecutor(max_workers=n_files, thread_name_prefix="review-file") as ex:
+            per_file = list(ex.map(lambda f: _review_file(f, root_abs, out_root, pools, gates), list(files)))
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True)
+    return [link for links in per_file for link in links]
+
+# ---------- Batch mode ----------
+def _chunk_prompts(kind: str, rel: str, text: str) -> List[tuple]:
+    """[(chunk or None, prompt)] exactly as _review() would send them (minus the reduce)."""
+    from core.chunking import count_tokens, split_source
+    budget = _env_int("AIO_REVIEW_CHUNK_TOKENS", 1500)
+    chunks = split_source(text, budget) if count_tokens(text) > budget else []
+    if len(chunks) <= 1:
+        return [(None, _mk_prompt(kind, rel, text))]
+    return [(c, _mk_prompt(kind, f"{rel} (part {c.index + 1}/{len(chunks)}, lines {c.start_line}-{c.end_line})",
+                           c.text))
+            for c in chunks]
+
+def _path_id(path: str) -> str:
+    """Batch custom_id prefix for a file: derived from its path, so a resumed job
+    whose file list changed never maps an answer onto another file."""
+    return hashlib.sha1(os.path.normcase(os.path.abspath(path)).encode("utf-8")).hexdigest()[:16]
+
+def run_batch(files: Iterable[str], run_id: str, root: str, poll_interval: Optional[float] = None,
+              timeout: Optional[float] = None) -> list[str]:
+    """
+    Offline variant of run() for large waves. The OpenAI tiers (Free, Premium)
+    of every file go out as one Batch API job (artifacts/batches/<run_id>/openai:
+    input.jsonl + job.json, resumable); prompts already in the response cache
+    are not sent. Wow++ (Gemini / Grok) runs on the provider pools while the
+    job is pending. Output lands in the same artifacts/reviews/<run_id>/<tier>/
+    layout as run(); multi-part files are stitched locally instead of reduced.
+    """
+    from app.services import llm_cache
+    from app.services.llm import batch_jobs
+
     root_abs = os.path.abspath(root)
     out_root = os.path.join("artifacts", "reviews", run_id)
+    model = os.getenv("AIO_MODEL","gpt-4o-mini")
+    loaded = [_load(f, root_abs) for f in files]
+
+    pools, gates = _provider_pools(), _provider_gates()
+    try:
+        wow = [(_submit(pools, gates, "gemini", "Gemini", _review, _gemini_review, "wow", rel, text),
+                _submit(pools, gates, "grok",   "Grok",   _review, _grok_review,   "wow", rel, text))
+               for _absf, rel, text in loaded]
+
+        openai_note = None
+        if not _allow("OpenAI"):
+            openai_note = "OpenAI disabled"
+        elif not os.getenv("OPENAI_API_KEY"):
+            openai_note = "OPENAI_API_KEY missing"
+
+        cache = llm_cache.open_cache()
+        plan: Dict[tuple, List[tuple]] = {}        # (file idx, kind) -> [(chunk, custom_id)]
+        known: Dict[str, Dict[str, Any]] = {}      # custom_id -> parsed result (cache hits / batch answers)
+        requests: Dict[str, Dict[str, Any]] = {}
+        keys: Dict[str, str] = {}
+        for i, (absf, rel, text) in enumerate(loaded):
+            for kind in ("free", "premium"):
+                if openai_note:
+                    continue
+                slots = plan[(i, kind)] = []
+                for j, (chunk, prompt) in enumerate(_chunk_prompts(kind, rel, text)):
+                    cid = f"{_path_id(absf)}:{kind}:{j}"
+                    slots.append((chunk, cid))
+                    key = llm_cache.cache_key("openai", model, OPENAI_REVIEW_SYSTEM, prompt, 0.2)
+                    hit = cache.get(key) if cache is not None and not llm_cache.bypass() else None
+                    if hit is not None:
+                        known[cid] = _parse_review(hit, "openai", model, 60)
+                        continue
+                    keys[cid] = key
+                    requests[cid] = {"model": model, "temperature": 0.2, "messages": [
+                        {"role": "system", "content": OPENAI_REVIEW_SYSTEM},
+                        {"role": "user", "content": prompt}]}
+
+        if requests:
+            try:
+                got = batch_jobs.run_job(pathlib.Path("artifacts") / "batches" / run_id / "openai", requests,
+                                         interval=poll_interval, timeout=timeout, metadata={"run_id": run_id})
+            except Exception as e:
+                err = f"{e.__class__.__name__}: {e}"
+                got = {cid: batch_jobs.BatchResult(cid, False, error=err) for cid in requests}
+            for cid, res in got.items():
+                if res.ok:
+                    known[cid] = _parse_review(res.content, "openai", model, 60)
+                    if cache is not None:
+                        cache.put(keys[cid], "openai", model, res.content)
+                else:
+                    known[cid] = {"ok": False, "note": f"openai batch err: {res.error}"}
+
+        def _tier(i: int, kind: str) -> Dict[str, Any]:
+            if openai_note:
+                return {"ok": False, "note": openai_note}
+            slots = plan[(i, kind)]
+            if len(slots) == 1:
+                return known[slots[0][1]]
+            parts = [(c, known[cid]) for c, cid in slots if known[cid].get("ok")]
+            return _stitch(parts, len(slots)) if parts else known[slots[0][1]]
 
-    for f in files:
-        absf = os.path.abspath(f)
-        try:
-            rel = os.path.relpath(absf, root_abs) if absf.startswith(root_abs) else os.path.basename(absf)
-        except Exception:
-            rel = os.path.basename(absf)
-        # read source
-        try:
-            with open(absf, "r", encoding="utf-8", errors="ignore") as fh:
-                text = fh.read()
-        except Exception:
-            text = ""
-
-        base_score = _baseline_score(absf)
-
-        # --- Free: OpenAI quick pass
-        free_res = _openai_chat(_mk_prompt("free", rel, text), model=os.getenv("AIO_MODEL","gpt-4o-mini")) if _allow("OpenAI") else {"ok": False, "note": "OpenAI disabled"}
-        # --- Premium: OpenAI deeper pass
-        premium_res = _openai_chat(_mk_prompt("premium", rel, text), model=os.getenv("AIO_MODEL","gpt-4o-mini")) if _allow("OpenAI") else {"ok": False, "note": "OpenAI disabled"}
-        # --- Wow++: Gemini + Grok
-        wow_gem = _gemini_review(_mk_prompt("wow", rel, text)) if _allow("Gemini") else {"ok": False, "note": "Gemini disabled"}
-        wow_grk = _grok_review(_mk_prompt("wow", rel, text))    if _allow("Grok")   else {"ok": False, "note": "Grok disabled"}
-
-        # aggregate scores per tier
-        free_score   = _avg([base_score] + ([free_res.get("score", 0)] if free_res.get("ok") else []))
-        prem_score   = _avg([base_score] + ([premium_res.get("score", 0)] if premium_res.get("ok") else []))
-        wow_scores   = [base_score] + [r.get("score", 0) for r in (wow_gem, wow_grk) if r.get("ok")]
-        wow_score    = _avg(wow_scores)
-
-        # write each tier JSON
-        def _write(tier: str, payload: Dict[str, Any]) -> None:
-            outp = os.path.join(out_root, tier, rel + ".json")
-            os.makedirs(os.path.dirname(outp), exist_ok=True)
-            with open(outp, "w", encoding="utf-8") as fh:
-                json.dump(payload, fh, indent=2)
-            out_links.append(outp)
-
-        _write("Free", {
-            "file": rel, "tier": "Free", "provider": "openai", "ok": bool(free_res.get("ok")),
-            "model": free_res.get("model", os.getenv("AIO_MODEL","gpt-4o-mini")),
-            "summary": free_res.get("summary") or free_res.get("note", "offline/stub"),
-            "worth_score": free_score, "ts": int(time.time()),
-        })
-        _write("Premium", {
-            "file": rel, "tier": "Premium", "provider": "openai", "ok": bool(premium_res.get("ok")),
-            "model": premium_res.get("model", os.getenv("AIO_MODEL","gpt-4o-mini")),
-            "summary": premium_res.get("summary") or premium_res.get("note", "offline/stub"),
-            "worth_score": prem_score, "ts": int(time.time()),
-        })
-        _write("Wow++", {
-            "file": rel, "tier": "Wow++", "providers": {
-                "gemini": {"ok": bool(wow_gem.get("ok")), "model": wow_gem.get("model"), "note": wow_gem.get("note"), "summary": wow_gem.get("summary")},
-                "grok":   {"ok": bool(wow_grk.get("ok")), "model": wow_grk.get("model"), "note": wow_grk.get("note"), "summary": wow_grk.get("summary")},
-            },
-            "worth_score": wow_score, "ts": int(time.time()),
-        })
-
-    return out_links
+        links: List[str] = []
+        for i, (absf, rel, _text) in enumerate(loaded):
+            gem_f, grk_f = wow[i]
+            links += _write_tiers(out_root, rel, _baseline_score(absf), _tier(i, "free"), _tier(i, "premium"),
+                                  gem_f.result(), grk_f.result())
+        return links
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=True)
@@ -0,0 +1,321 @@
+# Path: app/services/github_api.py
+"""
+Conditional-request, rate-limit-aware GitHub REST access for PR, label and
+comment bookkeeping.
+
+- Every GET carries If-None-Match with the ETag of the last response for
+  that URL; a 304 is answered from the on-disk cache. GitHub does not count
+  304s against the rate limit, so repeated bookkeeping (label lookups, PR
+  state checks) is close to free. Stale entries are harmless: a changed
+  resource simply comes back as a 200 with a new ETag.
+- A local branch -> PR map (per head/base) replaces paging through every
+  open PR; misses fall back to a head-filtered `GET /pulls?head=owner:branch`.
+- X-RateLimit-Remaining / -Reset from each response drive proactive pacing:
+  below AIO_GH_RL_LOW remaining calls, requests are spread evenly over the
+  time left until the reset instead of running into a 403. 429 / 5xx are
+  retried through app.services.rate_limiter (provider "github").
+
+Env:
+  GITHUB_TOKEN              : API token (the client is unavailable without it)
+  AIO_TARGET_REPO           : "owner/name" (default carfinancinghub/cfh)
+  AIO_GH_API_URL            : API root (default https://api.github.com)
+  AIO_GH_CACHE              : SQLite path (default reports/github_cache.sqlite);
+                              "0" / "off" keeps the cache in memory only
+  AIO_GH_CACHE_MAX_ENTRIES  : cached responses kept, LRU (default 2000)
+  AIO_GH_RL_LOW             : start pacing below this many remaining calls (default 200)
+  AIO_GH_RL_MAX_SLEEP       : longest single pacing sleep in seconds (default 60)
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from app.services import http_transport, rate_limiter
+
+DEFAULT_DB = Path("reports") / "github_cache.sqlite"
+DEFAULT_API = "https://api.github.com"
+_NEXT_RE = re.compile(r'<([^>]+)>;\s*rel="next"')
+
+
+class GitHubAPIError(RuntimeError):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"GitHub API {status}: {message}")
+        self.status = status
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def cache_path_from_env() -> Optional[Path]:
+    raw = os.getenv("AIO_GH_CACHE", "").strip()
+    if raw.lower() in {"0", "off", "false", "no"}:
+        return None
+    return Path(raw) if raw else DEFAULT_DB
+
+
+def _default_transport(method: str, url: str, headers: Dict[str, str], body: Any) -> Any:
+    return rate_limiter.call(
+        "github", lambda: http_transport.request("github", method, url, json=body, headers=headers))
+
+
+class GitHubAPI:
+    """
+    Thin client for one repository. `transport(method, url, headers, json)`
+    returns a response with status_code / headers / json(); the default goes
+    through the pooled http_transport behind the "github" rate limiter.
+    """
+
+    def __init__(self, repo: str, token: str, db_path: Optional[Path] = None,
+                 api_url: Optional[str] = None,
+                 transport: Optional[Callable[[str, str, Dict[str, str], Any], Any]] = None,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        self.repo = repo
+        self.owner = repo.split("/", 1)[0]
+        self.api_url = (api_url or os.getenv("AIO_GH_API_URL") or DEFAULT_API).rstrip("/")
+        self._token = token
+        self._transport = transport or _default_transport
+        self._sleep = sleep
+        self.low = _env_float("AIO_GH_RL_LOW", 200)
+        self.max_sleep = _env_float("AIO_GH_RL_MAX_SLEEP", 60)
+        self.max_entries = int(_env_float("AIO_GH_CACHE_MAX_ENTRIES", 2000))
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self.counts = {"requests": 0, "not_modified": 0, "paced_s": 0.0}
+        self._lock = threading.Lock()
+        if db_path is not None:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path) if db_path is not None else ":memory:",
+                                     timeout=30.0, check_same_thread=False)
+        if db_path is not None:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url     TEXT PRIMARY KEY,
+                    etag    TEXT NOT NULL,
+                    body    TEXT NOT NULL,
+                    link    TEXT,
+                    used_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS responses_used ON responses(used_at);
+                CREATE TABLE IF NOT EXISTS prs (
+                    repo       TEXT NOT NULL,
+                    head       TEXT NOT NULL,
+                    base       TEXT NOT NULL,
+                    number     INTEGER NOT NULL,
+                    url        TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (repo, head, base)
+                );
+                """
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---- transport ----------------------------------------------------------
+    def _pace(self) -> None:
+        """Spread the remaining budget over the time left in the window."""
+        with self._lock:
+            remaining, reset_at = self.remaining, self.reset_at
+        if remaining is None or remaining > self.low:
+            return
+        left = max(0.0, reset_at - time.time())
+        delay = min(self.max_sleep, left if remaining <= 0 else left / max(1, remaining))
+        if delay > 0:
+            self.counts["paced_s"] += delay
+            self._sleep(delay)
+
+    def _note_limits(self, headers: Any) -> None:
+        try:
+            rem = headers.get("x-ratelimit-remaining")
+            reset = headers.get("x-ratelimit-reset")
+        except Exception:
+            return
+        with self._lock:
+            if rem is not None:
+                self.remaining = int(rem)
+            if reset is not None:
+                self.reset_at = float(reset)
+
+    def _send(self, method: str, url: str, body: Any = None, etag: Optional[str] = None) -> Any:
+        self._pace()
+        headers = {"Accept": "application/vnd.github+json", "Authorization": f"Bearer {self._token}",
+                   "X-GitHub-Api-Version": "2022-11-28"}
+        if etag:
+            headers["If-None-Match"] = etag
+        resp = self._transport(method, url, headers, body)
+        self.counts["requests"] += 1
+        self._note_limits(getattr(resp, "headers", None) or {})
+        if resp.status_code == 403 and self.remaining == 0:
+            self._pace()  # primary limit exhausted anyway: wait for the reset once, then retry
+            resp = self._transport(method, url, headers, body)
+            self.counts["requests"] += 1
+            self._note_limits(getattr(resp, "headers", None) or {})
+        return resp
+
+    def _url(self, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        url = path if path.startswith("http") else f"{self.api_url}{path}"
+        return f"{url}?{urlencode(sorted(params.items()))}" if params else url
+
+    def _get_page(self, url: str) -> Tuple[int, Any, Optional[str]]:
+        """(status, parsed body, next-page url) with ETag revalidation."""
+        with self._lock:
+            row = self._conn.execute("SELECT etag, body, link FROM responses WHERE url=?", (url,)).fetchone()
+        resp = self._send("GET", url, etag=row[0] if row else None)
+        status = resp.status_code
+        if status == 304 and row:
+            self.counts["not_modified"] += 1
+            with self._lock, self._conn:
+                self._conn.execute("UPDATE responses SET used_at=? WHERE url=?", (time.time(), url))
+            return 200, json.loads(row[1]), row[2]
+        if status >= 400:
+            return status, None, None
+        data = resp.json() if status != 204 else None
+        m = _NEXT_RE.search(resp.headers.get("link") or "")
+        nxt = m.group(1) if m else None
+        etag = resp.headers.get("etag")
+        if etag:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses(url, etag, body, link, used_at) VALUES (?,?,?,?,?)",
+                    (url, etag, json.dumps(data), nxt, time.time()))
+                self._conn.execute(
+                    "DELETE FROM responses WHERE url NOT IN (SELECT url FROM responses ORDER BY used_at DESC LIMIT ?)",
+                    (max(1, self.max_entries),))
+        return status, data, nxt
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, allow_404: bool = False) -> Any:
+        status, data, _ = self._get_page(self._url(path, params))
+        if status == 404 and allow_404:
+            return None
+        if status >= 400:
+            raise GitHubAPIError(status, f"GET {path}")
+        return data
+
+    def get_all(self, path: str, params: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Every page of a list endpoint (each page revalidated on its own ETag)."""
+        out: List[Any] = []
+        url: Optional[str] = self._url(path, {"per_page": 100, **(params or {})})
+        while url:
+            status, data, url = self._get_page(url)
+            if status >= 400:
+                raise GitHubAPIError(status, f"GET {path}")
+            out.extend(data or [])
+        return out
+
+    def send(self, method: str, path: str, body: Any = None) -> Any:
+        resp = self._send(method, self._url(path), body=body)
+        if resp.status_code >= 400:
+            raise GitHubAPIError(resp.status_code, f"{method} {path}: {getattr(resp, 'text', '')[:200]}")
+        return resp.json() if resp.status_code != 204 else None
+
+    # ---- pull requests ------------------------------------------------------
+    def _repo_path(self, rest: str) -> str:
+        return f"/repos/{self.repo}{rest}"
+
+    def _remember(self, head: str, base: str, pr: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prs(repo, head, base, number, url, updated_at) VALUES (?,?,?,?,?,?)",
+                (self.repo, head, base, int(pr["number"]), pr["html_url"], time.time()))
+
+    def _forget(self, number: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM prs WHERE repo=? AND number=?", (self.repo, int(number)))
+
+    def pull(self, number: int) -> Optional[Dict[str, Any]]:
+        return self.get(self._repo_path(f"/pulls/{int(number)}"), allow_404=True)
+
+    def find_pr(self, head: str, base: str) -> Optional[Dict[str, Any]]:
+        """Open PR for head -> base: the branch map (revalidated), else a head-filtered query."""
+        with self._lock:
+            row = self._conn.execute("SELECT number FROM prs WHERE repo=? AND head=? AND base=?",
+                                     (self.repo, head, base)).fetchone()
+        if row:
+            pr = self.pull(row[0])
+            if pr and pr.get("state") == "open" and pr["head"]["ref"] == head and pr["base"]["ref"] == base:
+                return pr
+            self._forget(row[0])
+        hits = self.get(self._repo_path("/pulls"), {"state": "open", "head": f"{self.owner}:{head}", "base": base})
+        if not hits:
+            return None
+        self._remember(head, base, hits[0])
+        return hits[0]
+
+    def create_pull(self, title: str, body: str, head: str, base: str, draft: bool = True) -> Dict[str, Any]:
+        pr = self.send("POST", self._repo_path("/pulls"),
+                       {"title": title, "body": body, "head": head, "base": base, "draft": draft})
+        self._remember(head, base, pr)
+        return pr
+
+    def find_or_create_pr(self, title: str, body: str, head: str, base: str, draft: bool = True) -> Dict[str, Any]:
+        return self.find_pr(head, base) or self.create_pull(title, body, head, base, draft)
+
+    def open_pulls(self) -> List[Dict[str, Any]]:
+        return self.get_all(self._repo_path("/pulls"), {"state": "open"})
+
+    def close_pull(self, number: int) -> Dict[str, Any]:
+        pr = self.send("PATCH", self._repo_path(f"/pulls/{int(number)}"), {"state": "closed"})
+        self._forget(number)
+        return pr
+
+    # ---- labels / comments --------------------------------------------------
+    def ensure_label(self, name: str, color: str) -> Dict[str, Any]:
+        label = self.get(self._repo_path(f"/labels/{quote(name, safe='')}"), allow_404=True)
+        return label or self.send("POST", self._repo_path("/labels"), {"name": name, "color": color})
+
+    def add_labels(self, number: int, labels: Dict[str, str]) -> List[str]:
+        """Ensure `labels` ({name: color}) exist and are on the issue/PR; returns names newly added."""
+        have = {lb["name"] for lb in self.get_all(self._repo_path(f"/issues/{int(number)}/labels"))}
+        missing = [n for n in labels if n not in have]
+        for n in missing:
+            self.ensure_label(n, labels[n])
+        if missing:
+            self.send("POST", self._repo_path(f"/issues/{int(number)}/labels"), {"labels": missing})
+        return missing
+
+    def comment(self, number: int, body: str) -> Dict[str, Any]:
+        return self.send("POST", self._repo_path(f"/issues/{int(number)}/comments"), {"body": body})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            cached = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            prs = self._conn.execute("SELECT COUNT(*) FROM prs WHERE repo=?", (self.repo,)).fetchone()[0]
+        return {**self.counts, "cached": int(cached), "branch_prs": int(prs),
+                "rate_remaining": self.remaining, "rate_reset": self.reset_at}
+
+
+_OPEN: Dict[str, GitHubAPI] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def open_api(repo: Optional[str] = None, token: Optional[str] = None) -> Optional[GitHubAPI]:
+    """Process-wide client for `repo` (default AIO_TARGET_REPO); None without a token or HTTP library."""
+    token = token or os.getenv("GITHUB_TOKEN", "")
+    if not token or not http_transport.available():
+        return None
+    repo = repo or os.getenv("AIO_TARGET_REPO", "carfinancinghub/cfh")
+    with _OPEN_LOCK:
+        api = _OPEN.get(repo)
+        if api is None:
+            try:
+                api = GitHubAPI(repo, token, cache_path_from_env())
+            except sqlite3.Error:
+                return None
+            _OPEN[repo] = api
+        return api
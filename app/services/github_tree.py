@@ -0,0 +1,169 @@
+# Path: app/services/github_tree.py
+"""
+Delta-only, batched tree uploads through the GitHub Git Data API.
+
+Instead of one create_git_blob round trip per file:
+- git blob SHAs are computed locally and compared with the recursive base
+  tree; files whose SHA is already there are dropped from the push,
+- small UTF-8 files go straight into the tree entries as inline `content`
+  (GitHub creates the blob server-side, no extra request),
+- the remaining blobs (large or binary) are uploaded concurrently, at most
+  AIO_GH_UPLOAD_WORKERS at a time,
+- very large change sets are split into a chain of commits of at most
+  AIO_GH_COMMIT_MAX_FILES entries each, so no single tree request blows the
+  API payload limits.
+Request count therefore scales with the number of changed files, not with
+the batch size.
+
+Works with a PyGithub Repository; `github` is only imported when pushing.
+
+Env:
+  AIO_GH_INLINE_MAX       : largest file (bytes) sent inline in the tree (default 65536)
+  AIO_GH_UPLOAD_WORKERS   : concurrent blob uploads (default 8)
+  AIO_GH_UPLOAD_TIMEOUT   : seconds per blob upload (default 120)
+  AIO_GH_COMMIT_MAX_FILES : tree entries per commit (default 500)
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.dispatch import dispatch
+
+FILE_MODE = "100644"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def blob_sha(data: bytes) -> str:
+    """SHA git assigns to a blob with this content (`git hash-object`)."""
+    h = hashlib.sha1(b"blob %d\0" % len(data))
+    h.update(data)
+    return h.hexdigest()
+
+
+def _utf8(data: bytes) -> Optional[str]:
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+@dataclass
+class UploadPlan:
+    unchanged: List[str] = field(default_factory=list)               # same SHA already in the base tree
+    inline: List[Tuple[str, str]] = field(default_factory=list)      # (path, text) sent as tree content
+    blobs: List[Tuple[str, bytes]] = field(default_factory=list)     # (path, data) uploaded as blobs
+
+    @property
+    def changed(self) -> int:
+        return len(self.inline) + len(self.blobs)
+
+
+def plan_upload(files: Iterable[Tuple[str, bytes]], base: Dict[str, str],
+                inline_max: Optional[int] = None) -> UploadPlan:
+    """
+    Split `files` ([(repo_path, data)]) against `base` ({repo_path: blob sha}
+    of the base tree). A path listed twice keeps its last content.
+    """
+    inline_max = inline_max if inline_max is not None else _env_int("AIO_GH_INLINE_MAX", 65536)
+    plan = UploadPlan()
+    for path, data in dict(files).items():
+        if base.get(path) == blob_sha(data):
+            plan.unchanged.append(path)
+            continue
+        text = _utf8(data) if len(data) <= inline_max else None
+        if text is not None:
+            plan.inline.append((path, text))
+        else:
+            plan.blobs.append((path, data))
+    return plan
+
+
+def read_files(repo_files: Iterable[Tuple[str, Path]]) -> List[Tuple[str, bytes]]:
+    return [(str(rp).replace("\\", "/"), Path(lp).read_bytes()) for rp, lp in repo_files]
+
+
+def base_blobs(repo: Any, tree_sha: str) -> Dict[str, str]:
+    """{path: sha} of every blob in the base tree (one recursive request)."""
+    tree = repo.get_git_tree(tree_sha, recursive=True)
+    return {e.path: e.sha for e in tree.tree if e.type == "blob"}
+
+
+@dataclass
+class PushResult:
+    commit: Any                      # head GitCommit (the base commit when nothing changed)
+    commits: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    inline: int = 0
+    blobs: int = 0
+    requests: int = 0
+    ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"commits": self.commits, "unchanged": self.unchanged, "inline": self.inline,
+                "blobs": self.blobs, "requests": self.requests, "ms": self.ms}
+
+
+def _upload_blobs(repo: Any, blobs: Sequence[Tuple[str, bytes]]) -> Dict[str, str]:
+    def one(item: Tuple[str, bytes]) -> str:
+        _path, data = item
+        text = _utf8(data)
+        if text is not None:
+            return repo.create_git_blob(text, "utf-8").sha
+        return repo.create_git_blob(base64.b64encode(data).decode("ascii"), "base64").sha
+
+    outs = dispatch(one, list(blobs), workers=_env_int("AIO_GH_UPLOAD_WORKERS", 8), mode="thread",
+                    timeout=float(_env_int("AIO_GH_UPLOAD_TIMEOUT", 120)))
+    failed = [f"{o.item[0]}: {'timeout' if o.timed_out else o.error}" for o in outs if not o.ok]
+    if failed:
+        raise RuntimeError(f"blob upload failed for {len(failed)} file(s): " + "; ".join(failed[:5]))
+    return {o.item[0]: o.value for o in outs}
+
+
+def push_files(repo: Any, base_commit: Any, files: Iterable[Tuple[str, bytes]], message: str,
+               inline_max: Optional[int] = None, max_files: Optional[int] = None) -> PushResult:
+    """
+    Commit `files` on top of `base_commit` (a GitCommit), uploading only what
+    differs from its tree. Returns the new head commit; when nothing changed
+    it is an empty commit on the base tree, so callers can still move a
+    branch and open a PR as before.
+    """
+    from github import InputGitTreeElement  # local import to avoid top-level dependency
+
+    t0 = time.perf_counter()
+    plan = plan_upload(files, base_blobs(repo, base_commit.tree.sha), inline_max)
+    res = PushResult(commit=base_commit, unchanged=len(plan.unchanged), inline=len(plan.inline),
+                     blobs=len(plan.blobs), requests=1 + len(plan.blobs))
+    shas = _upload_blobs(repo, plan.blobs) if plan.blobs else {}
+    elements = sorted(
+        [(p, InputGitTreeElement(p, FILE_MODE, "blob", content=text)) for p, text in plan.inline]
+        + [(p, InputGitTreeElement(p, FILE_MODE, "blob", sha=shas[p])) for p, _d in plan.blobs],
+        key=lambda pe: pe[0])
+    if not elements:
+        res.commit = repo.create_git_commit(message, base_commit.tree, [base_commit])
+        res.commits.append(res.commit.sha)
+        res.requests += 1
+    else:
+        step = max(1, max_files or _env_int("AIO_GH_COMMIT_MAX_FILES", 500))
+        chunks = [elements[i:i + step] for i in range(0, len(elements), step)]
+        head, tree = base_commit, base_commit.tree
+        for n, chunk in enumerate(chunks, 1):
+            tree = repo.create_git_tree([e for _p, e in chunk], base_tree=tree)
+            msg = message if len(chunks) == 1 else f"{message} ({n}/{len(chunks)})"
+            head = repo.create_git_commit(msg, tree, [head])
+            res.commits.append(head.sha)
+            res.requests += 2
+        res.commit = head
+    res.ms = round((time.perf_counter() - t0) * 1000.0, 2)
+    return res
@@ -0,0 +1,200 @@
+# Path: app/services/http_transport.py
+"""
+Shared HTTP transport for every LLM client.
+
+- One keep-alive connection pool per provider (openai, gemini, grok, ...),
+  created lazily and reused for the life of the process, so only the first
+  call to a host pays the TCP + TLS handshake.
+- HTTP/2 via httpx when `httpx` and `h2` are installed; otherwise a
+  requests.Session with a sized HTTPAdapter.
+- One shared OpenAI SDK client per (api key, base url); the SDK's own httpx
+  pool is reused instead of being rebuilt on every call.
+
+Env:
+  AIO_HTTP_CONNECT_TIMEOUT : seconds (default 10)
+  AIO_HTTP_READ_TIMEOUT    : seconds (default 90)
+  AIO_HTTP_POOL_SIZE       : max pooled connections per provider (default 16)
+  AIO_HTTP2                : "0" disables HTTP/2 even when available (default on)
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except Exception:
+    requests = None
+    HTTPAdapter = None
+
+try:
+    import httpx
+except Exception:
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (presence check: httpx needs it for http2=True)
+    _HAS_H2 = True
+except Exception:
+    _HAS_H2 = False
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, "") or default))
+    except ValueError:
+        return default
+
+
+def timeouts(read: Optional[float] = None) -> Tuple[float, float]:
+    """(connect, read) seconds; `read` overrides the env default for one call."""
+    return (_env_float("AIO_HTTP_CONNECT_TIMEOUT", 10.0),
+            read if read is not None else _env_float("AIO_HTTP_READ_TIMEOUT", 90.0))
+
+
+def http2_enabled() -> bool:
+    return httpx is not None and _HAS_H2 and os.getenv("AIO_HTTP2", "1") != "0"
+
+
+def available() -> bool:
+    """True if some HTTP client library is installed."""
+    return httpx is not None or requests is not None
+
+
+_CLIENTS: Dict[str, Any] = {}
+_OPENAI: Dict[Tuple[str, str], Any] = {}
+_LOCK = threading.Lock()
+
+
+def _new_client(provider: str) -> Any:
+    size = _env_int("AIO_HTTP_POOL_SIZE", 16)
+    if http2_enabled() or (requests is None and httpx is not None):
+        connect, read = timeouts()
+        return httpx.Client(
+            http2=http2_enabled(),
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+        )
+    if requests is None:
+        raise RuntimeError("no HTTP client installed (pip install requests or httpx)")
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=size, max_retries=0)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers["User-Agent"] = f"aio-orchestrator/{provider}"
+    return s
+
+
+def client(provider: str) -> Any:
+    """Pooled client (httpx.Client or requests.Session) for `provider`."""
+    key = provider.lower()
+    with _LOCK:
+        c = _CLIENTS.get(key)
+        if c is None:
+            c = _CLIENTS[key] = _new_client(key)
+        return c
+
+
+def post(provider: str, url: str, *, json: Any = None, data: Any = None,
+         headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+         files: Any = None) -> Any:
+    """
+    POST through the provider's pool. Returns the library's response object
+    (both expose status_code, headers, text, content, json(), raise_for_status()).
+    `timeout` overrides the read timeout for this call; `files` (with `data`
+    as a dict of form fields) sends multipart/form-data.
+    """
+    c = client(provider)
+    connect, read = timeouts(timeout)
+    if httpx is not None and isinstance(c, httpx.Client):
+        body = {"data": data} if files is not None else {"content": data}
+        return c.post(url, json=json, files=files, headers=headers,
+                      timeout=httpx.Timeout(read, connect=connect), **body)
+    return c.post(url, json=json, data=data, files=files, headers=headers, timeout=(connect, read))
+
+
+def get(provider: str, url: str, *, headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None) -> Any:
+    """GET through the provider's pool (see post())."""
+    c = client(provider)
+    connect, read = timeouts(timeout)
+    if httpx is not None and isinstance(c, httpx.Client):
+        return c.get(url, headers=headers, timeout=httpx.Timeout(read, connect=connect))
+    return c.get(url, headers=headers, timeout=(connect, read))
+
+
+def request(provider: str, method: str, url: str, *, json: Any = None,
+            headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Any:
+    """Any HTTP method (GET/POST/PATCH/PUT/DELETE) through the provider's pool (see post())."""
+    c = client(provider)
+    connect, read = timeouts(timeout)
+    if httpx is not None and isinstance(c, httpx.Client):
+        return c.request(method.upper(), url, json=json, headers=headers, timeout=httpx.Timeout(read, connect=connect))
+    return c.request(method.upper(), url, json=json, headers=headers, timeout=(connect, read))
+
+
+def open_stream(provider: str, url: str, *, json: Any = None, data: Any = None,
+                headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> Any:
+    """
+    POST and return the response with the body still unread (for SSE). The
+    caller iterates `iter_lines()` and must `close()` it; closing early
+    drops the connection, which is how a stream is cancelled.
+    """
+    c = client(provider)
+    connect, read = timeouts(timeout)
+    if httpx is not None and isinstance(c, httpx.Client):
+        req = c.build_request("POST", url, json=json, content=data, headers=headers,
+                              timeout=httpx.Timeout(read, connect=connect))
+        return c.send(req, stream=True)
+    return c.post(url, json=json, data=data, headers=headers, timeout=(connect, read), stream=True)
+
+
+def openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None) -> Any:
+    """
+    Shared OpenAI SDK client (openai>=1). Raises RuntimeError if the SDK is
+    missing so callers can fall back exactly as before.
+    """
+    try:
+        from openai import OpenAI
+    except Exception as e:
+        raise RuntimeError(f"OpenAI client unavailable: {e}")
+    key = (api_key or os.getenv("OPENAI_API_KEY", ""), base_url or "")
+    with _LOCK:
+        c = _OPENAI.get(key)
+        if c is None:
+            # retries/backoff are owned by app.services.rate_limiter
+            kwargs: Dict[str, Any] = {"timeout": timeouts()[1], "max_retries": 0}
+            if api_key:
+                kwargs["api_key"] = api_key
+            if base_url:
+                kwargs["base_url"] = base_url
+            if httpx is not None:
+                size = _env_int("AIO_HTTP_POOL_SIZE", 16)
+                kwargs["http_client"] = httpx.Client(
+                    http2=http2_enabled(),
+                    timeout=httpx.Timeout(timeouts()[1], connect=timeouts()[0]),
+                    limits=httpx.Limits(max_connections=size, max_keepalive_connections=size),
+                )
+            c = _OPENAI[key] = OpenAI(**kwargs)
+        return c
+
+
+def close_all() -> None:
+    """Close every pooled connection (tests / shutdown)."""
+    with _LOCK:
+        for c in list(_CLIENTS.values()) + list(_OPENAI.values()):
+            try:
+                c.close()
+            except Exception:
+                pass
+        _CLIENTS.clear()
+        _OPENAI.clear()
@@ -0,0 +1,168 @@
+# Path: app/services/llm/batch_jobs.py
+"""
+Offline batch jobs against an OpenAI-compatible Batch API.
+
+Flow (one job per run + endpoint):
+  1. write the requests as a batch JSONL file (one line per custom_id);
+  2. upload it (POST /files, purpose=batch) and create the batch
+     (POST /batches, completion_window=24h);
+  3. poll GET /batches/{id} until it reaches a terminal status;
+  4. download output / error files and map each line back by custom_id.
+
+The job id is persisted next to the input (job.json), so re-running the same
+work directory resumes polling instead of submitting (and paying) twice.
+Batch pricing is roughly half of synchronous calls and the requests do not
+count against the interactive rate limits.
+
+Env:
+  AIO_BATCH_BASE_URL : API root (default OPENAI_BASE_URL or https://api.openai.com/v1);
+                       point it at app.services.llm.batch_stub for local runs
+  AIO_BATCH_POLL_S   : seconds between status polls (default 30)
+  AIO_BATCH_TIMEOUT_S: give up polling after this long (default 86400)
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from app.services import http_transport
+
+TERMINAL = frozenset({"completed", "failed", "expired", "cancelled"})
+CHAT_ENDPOINT = "/v1/chat/completions"
+
+
+class BatchError(RuntimeError):
+    pass
+
+
+@dataclass
+class BatchResult:
+    custom_id: str
+    ok: bool
+    content: str = ""
+    error: str = ""
+
+
+def base_url() -> str:
+    return (os.getenv("AIO_BATCH_BASE_URL") or os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1").rstrip("/")
+
+
+def _headers(api_key: Optional[str]) -> Dict[str, str]:
+    key = api_key or os.getenv("OPENAI_API_KEY", "")
+    return {"Authorization": f"Bearer {key}"} if key else {}
+
+
+def write_jsonl(path: Path, requests: Dict[str, Dict[str, Any]], endpoint: str = CHAT_ENDPOINT) -> Path:
+    """`requests` maps custom_id -> request body (e.g. a chat.completions payload)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        for cid, body in requests.items():
+            fh.write(json.dumps({"custom_id": cid, "method": "POST", "url": endpoint, "body": body},
+                                ensure_ascii=False) + "\n")
+    return path
+
+
+def _checked(resp: Any, what: str) -> Dict[str, Any]:
+    if resp.status_code >= 400:
+        raise BatchError(f"{what}: HTTP {resp.status_code}: {resp.text[:300]}")
+    return resp.json()
+
+
+def submit(jsonl: Path, *, api_key: Optional[str] = None, endpoint: str = CHAT_ENDPOINT,
+           metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Upload `jsonl` and create the batch; returns the batch object."""
+    root, headers = base_url(), _headers(api_key)
+    with jsonl.open("rb") as fh:
+        uploaded = _checked(http_transport.post(
+            "openai-batch", f"{root}/files", headers=headers, data={"purpose": "batch"},
+            files={"file": (jsonl.name, fh, "application/jsonl")}), "upload")
+    body = {"input_file_id": uploaded["id"], "endpoint": endpoint, "completion_window": "24h"}
+    if metadata:
+        body["metadata"] = metadata
+    return _checked(http_transport.post("openai-batch", f"{root}/batches", headers=headers, json=body), "create")
+
+
+def status(batch_id: str, *, api_key: Optional[str] = None) -> Dict[str, Any]:
+    return _checked(http_transport.get("openai-batch", f"{base_url()}/batches/{batch_id}",
+                                       headers=_headers(api_key)), "status")
+
+
+def poll(batch_id: str, *, api_key: Optional[str] = None, interval: Optional[float] = None,
+         timeout: Optional[float] = None, on_status: Optional[Callable[[Dict[str, Any]], None]] = None,
+         sleep: Callable[[float], None] = time.sleep) -> Dict[str, Any]:
+    """Block until the batch is terminal (or raise BatchError on timeout)."""
+    interval = float(interval if interval is not None else os.getenv("AIO_BATCH_POLL_S", "30") or 30)
+    timeout = float(timeout if timeout is not None else os.getenv("AIO_BATCH_TIMEOUT_S", "86400") or 86400)
+    deadline = time.monotonic() + timeout
+    while True:
+        batch = status(batch_id, api_key=api_key)
+        if on_status:
+            on_status(batch)
+        if batch.get("status") in TERMINAL:
+            return batch
+        if time.monotonic() >= deadline:
+            raise BatchError(f"batch {batch_id} still {batch.get('status')} after {timeout:.0f}s")
+        sleep(interval)
+
+
+def _file_lines(file_id: Optional[str], api_key: Optional[str]) -> Iterable[Dict[str, Any]]:
+    if not file_id:
+        return []
+    resp = http_transport.get("openai-batch", f"{base_url()}/files/{file_id}/content", headers=_headers(api_key))
+    if resp.status_code >= 400:
+        raise BatchError(f"download {file_id}: HTTP {resp.status_code}")
+    return [json.loads(line) for line in resp.text.splitlines() if line.strip()]
+
+
+def results(batch: Dict[str, Any], *, api_key: Optional[str] = None) -> Dict[str, BatchResult]:
+    """custom_id -> BatchResult for every line of the output and error files."""
+    out: Dict[str, BatchResult] = {}
+    rows = list(_file_lines(batch.get("output_file_id"), api_key)) + list(
+        _file_lines(batch.get("error_file_id"), api_key))
+    for row in rows:
+        cid = row.get("custom_id", "")
+        resp = row.get("response") or {}
+        body = resp.get("body") or {}
+        if resp.get("status_code") == 200 and not row.get("error"):
+            try:
+                out[cid] = BatchResult(cid, True, body["choices"][0]["message"]["content"] or "")
+                continue
+            except (KeyError, IndexError, TypeError):
+                pass
+        err = row.get("error") or body.get("error") or {"message": f"status {resp.get('status_code')}"}
+        out[cid] = BatchResult(cid, False, error=str(err.get("message", err)) if isinstance(err, dict) else str(err))
+    return out
+
+
+def run_job(workdir: Path, requests: Dict[str, Dict[str, Any]], *, api_key: Optional[str] = None,
+            interval: Optional[float] = None, timeout: Optional[float] = None,
+            metadata: Optional[Dict[str, str]] = None) -> Dict[str, BatchResult]:
+    """
+    Submit (or resume) the job for `workdir` and return its results. Missing
+    custom_ids (expired / cancelled batches) come back as failed results.
+    """
+    workdir.mkdir(parents=True, exist_ok=True)
+    job_file = workdir / "job.json"
+    job: Dict[str, Any] = {}
+    if job_file.exists():
+        try:
+            job = json.loads(job_file.read_text(encoding="utf-8"))
+        except ValueError:
+            job = {}
+    if not job.get("id") or job.get("status") in ("failed", "expired", "cancelled"):
+        jsonl = write_jsonl(workdir / "input.jsonl", requests)
+        job = submit(jsonl, api_key=api_key, metadata=metadata)
+        job_file.write_text(json.dumps(job, indent=2), encoding="utf-8")
+
+    def _save(b: Dict[str, Any]) -> None:
+        job_file.write_text(json.dumps(b, indent=2), encoding="utf-8")
+
+    batch = poll(job["id"], api_key=api_key, interval=interval, timeout=timeout, on_status=_save)
+    got = results(batch, api_key=api_key)
+    for cid in requests:
+        got.setdefault(cid, BatchResult(cid, False, error=f"batch {batch.get('status')}: no result"))
+    return got
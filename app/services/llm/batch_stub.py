@@ -0,0 +1,165 @@
+# Path: app/services/llm/batch_stub.py
+"""
+Local stand-in for the OpenAI Batch API (tests and dry runs; no network).
+
+Implements just what batch_jobs uses:
+  POST /v1/files                  multipart upload (purpose=batch)
+  POST /v1/batches                create; the job completes after `delay` seconds
+  GET  /v1/batches/{id}           validating -> in_progress -> completed
+  GET  /v1/files/{id}/content     input / output / error JSONL
+
+Each request line is answered by `responder(body) -> str` (the assistant
+content); raising makes that line land in the error file.
+
+Run standalone:  python -m app.services.llm.batch_stub --port 8765
+then set AIO_BATCH_BASE_URL=http://127.0.0.1:8765/v1
+"""
+from __future__ import annotations
+
+import argparse
+import email.parser
+import email.policy
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+Responder = Callable[[Dict[str, Any]], str]
+
+
+def default_responder(body: Dict[str, Any]) -> str:
+    return json.dumps({"summary": "stub review", "score": 75})
+
+
+def _multipart(content_type: str, body: bytes) -> Dict[str, bytes]:
+    """Form field name -> raw value of a multipart/form-data body."""
+    msg = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body)
+    return {part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+            for part in msg.iter_parts()}
+
+
+class BatchStub:
+    def __init__(self, responder: Optional[Responder] = None, delay: float = 0.0) -> None:
+        self.responder = responder or default_responder
+        self.delay = delay
+        self.files: Dict[str, str] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.created = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # ---- state ----------------------------------------------------------------
+    def _complete(self, b: Dict[str, Any]) -> None:
+        out, err = [], []
+        for line in self.files[b["input_file_id"]].splitlines():
+            if not line.strip():
+                continue
+            req = json.loads(line)
+            cid = req["custom_id"]
+            try:
+                content = self.responder(req["body"])
+                out.append({"id": f"req_{cid}", "custom_id": cid, "error": None, "response": {
+                    "status_code": 200, "body": {"choices": [{"message": {"role": "assistant", "content": content}}]}}})
+            except Exception as e:
+                err.append({"id": f"req_{cid}", "custom_id": cid, "response": None,
+                            "error": {"code": "stub_error", "message": str(e)}})
+        b["output_file_id"] = self._store("\n".join(json.dumps(r) for r in out)) if out else None
+        b["error_file_id"] = self._store("\n".join(json.dumps(r) for r in err)) if err else None
+        b["status"] = "completed"
+        b["request_counts"] = {"total": len(out) + len(err), "completed": len(out), "failed": len(err)}
+
+    def _store(self, text: str) -> str:
+        fid = f"file-{uuid.uuid4().hex[:12]}"
+        self.files[fid] = text
+        return fid
+
+    def batch(self, bid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            b = self.batches.get(bid)
+            if b is None:
+                return None
+            if b["status"] != "completed":
+                if time.time() - b["created_at"] >= self.delay:
+                    self._complete(b)
+                else:
+                    b["status"] = "in_progress"
+            return dict(b)
+
+    # ---- server ---------------------------------------------------------------
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, code: int, payload: Any, raw: bool = False) -> None:
+                data = payload.encode() if raw else json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/jsonl" if raw else "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                if self.path.endswith("/files"):
+                    body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                    form = _multipart(self.headers["Content-Type"], body)
+                    with stub._lock:
+                        fid = stub._store(form.get("file", b"").decode("utf-8"))
+                    return self._send(200, {"id": fid, "object": "file", "purpose": form.get("purpose", b"").decode()})
+                if self.path.endswith("/batches"):
+                    body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                    if body.get("input_file_id") not in stub.files:
+                        return self._send(400, {"error": {"message": "unknown input_file_id"}})
+                    with stub._lock:
+                        bid = f"batch_{uuid.uuid4().hex[:12]}"
+                        stub.created += 1
+                        stub.batches[bid] = {"id": bid, "object": "batch", "status": "validating",
+                                             "input_file_id": body["input_file_id"], "endpoint": body.get("endpoint"),
+                                             "created_at": time.time(), "metadata": body.get("metadata")}
+                    return self._send(200, stub.batches[bid])
+                self._send(404, {"error": {"message": "not found"}})
+
+            def do_GET(self):
+                parts = self.path.rstrip("/").split("/")
+                if len(parts) >= 2 and parts[-2] == "batches":
+                    b = stub.batch(parts[-1])
+                    return self._send(200, b) if b else self._send(404, {"error": {"message": "no batch"}})
+                if parts[-1] == "content" and parts[-3] == "files" and parts[-2] in stub.files:
+                    return self._send(200, stub.files[parts[-2]], raw=True)
+                self._send(404, {"error": {"message": "not found"}})
+
+            def log_message(self, *a):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        h, p = self._server.server_address[:2]
+        return f"http://{h}:{p}/v1"
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def _main() -> None:
+    ap = argparse.ArgumentParser(description="Local OpenAI Batch API stand-in.")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--delay", type=float, default=2.0, help="seconds until a batch completes")
+    args = ap.parse_args()
+    url = BatchStub(delay=args.delay).start(port=args.port)
+    print(json.dumps({"ok": True, "base_url": url}))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    _main()
@@ -3,16 +3,14 @@ from __future__ import annotations
 import os
 from typing import Dict
 
-try:
-    import requests
-except Exception:
-    requests = None
+from app.services import http_transport, llm_cache, rate_limiter
+from app.services.llm import streaming
 
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-pro")
-${1}__REDACTED__
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY", "")
 
 def available() -> bool:
-    return bool(GOOGLE_API_KEY) and requests is not None
+    return bool(GOOGLE_API_KEY) and http_transport.available()
 
 def review_ts(ts_code: str, file_path: str) -> Dict[str, str]:
     """
@@ -34,10 +32,25 @@ def review_ts(ts_code: str, file_path: str) -> Dict[str, str]:
             }]
         }]
     }
-    try:
-        r = requests.post(url, json=payload, timeout=90)
+
+    def _live() -> str:
+        if streaming.enabled():
+            # an APPROVE reply simply ends; a REJECT + corrected file stops at its closing fence
+            res = streaming.stream_completion(
+                "gemini", url.replace(":generateContent?", ":streamGenerateContent?alt=sse&"), json_body=payload,
+                timeout=90, tokens=rate_limiter.estimate_tokens(ts_code) * 2, delta=streaming.gemini_delta,
+                guard=streaming.StreamGuard(payload["contents"][0]["parts"][0]["text"]))
+            if not res.ok:
+                raise RuntimeError(f"gemini stream {res.stop}")
+            return res.text
+        r = rate_limiter.post("gemini", url, tokens=rate_limiter.estimate_tokens(ts_code) * 2,
+                              json=payload, timeout=90)
         r.raise_for_status()
-        txt = r.json()["candidates"][0]["content"]["parts"][0]["text"]
+        return r.json()["candidates"][0]["content"]["parts"][0]["text"]
+
+    try:
+        prompt = payload["contents"][0]["parts"][0]["text"]
+        txt = llm_cache.cached_text("gemini", GEMINI_MODEL, "", prompt, None, _live)
         if "APPROVE" in txt.upper() and "REJECT" not in txt.upper():
             return {"ok": True, "ts_code": ts_code, "reason": ""}
         # if Gemini produced a corrected file, try to extract code fence
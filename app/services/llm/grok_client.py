@@ -3,16 +3,14 @@ from __future__ import annotations
 import os
 import json
 
-try:
-    import requests
-except Exception:
-    requests = None
+from app.services import http_transport, llm_cache, rate_limiter
+from app.services.llm import streaming
 
 XAI_API_KEY = os.getenv("XAI_API_KEY","")
 XAI_MODEL = os.getenv("XAI_MODEL","grok-beta")
 
 def available() -> bool:
-    return bool(XAI_API_KEY) and requests is not None
+    return bool(XAI_API_KEY) and http_transport.available()
 
 def arbitrate(ts_code: str, reason: str, file_path: str) -> str:
     """
@@ -30,11 +28,23 @@ def arbitrate(ts_code: str, reason: str, file_path: str) -> str:
         f"File: {file_path}\n\n```\n{ts_code}\n```"
     )
     payload = {"model": XAI_MODEL, "messages": [{"role": "user", "content": prompt}], "temperature": 0.1}
-    try:
-        r = requests.post(url, headers=headers, data=json.dumps(payload), timeout=90)
+
+    def _live() -> str:
+        if streaming.enabled():
+            res = streaming.stream_completion(
+                "grok", url, headers=headers, data=json.dumps({**payload, "stream": True}), timeout=90,
+                tokens=rate_limiter.estimate_tokens(prompt) * 2, guard=streaming.StreamGuard(prompt))
+            if not res.ok:
+                raise RuntimeError(f"grok stream {res.stop}")
+            return res.text
+        r = rate_limiter.post("grok", url, tokens=rate_limiter.estimate_tokens(prompt) * 2,
+                              headers=headers, data=json.dumps(payload), timeout=90)
         r.raise_for_status()
         data = r.json()
         return data["choices"][0]["message"]["content"]
+
+    try:
+        return llm_cache.cached_text("grok", XAI_MODEL, "", prompt, 0.1, _live)
     except Exception:
         return ts_code
 
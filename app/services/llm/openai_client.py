@@ -3,16 +3,13 @@ from __future__ import annotations
 import os
 import json
 import re
-import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-try:
-    import requests
-except Exception:
-    requests = None
+from app.services import http_transport, llm_cache, rate_limiter
+from app.services.llm import streaming
 
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
-${1}__REDACTED__
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
 SYSTEM_CONVERT = """You are a senior TypeScript engineer. Convert JS/JSX to idiomatic TS/TSX.
 - Keep runtime behavior identical
@@ -28,26 +25,39 @@ SYSTEM_TESTS = """You are a senior test engineer. Write Jest tests for the suppl
 """
 
 def available() -> bool:
-    return bool(OPENAI_API_KEY) and requests is not None
+    return bool(OPENAI_API_KEY) and http_transport.available()
 
-def _chat(messages: List[Dict[str,str]], temperature: float = 0.2, max_tokens: int = 4000, retries: int = 3) -> str:
+def _chat(messages: List[Dict[str,str]], temperature: float = 0.2, max_tokens: int = 4000, retries: int = 3,
+          expect_fence: bool = False) -> str:
     if not available():
         return messages[-1].get("content","")
     url = "https://api.openai.com/v1/chat/completions"
     headers = {"Authorization": f"Bearer {OPENAI_API_KEY}", "Content-Type": "application/json"}
     payload = {"model": OPENAI_MODEL, "messages": messages, "temperature": temperature, "max_tokens": max_tokens}
-    for i in range(retries):
-        r = requests.post(url, headers=headers, data=json.dumps(payload), timeout=90)
-        if r.status_code == 429 or 500 <= r.status_code < 600:
-            time.sleep(2 ** i); continue
+    tokens = rate_limiter.estimate_tokens(*(m.get("content", "") for m in messages)) + max_tokens
+
+    def _live() -> Optional[str]:
+        if streaming.enabled():
+            # stop reading at the closing fence; drop echoes / fence-less rambles early
+            res = streaming.stream_completion(
+                "openai", url, headers=headers, data=json.dumps({**payload, "stream": True}), tokens=tokens,
+                timeout=90, retries=retries - 1,
+                guard=streaming.StreamGuard(messages[-1].get("content", ""), expect_fence=expect_fence))
+            return res.text if res.ok else None
         try:
+            # 429/5xx backoff (Retry-After aware) and RPM/TPM pacing live in the limiter
+            r = rate_limiter.post("openai", url, tokens=tokens, retries=retries - 1,
+                                  headers=headers, data=json.dumps(payload), timeout=90)
             r.raise_for_status()
             data = r.json()
             return data["choices"][0]["message"]["content"]
         except Exception:
-            if i < retries - 1: time.sleep(2 ** i); continue
-            return messages[-1].get("content","")
-    return messages[-1].get("content","")
+            return None
+
+    system = "\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    convo = json.dumps([m for m in messages if m.get("role") != "system"], ensure_ascii=False)
+    out = llm_cache.cached_text("openai", OPENAI_MODEL, system, convo, temperature, _live, max_tokens=max_tokens)
+    return out if out is not None else messages[-1].get("content","")
 
 def convert_js_to_ts(js_code: str, file_path: str) -> str:
     prompt = f"""Convert to TypeScript/TSX as appropriate.
@@ -57,7 +67,7 @@ JS/JSX:
 ```javascript
 {js_code}
 ```"""
-    out = _chat([{"role":"system","content": SYSTEM_CONVERT},{"role":"user","content": prompt}])
+    out = _chat([{"role":"system","content": SYSTEM_CONVERT},{"role":"user","content": prompt}], expect_fence=True)
     return out or f"// converted (fallback)\n/* file: {file_path} */\n{js_code}"
 
 def generate_tests(ts_code: str, file_path: str) -> str:
@@ -68,6 +78,7 @@ TS:
 ```typescript
 {ts_code}
 ```"""
-    out = _chat([{"role":"system","content": SYSTEM_TESTS},{"role":"user","content": prompt}], temperature=0.1, max_tokens=2000)
+    out = _chat([{"role":"system","content": SYSTEM_TESTS},{"role":"user","content": prompt}],
+                temperature=0.1, max_tokens=2000, expect_fence=True)
     m = re.search(r"```(?:typescript|ts|javascript|js|tsx)?\s*\n(.*?)\n```", out, re.DOTALL | re.IGNORECASE)
     return m.group(1).strip() if m else out
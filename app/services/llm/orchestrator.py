@@ -1,6 +1,8 @@
 # Path: app/services/llm/orchestrator.py
 from __future__ import annotations
-from typing import Dict
+from typing import Any, Dict, List
+
+from core.dag import Step, critical_path, run_dag
 
 from .sparka_client import SparkaClient
 from .openai_client import convert_js_to_ts as oai_convert, generate_tests as oai_tests
@@ -26,20 +28,17 @@ def _maybe_sparka(op: str, *args, **kwargs):
         return None
     return None
 
-def orchestrate_conversion_pipeline(
-    repo_name: str,
-    platform: str,
-    token: str,
-    src_path: str,
-    js_code: str,
-    test_hint: str = "",
-    doc_hint: str = "",
-) -> Dict[str, str]:
-    # 1) Convert (Sparka → OpenAI)
-    ts_code = _maybe_sparka("convert", js_code, src_path) or oai_convert(js_code, src_path)
-    # 2) Tests (Sparka → OpenAI)
-    test_code = _maybe_sparka("tests", ts_code, src_path) or oai_tests(ts_code, src_path)
-    # 3) Review (Sparka → Gemini) then arbitration (Sparka → Grok)
+def _convert(js_code: str, src_path: str) -> str:
+    # Sparka → OpenAI. With streaming on, this returns the moment the model
+    # closes the code fence, not when the completion ends.
+    return _maybe_sparka("convert", js_code, src_path) or oai_convert(js_code, src_path)
+
+def _tests(ts_code: str, src_path: str) -> str:
+    # Sparka → OpenAI
+    return _maybe_sparka("tests", ts_code, src_path) or oai_tests(ts_code, src_path)
+
+def _review(ts_code: str, src_path: str) -> str:
+    # Review (Sparka → Gemini) then arbitration (Sparka → Grok)
     reviewed = _maybe_sparka("review", ts_code, src_path)
     if reviewed:
         if reviewed.strip().lower().startswith("ok"):
@@ -53,11 +52,52 @@ def orchestrate_conversion_pipeline(
                       or grok_arbitrate(verdict.get("ts_code", ts_code), verdict.get("reason","rejected"), src_path)
         else:
             ts_code = verdict.get("ts_code", ts_code)
+    return ts_code
 
-    # 4) Final small fix pass (Sparka → Grok)
+def _polish(ts_code: str, src_path: str) -> str:
+    # Final small fix pass (Sparka → Grok)
     fixed = _maybe_sparka("arbitrate", ts_code, "final polish", src_path)
-    ts_code = fixed or grok_fix(ts_code, src_path)
-    return {"ts_code": ts_code, "test_code": test_code}
+    return fixed or grok_fix(ts_code, src_path)
+
+def conversion_steps(js_code: str, src_path: str) -> List[Step]:
+    """
+    convert ─┬─ review ─┬─ polish            → ts_code
+             │          └─ tests (confirm)   → test_code
+             └─ tests_spec ─┘
+
+    Test generation starts speculatively on the converted code while review
+    runs; if review/arbitration changed the code the speculative tests are
+    discarded and regenerated for the reviewed code.
+    """
+    def confirm(r: Dict[str, Any]) -> str:
+        return r["tests_spec"] if r["review"] == r["convert"] else _tests(r["review"], src_path)
+
+    return [
+        Step("convert", lambda r: _convert(js_code, src_path)),
+        Step("tests_spec", lambda r: _tests(r["convert"], src_path), ("convert",)),
+        Step("review", lambda r: _review(r["convert"], src_path), ("convert",)),
+        Step("polish", lambda r: _polish(r["review"], src_path), ("review",)),
+        Step("tests", confirm, ("convert", "review", "tests_spec")),
+    ]
+
+def orchestrate_conversion_pipeline(
+    repo_name: str,
+    platform: str,
+    token: str,
+    src_path: str,
+    js_code: str,
+    test_hint: str = "",
+    doc_hint: str = "",
+) -> Dict[str, Any]:
+    steps = conversion_steps(js_code, src_path)
+    run = run_dag(steps)
+    return {
+        "ts_code": run.results["polish"],
+        "test_code": run.results["tests"],
+        # per-step wall time (ms), plus the chain that bounded this file
+        "timings": {**run.timings_ms(), "total": run.total_ms},
+        "critical_path": critical_path(steps, run),
+    }
 
 def evaluate_ts(ts_code: str, file_path: str) -> Dict:
     """Quality evaluation for existing TS/TSX files against CFH standards."""
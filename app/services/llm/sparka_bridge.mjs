@@ -2,6 +2,8 @@
 // (same as what you just pasted — keep it)
 // included here only for clarity; no changes needed now
 import { generateText } from "ai";
+import path from "node:path";
+import { pathToFileURL } from "node:url";
 const readStdin = async () => { const chunks = []; for await (const c of process.stdin) chunks.push(c); return Buffer.concat(chunks).toString("utf8"); };
 const readInput = async () => { const f = process.argv.find(a => a.startsWith("--file=")); if (f) { const p = f.slice("--file=".length); return await (await import("node:fs/promises")).readFile(p, "utf8"); } return await readStdin(); };
 const prompts = {
@@ -41,13 +43,20 @@ const askAI = async (modelName, prompt, apiKey) => {
     if (!res.ok) return ""; const data = await res.json(); return data?.choices?.[0]?.message?.content || "";
   }
 };
-(async () => {
+// One bridge call: { op, file_path, code, extra, env } -> text ("" on any failure).
+// Used by the CLI entry below and by the persistent worker (app/services/node_worker.mjs).
+export const runBridge = async (inp) => {
   try {
-    const raw = await readInput(); const inp = JSON.parse(raw || "{}");
-    const { op, file_path, code, extra, env } = inp;
+    const { op, file_path, code, extra, env } = inp || {};
     const apiKey = (env?.OPENAI_API_KEY || env?.SPARKA_API_KEY || process.env.OPENAI_API_KEY || "").trim();
-    if (!op || !apiKey) return void process.stdout.write("");
+    if (!op || !apiKey || !prompts[op]) return "";
     const prompt = op === "arbitrate" ? prompts.arbitrate(code || "", file_path || "unknown", extra?.reason || "N/A") : prompts[op](code || "", file_path || "unknown");
-    const out = await askAI("openai:gpt-4o-mini", prompt, apiKey); process.stdout.write(out || "");
+    return (await askAI("openai:gpt-4o-mini", prompt, apiKey)) || "";
+  } catch { return ""; }
+};
+const isMain = process.argv[1] && import.meta.url === pathToFileURL(path.resolve(process.argv[1])).href;
+if (isMain) {
+  try {
+    const raw = await readInput(); process.stdout.write(await runBridge(JSON.parse(raw || "{}")));
   } catch { process.stdout.write(""); }
-})();
+}
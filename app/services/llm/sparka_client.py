@@ -3,7 +3,8 @@
 Sparka AI integration (bridge-first design).
 
 How it works:
-- Tries to call a small Node bridge (app/services/llm/sparka_bridge.mjs) that
+- Calls a small Node bridge (app/services/llm/sparka_bridge.mjs), kept warm in
+  the persistent worker pool (app/services/node_pool.py), that
   uses Vercel AI SDK (or falls back to OpenAI HTTP) to run prompts.
 - Reads keys from env; optionally loads ".env.local" if present (simple parser).
 - If Node or keys are missing, returns None → orchestrator falls back to other providers.
@@ -16,12 +17,12 @@ Install (in repo root):
 Require Node >= 18.
 """
 from __future__ import annotations
-import json
 import os
-import subprocess
 from pathlib import Path
 from typing import Optional
 
+from app.services.node_pool import NodeWorkerError, get_pool
+
 ENV_HINTS = ("OPENAI_API_KEY", "SPARKA_API_KEY", "GROK_API_KEY", "GOOGLE_API_KEY")
 
 def _load_env_local():
@@ -38,19 +39,17 @@ def _load_env_local():
         if k and v and k not in os.environ:
             os.environ[k] = v
 
-def _node_available() -> bool:
-    try:
-        subprocess.run(["node", "-v"], capture_output=True, check=True)
-        return True
-    except Exception:
-        return False
-
 def _run_bridge(op: str, file_path: str, code: str, extra: Optional[dict] = None, timeout: int = 120) -> Optional[str]:
     """
-    Calls the node bridge with JSON on stdin and returns stdout string (or None).
+    Runs one bridge op on the shared persistent Node worker pool
+    (app/services/node_worker.mjs imports sparka_bridge.mjs once and keeps it
+    warm) and returns the text output (or None).
     """
     bridge = Path("app/services/llm/sparka_bridge.mjs")
-    if not bridge.exists() or not _node_available():
+    if not bridge.exists():
+        return None
+    pool = get_pool()
+    if pool is None:
         return None
     _load_env_local()
     payload = {
@@ -62,16 +61,9 @@ def _run_bridge(op: str, file_path: str, code: str, extra: Optional[dict] = None
         "env": {k: os.getenv(k, "") for k in ENV_HINTS},
     }
     try:
-        proc = subprocess.run(
-            ["node", str(bridge)],
-            input=json.dumps(payload).encode("utf-8"),
-            capture_output=True,
-            timeout=timeout,
-            check=True,
-        )
-        out = proc.stdout.decode("utf-8", "replace").strip()
+        out = str(pool.call("sparka", payload, timeout=timeout) or "").strip()
         return out or None
-    except Exception:
+    except NodeWorkerError:
         return None
 
 class SparkaClient:
@@ -0,0 +1,168 @@
+# Path: app/services/llm/streaming.py
+"""
+Streaming completions with early stop / early abort.
+
+Chat completions are read as server-sent events and fed to a StreamGuard:
+- stop as soon as the closing ``` of the first code block arrives (the file
+  is complete; anything after it is commentary we would discard anyway);
+- abort when the model starts echoing the prompt back;
+- abort when a code block was expected but no opening fence appeared
+  within AIO_STREAM_FENCE_TOKENS chunks.
+
+Stopping closes the HTTP response, which drops the connection so the
+provider stops generating (and billing) tokens.
+
+Env:
+  AIO_LLM_STREAM           : "0" turns streaming off (default on)
+  AIO_STREAM_FENCE_TOKENS  : chunks allowed before an opening fence (default 400)
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from app.services import http_transport, rate_limiter
+
+_OPEN_FENCE = re.compile(r"```[\w.+-]*[ \t]*\n")
+_CLOSE_FENCE = re.compile(r"\n[ \t]*```[ \t]*(?:\n|$)")
+_FENCED = re.compile(r"```[\w.+-]*[ \t]*\n(.*?)\n[ \t]*```", re.DOTALL)
+
+
+def enabled() -> bool:
+    return os.getenv("AIO_LLM_STREAM", "1").strip().lower() not in {"0", "off", "false", "no"}
+
+
+def _squash(text: str) -> str:
+    return " ".join(text.split())
+
+
+@dataclass
+class StreamResult:
+    text: str
+    stop: str      # "fence" | "done" | "abort:echo" | "abort:no_fence" | "error:<Exc>"
+    chunks: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.stop in ("fence", "done")
+
+    @property
+    def code(self) -> Optional[str]:
+        m = _FENCED.search(self.text)
+        return m.group(1) if m else None
+
+
+class StreamGuard:
+    """Decides, chunk by chunk, whether to keep reading."""
+
+    def __init__(self, prompt: str = "", expect_fence: bool = False,
+                 fence_chunks: Optional[int] = None, echo_chars: int = 48) -> None:
+        self.expect_fence = expect_fence
+        self.fence_chunks = (fence_chunks if fence_chunks is not None
+                             else int(os.getenv("AIO_STREAM_FENCE_TOKENS", "400") or 400))
+        # only the instruction head of the prompt counts as an echo: converted
+        # code legitimately repeats most of the source it was given
+        self.prompt_head = _squash(prompt)[:echo_chars]
+        self.text = ""
+        self.chunks = 0
+        self._open_at: Optional[int] = None
+
+    def feed(self, delta: str) -> Optional[str]:
+        """Append `delta`; return a stop reason or None to continue."""
+        tail = max(0, len(self.text) - 8)  # a fence may straddle two chunks
+        self.text += delta
+        self.chunks += 1
+        if self._open_at is None:
+            m = _OPEN_FENCE.search(self.text)
+            if m:
+                self._open_at = tail = m.end() - 1  # keep the newline so the close pattern can anchor on it
+            elif self.expect_fence and self.chunks >= self.fence_chunks:
+                return "abort:no_fence"
+        if self._open_at is not None and _CLOSE_FENCE.search(self.text, max(tail, self._open_at)):
+            return "fence"
+        if self.prompt_head:
+            head = _squash(self.text[: 4 * len(self.prompt_head)])
+            if len(head) >= len(self.prompt_head):
+                echoed = head.startswith(self.prompt_head)
+                self.prompt_head = ""  # decided once; no rescans of a growing buffer
+                if echoed:
+                    return "abort:echo"
+        return None
+
+
+def iter_sse(lines: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    """JSON payloads of `data:` events until [DONE]; other lines are skipped."""
+    for raw in lines:
+        line = raw.decode("utf-8", "ignore") if isinstance(raw, bytes) else raw
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            yield json.loads(data)
+        except ValueError:
+            continue
+
+
+def _lines(resp: Any) -> Iterable[Any]:
+    if hasattr(resp, "iter_content"):
+        # requests buffers 512 bytes per read by default; take data as it arrives
+        return resp.iter_lines(chunk_size=None, decode_unicode=True)
+    return resp.iter_lines()
+
+
+def openai_delta(event: Dict[str, Any]) -> str:
+    """OpenAI-compatible chat.completion.chunk (OpenAI, xAI)."""
+    try:
+        return event["choices"][0].get("delta", {}).get("content") or ""
+    except (KeyError, IndexError, AttributeError):
+        return ""
+
+
+def gemini_delta(event: Dict[str, Any]) -> str:
+    """Gemini streamGenerateContent?alt=sse chunk."""
+    try:
+        return "".join(p.get("text", "") for p in event["candidates"][0]["content"]["parts"])
+    except (KeyError, IndexError, AttributeError):
+        return ""
+
+
+def stream_completion(provider: str, url: str, *, guard: StreamGuard,
+                      delta: Callable[[Dict[str, Any]], str] = openai_delta,
+                      json_body: Any = None, data: Any = None,
+                      headers: Optional[Dict[str, str]] = None,
+                      tokens: int = 1, timeout: Optional[float] = None,
+                      retries: Optional[int] = None) -> StreamResult:
+    """
+    Open the stream under the provider's rate limiter (429/5xx on open are
+    retried `retries` times, limiter default when None), feed every delta to
+    `guard`, and stop at the first stop reason. Never raises.
+    """
+    try:
+        resp = rate_limiter.call(provider, lambda: http_transport.open_stream(
+            provider, url, json=json_body, data=data, headers=headers, timeout=timeout),
+            tokens=tokens, retries=retries)
+    except Exception as e:
+        return StreamResult("", f"error:{e.__class__.__name__}")
+    try:
+        if resp.status_code >= 400:
+            return StreamResult("", f"error:http_{resp.status_code}")
+        for event in iter_sse(_lines(resp)):
+            piece = delta(event)
+            if not piece:
+                continue
+            stop = guard.feed(piece)
+            if stop:
+                return StreamResult(guard.text, stop, guard.chunks)
+        return StreamResult(guard.text, "done", guard.chunks)
+    except Exception as e:
+        return StreamResult(guard.text, f"error:{e.__class__.__name__}", guard.chunks)
+    finally:
+        try:
+            resp.close()
+        except Exception:
+            pass
@@ -0,0 +1,203 @@
+# Path: app/services/llm_cache.py
+"""
+Content-addressed, disk-backed cache of LLM responses (SQLite).
+
+Rows are keyed by sha256 over (provider, model, system prompt, user prompt,
+temperature, extra params), so an unchanged file re-sent with the same
+prompt is answered from disk. Only successful provider text is stored;
+fallbacks and errors are never cached.
+
+Eviction runs on open and every EVICT_EVERY writes:
+- age: rows not used within AIO_LLM_CACHE_MAX_AGE_DAYS are dropped;
+- size: least-recently-used rows are dropped until the stored text fits
+  AIO_LLM_CACHE_MAX_MB.
+
+Env:
+  AIO_LLM_CACHE              : path to the SQLite file (default reports/llm_cache.sqlite);
+                               "0" / "off" / "false" disables the cache.
+  AIO_LLM_CACHE_MAX_MB       : size budget for stored responses (default 256)
+  AIO_LLM_CACHE_MAX_AGE_DAYS : drop rows unused for this long (default 30)
+  AIO_LLM_CACHE_BYPASS       : "1" skips lookups (always calls the provider) but
+                               still stores fresh answers, i.e. a forced refresh
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_DB = Path("reports") / "llm_cache.sqlite"
+EVICT_EVERY = 64
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def cache_path_from_env() -> Optional[Path]:
+    raw = os.getenv("AIO_LLM_CACHE", "").strip()
+    if raw.lower() in {"0", "off", "false", "no"}:
+        return None
+    return Path(raw) if raw else DEFAULT_DB
+
+
+def bypass() -> bool:
+    return os.getenv("AIO_LLM_CACHE_BYPASS", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def cache_key(provider: str, model: str, system: str, prompt: str,
+              temperature: Optional[float] = None, **extra: Any) -> str:
+    """Stable sha256 over everything that determines the answer."""
+    blob = json.dumps(
+        [provider.lower(), model or "", system or "", prompt or "",
+         None if temperature is None else round(float(temperature), 4), sorted(extra.items())],
+        ensure_ascii=False, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Thread-safe wrapper around the on-disk cache."""
+
+    def __init__(self, db_path: Path, max_bytes: Optional[int] = None, max_age_s: Optional[float] = None) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes if max_bytes is not None
+                             else _env_float("AIO_LLM_CACHE_MAX_MB", 256) * 1024 * 1024)
+        self.max_age_s = float(max_age_s if max_age_s is not None
+                               else _env_float("AIO_LLM_CACHE_MAX_AGE_DAYS", 30) * 86400)
+        self.counters: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0, "evicted": 0, "bypassed": 0}
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key        TEXT PRIMARY KEY,
+                    provider   TEXT NOT NULL,
+                    model      TEXT NOT NULL,
+                    value      TEXT NOT NULL,
+                    bytes      INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    used_at    REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses(used_at)")
+        self.evict()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---- reads --------------------------------------------------------------
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return None
+            self.counters["hits"] += 1
+            with self._conn:
+                self._conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM responses").fetchone()
+            return {**self.counters, "rows": int(rows), "bytes": int(size)}
+
+    # ---- writes -------------------------------------------------------------
+    def put(self, key: str, provider: str, model: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses(key, provider, model, value, bytes, created_at, used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, provider.lower(), model or "", value, len(value.encode("utf-8")), now, now),
+                )
+            self.counters["stores"] += 1
+            self._writes += 1
+            due = self._writes % EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """Apply the age and size limits; returns the number of rows dropped."""
+        with self._lock, self._conn:
+            dropped = self._conn.execute(
+                "DELETE FROM responses WHERE used_at < ?", (time.time() - self.max_age_s,)
+            ).rowcount
+            total = int(self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM responses").fetchone()[0])
+            if total > self.max_bytes:
+                victims = []
+                for key, size in self._conn.execute("SELECT key, bytes FROM responses ORDER BY used_at ASC"):
+                    if total <= self.max_bytes:
+                        break
+                    victims.append((key,))
+                    total -= int(size)
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+                dropped += len(victims)
+            self.counters["evicted"] += max(0, dropped)
+            return dropped
+
+
+_OPEN: Dict[str, LLMCache] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def open_cache(db_path: Optional[Path] = None) -> Optional[LLMCache]:
+    """
+    Return a process-wide LLMCache for `db_path` (or the env default).
+    Returns None when the cache is disabled or cannot be opened.
+    """
+    path = db_path or cache_path_from_env()
+    if path is None:
+        return None
+    key = str(Path(path).resolve())
+    with _OPEN_LOCK:
+        cache = _OPEN.get(key)
+        if cache is None:
+            try:
+                cache = LLMCache(Path(path))
+            except sqlite3.Error:
+                return None
+            _OPEN[key] = cache
+        return cache
+
+
+def cached_text(provider: str, model: str, system: str, prompt: str, temperature: Optional[float],
+                produce: Callable[[], Optional[str]], **extra: Any) -> Optional[str]:
+    """
+    Return the cached answer for this request, or call `produce()` and store
+    its result. `produce` returns None on failure; failures are not cached.
+    """
+    cache = open_cache()
+    if cache is None:
+        return produce()
+    key = cache_key(provider, model, system, prompt, temperature, **extra)
+    if bypass():
+        cache.counters["bypassed"] += 1
+    else:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+    value = produce()
+    if value is not None:
+        try:
+            cache.put(key, provider, model, value)
+        except sqlite3.Error:
+            pass  # a cache write failure must never fail the call
+    return value
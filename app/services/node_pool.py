@@ -0,0 +1,210 @@
+# Path: app/services/node_pool.py
+"""
+Pool of long-lived Node workers (app/services/node_worker.mjs) speaking
+JSON-lines RPC over stdin/stdout.
+
+One `node` process per worker serves many requests (acorn parses, Sparka
+bridge ops, babel analyzers), so callers pay per-request work instead of a
+process spawn plus npx resolution each time. Requests are pipelined: each
+worker has a reader thread that resolves futures by request id. A worker that
+dies fails its in-flight requests and is respawned on the next call.
+
+Env:
+  AIO_NODE_BIN     : node executable (default "node" on PATH)
+  AIO_NODE_WORKERS : worker processes in the shared pool (default 2)
+"""
+from __future__ import annotations
+
+import atexit
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+WORKER_SCRIPT = Path(__file__).with_name("node_worker.mjs")
+
+
+class NodeWorkerError(RuntimeError):
+    """Raised when a worker op fails or times out."""
+
+
+class NodeUnavailable(NodeWorkerError):
+    """The worker could not be started, or died before answering."""
+
+
+def node_bin() -> Optional[str]:
+    raw = os.getenv("AIO_NODE_BIN", "").strip()
+    return raw or shutil.which("node")
+
+
+class NodeWorker:
+    """A single node process plus the reader thread that demultiplexes replies."""
+
+    def __init__(self, script: Path = WORKER_SCRIPT, cwd: Optional[Path] = None) -> None:
+        self.script = Path(script)
+        self.cwd = cwd
+        self._proc: Optional[subprocess.Popen] = None
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.restarts = -1  # first spawn is not a restart
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    @property
+    def load(self) -> int:
+        return len(self._pending)
+
+    def _spawn(self) -> subprocess.Popen:
+        exe = node_bin()
+        if not exe or not self.script.exists():
+            raise NodeUnavailable("node or worker script not available")
+        try:
+            proc = subprocess.Popen(
+                [exe, str(self.script)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=str(self.cwd) if self.cwd else None,
+            )
+        except OSError as e:
+            raise NodeUnavailable(f"cannot start {exe}: {e}") from e
+        self.restarts += 1
+        # Why: each process owns its own pending map, so a late EOF from a dead
+        # process can never fail requests already sent to its replacement.
+        self._pending = {}
+        threading.Thread(target=self._read_loop, args=(proc, self._pending), daemon=True).start()
+        return proc
+
+    def _read_loop(self, proc: subprocess.Popen, pending: Dict[int, Future]) -> None:
+        assert proc.stdout is not None
+        for raw in proc.stdout:
+            try:
+                msg = json.loads(raw)
+            except ValueError:
+                continue
+            with self._lock:
+                fut = pending.pop(msg.get("id"), None)
+            if fut is None or fut.done():
+                continue
+            if msg.get("ok"):
+                fut.set_result(msg.get("result"))
+            else:
+                fut.set_exception(NodeWorkerError(str(msg.get("error") or "worker error")))
+        # EOF: the process exited; fail whatever it still owed us.
+        with self._lock:
+            if self._proc is proc:
+                self._proc = None
+            orphans = list(pending.values())
+            pending.clear()
+        for fut in orphans:
+            if not fut.done():
+                fut.set_exception(NodeUnavailable("node worker exited"))
+
+    def submit(self, op: str, params: Optional[Dict[str, Any]] = None) -> Future:
+        fut: Future = Future()
+        with self._lock:
+            if not self.alive:
+                self._proc = self._spawn()
+            rid = next(self._ids)
+            self._pending[rid] = fut
+            line = json.dumps({"id": rid, "op": op, "params": params or {}}) + "\n"
+            try:
+                assert self._proc.stdin is not None
+                self._proc.stdin.write(line.encode("utf-8"))
+                self._proc.stdin.flush()
+            except (OSError, ValueError) as e:
+                self._pending.pop(rid, None)
+                fut.set_exception(NodeUnavailable(f"write failed: {e}"))
+        return fut
+
+    def close(self) -> None:
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+
+
+class NodePool:
+    """Least-loaded dispatch over a fixed number of NodeWorkers (spawned lazily)."""
+
+    def __init__(self, size: int = 2, script: Path = WORKER_SCRIPT, cwd: Optional[Path] = None) -> None:
+        self.workers = [NodeWorker(script, cwd) for _ in range(max(1, int(size)))]
+        self._rr = itertools.count()
+
+    def _pick(self) -> NodeWorker:
+        start = next(self._rr) % len(self.workers)
+        order = self.workers[start:] + self.workers[:start]
+        return min(order, key=lambda w: w.load)
+
+    def submit(self, op: str, params: Optional[Dict[str, Any]] = None) -> Future:
+        return self._pick().submit(op, params)
+
+    def call(self, op: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = 120) -> Any:
+        """Run one op and return its result; raises NodeWorkerError on failure or timeout."""
+        try:
+            return self.submit(op, params).result(timeout=timeout)
+        except FutureTimeout:
+            raise NodeWorkerError(f"{op} timed out after {timeout}s") from None
+
+    def map(self, op: str, items: Sequence[Dict[str, Any]], batch: int = 64,
+            timeout: Optional[float] = 300) -> List[Dict[str, Any]]:
+        """
+        Run a batch op (e.g. "acorn.parseBatch") over `items`, split into
+        chunks spread across workers. Returns one {"ok", "result"|"error"} per
+        item, in input order.
+        """
+        chunks = [list(items[i:i + batch]) for i in range(0, len(items), max(1, batch))]
+        futs = [self.submit(op, {"items": c}) for c in chunks]
+        out: List[Dict[str, Any]] = []
+        for chunk, fut in zip(chunks, futs):
+            try:
+                out.extend(fut.result(timeout=timeout))
+            except (NodeWorkerError, FutureTimeout) as e:
+                out.extend({"ok": False, "error": str(e) or "timeout"} for _ in chunk)
+        return out
+
+    def close(self) -> None:
+        for w in self.workers:
+            w.close()
+
+
+_POOL: Optional[NodePool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool() -> Optional[NodePool]:
+    """Process-wide pool, or None when node is not installed."""
+    global _POOL
+    if node_bin() is None or not WORKER_SCRIPT.exists():
+        return None
+    with _POOL_LOCK:
+        if _POOL is None:
+            try:
+                size = int(os.getenv("AIO_NODE_WORKERS", "2"))
+            except ValueError:
+                size = 2
+            _POOL = NodePool(size)
+            atexit.register(shutdown_pool)
+        return _POOL
+
+
+def shutdown_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close()
+            _POOL = None
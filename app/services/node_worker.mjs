@@ -0,0 +1,78 @@
+// Path: app/services/node_worker.mjs
+// Long-lived Node worker speaking JSON-lines RPC over stdin/stdout.
+//   request : {"id": 1, "op": "acorn.parse", "params": {...}}
+//   response: {"id": 1, "ok": true, "result": ...} | {"id": 1, "ok": false, "error": "..."}
+// Requests are handled concurrently; responses carry the request id.
+// Heavy modules (acorn, the bridge, babel analyzers) load lazily on first use
+// and stay warm for the life of the process. Driven by app/services/node_pool.py.
+import fs from "node:fs/promises";
+import path from "node:path";
+import readline from "node:readline";
+import { createRequire } from "node:module";
+import { fileURLToPath, pathToFileURL } from "node:url";
+
+const HERE = path.dirname(fileURLToPath(import.meta.url));
+const APP = path.resolve(HERE, "..");
+
+const once = (load) => { let p; return () => (p ??= load()); };
+
+// acorn from the cwd project first, then next to this file (npx-free).
+const loadAcorn = once(async () => {
+  for (const base of [path.join(process.cwd(), "package.json"), import.meta.url]) {
+    try { return createRequire(base)("acorn"); } catch { /* try next */ }
+  }
+  throw new Error("acorn not installed (npm i -D acorn)");
+});
+const loadBridge = once(() => import(pathToFileURL(path.join(HERE, "llm", "sparka_bridge.mjs")).href));
+const loadAnalyzer = once(() => import(pathToFileURL(path.join(APP, "analyze-frontend.mjs")).href));
+const loadSynth = once(() => import(pathToFileURL(path.join(APP, "synthesize-ts.mjs")).href));
+
+const ACORN_DEFAULTS = { ecmaVersion: 2020, locations: true, sourceType: "module" };
+
+const readCode = async (p) => (p.code != null ? p.code : await fs.readFile(p.path, "utf8"));
+
+const acornParse = async (p) => {
+  const acorn = await loadAcorn();
+  return acorn.parse(await readCode(p), { ...ACORN_DEFAULTS, ...(p.options || {}) });
+};
+
+// Batch ops never reject as a whole: each item carries its own error.
+const eachItem = (fn) => async (p) =>
+  Promise.all((p.items || []).map(async (it) => {
+    try { return { ok: true, result: await fn(it) }; }
+    catch (e) { return { ok: false, error: String(e?.message || e) }; }
+  }));
+
+const analyze = async (p) => {
+  const { analyzeSource } = await loadAnalyzer();
+  const code = p.code != null ? p.code : await fs.readFile(p.path, "utf8").catch(() => "");
+  return analyzeSource(p.path || "inline", code);
+};
+
+const ops = {
+  ping: async () => ({ pid: process.pid, node: process.version }),
+  "acorn.parse": acornParse,
+  "acorn.parseBatch": eachItem(acornParse),
+  sparka: async (p) => (await loadBridge()).runBridge(p),
+  analyze,
+  "analyze.batch": eachItem(analyze),
+  "synthesize.plan": async (p) => (await loadSynth()).planStubs(p.plan || [], p.frontend || ""),
+};
+
+const send = (msg) => process.stdout.write(JSON.stringify(msg) + "\n");
+
+const handle = async (line) => {
+  let req;
+  try { req = JSON.parse(line); } catch { return send({ id: null, ok: false, error: "bad json" }); }
+  const fn = ops[req.op];
+  if (!fn) return send({ id: req.id, ok: false, error: `unknown op: ${req.op}` });
+  try { send({ id: req.id, ok: true, result: await fn(req.params || {}) }); }
+  catch (e) { send({ id: req.id, ok: false, error: String(e?.message || e) }); }
+};
+
+// Why: stray console.log from imported modules must not corrupt the protocol.
+console.log = (...a) => process.stderr.write(a.join(" ") + "\n");
+
+const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+rl.on("line", (line) => { if (line.trim()) handle(line); });
+rl.on("close", () => process.exit(0));
@@ -0,0 +1,140 @@
+# Path: app/services/queue_tasks.py
+"""
+Queue-able units of work on top of core.queue.
+
+Kinds and payloads:
+  convert : {"src_path": str, "out_path"?: str}   -> {"out_path", "timings", "critical_path"}
+  review  : {"files": [str], "run_id": str, "root": str} -> {"links": [...]}
+  review-batch : same payload as review; OpenAI tiers go out as one Batch API
+                 job (review_multi.run_batch, resumable)    -> {"links": [...]}
+  gates   : {"run_id": str, "changed"?: [str]}     -> {"gates_json": str}
+
+Producers call enqueue_conversions / enqueue_review / enqueue_gates; any
+number of worker processes run `python -m app.services.queue_tasks work`
+against the same AIO_QUEUE_DB. Jobs carry a key, so re-enqueueing a file
+that is still pending does not duplicate it.
+
+gates and review-batch routinely outlive the queue lease (AIO_QUEUE_VISIBILITY_S);
+the worker loop renews leases while a handler runs, so they are not
+re-claimed. If a worker dies mid review-batch, the next claim resumes
+polling the already-submitted Batch API job instead of resubmitting it.
+Because a claimed batch is held until its last job finishes, give
+review-batch its own worker (`work --kinds review-batch`) so it does not
+park other jobs behind hours of polling.
+
+CLI:
+  python -m app.services.queue_tasks enqueue-convert a.js b.js [--priority N]
+  python -m app.services.queue_tasks enqueue-review a.tsx b.tsx --run-id R --root DIR [--batch]
+  python -m app.services.queue_tasks work [--batch N] [--idle-exit]
+  python -m app.services.queue_tasks stats | dead | requeue-dead
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.queue import WorkQueue, work
+
+
+def convert(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from app.services.llm.orchestrator import orchestrate_conversion_pipeline
+
+    src = Path(payload["src_path"])
+    out = orchestrate_conversion_pipeline("", "", "", str(src), src.read_text(encoding="utf-8", errors="ignore"))
+    dest = Path(payload.get("out_path") or src.with_suffix(".ts"))
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_text(out["ts_code"], encoding="utf-8")
+    return {"out_path": str(dest), "timings": out.get("timings"), "critical_path": out.get("critical_path")}
+
+
+def review(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from app import review_multi
+
+    return {"links": review_multi.run(payload["files"], payload["run_id"], payload["root"])}
+
+
+def gates(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from app import ops
+
+    return {"gates_json": str(ops.run_gates(payload["run_id"], payload.get("changed")))}
+
+
+def review_batch(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from app import review_multi
+
+    return {"links": review_multi.run_batch(payload["files"], payload["run_id"], payload["root"])}
+
+
+HANDLERS = {"convert": convert, "review": review, "review-batch": review_batch, "gates": gates}
+
+
+def enqueue_conversions(q: WorkQueue, paths: Iterable[str], priority: int = 0,
+                        out_dir: Optional[str] = None) -> List[int]:
+    jobs = []
+    for p in paths:
+        payload: Dict[str, Any] = {"src_path": str(p)}
+        if out_dir:
+            payload["out_path"] = str(Path(out_dir) / Path(p).with_suffix(".ts").name)
+        jobs.append({"kind": "convert", "payload": payload, "priority": priority,
+                     "key": f"convert:{Path(p).as_posix()}"})
+    return q.enqueue_many(jobs)
+
+
+def enqueue_review(q: WorkQueue, files: List[str], run_id: str, root: str, priority: int = 0,
+                   batch: bool = False) -> int:
+    kind = "review-batch" if batch else "review"
+    return q.enqueue(kind, {"files": list(files), "run_id": run_id, "root": root},
+                     priority=priority, key=f"{kind}:{run_id}")
+
+
+def enqueue_gates(q: WorkQueue, run_id: str, priority: int = 0, changed: Optional[List[str]] = None) -> int:
+    payload: Dict[str, Any] = {"run_id": run_id}
+    if changed is not None:
+        payload["changed"] = list(changed)
+    return q.enqueue("gates", payload, priority=priority, key=f"gates:{run_id}")
+
+
+def _main() -> None:
+    ap = argparse.ArgumentParser(description="Durable work queue for conversions, reviews and gates.")
+    ap.add_argument("--db", default=None, help="queue file (default AIO_QUEUE_DB or reports/queue.sqlite)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ec = sub.add_parser("enqueue-convert")
+    ec.add_argument("paths", nargs="+")
+    ec.add_argument("--priority", type=int, default=0)
+    ec.add_argument("--out-dir", default=None)
+    er = sub.add_parser("enqueue-review")
+    er.add_argument("files", nargs="+")
+    er.add_argument("--run-id", required=True)
+    er.add_argument("--root", default=".")
+    er.add_argument("--priority", type=int, default=0)
+    er.add_argument("--batch", action="store_true", help="Batch API for the OpenAI tiers (cheaper, slower)")
+    w = sub.add_parser("work")
+    w.add_argument("--batch", type=int, default=1)
+    w.add_argument("--idle-exit", action="store_true")
+    w.add_argument("--kinds", default="", help="comma-separated subset of " + ",".join(HANDLERS))
+    sub.add_parser("stats")
+    sub.add_parser("dead")
+    sub.add_parser("requeue-dead")
+    args = ap.parse_args()
+
+    with WorkQueue(Path(args.db) if args.db else None) as q:
+        if args.cmd == "enqueue-convert":
+            out: Any = {"ids": enqueue_conversions(q, args.paths, args.priority, args.out_dir)}
+        elif args.cmd == "enqueue-review":
+            out = {"id": enqueue_review(q, args.files, args.run_id, args.root, args.priority, batch=args.batch)}
+        elif args.cmd == "work":
+            kinds = [k for k in args.kinds.split(",") if k] or list(HANDLERS)
+            out = work(q, {k: HANDLERS[k] for k in kinds}, batch=args.batch, idle_exit=args.idle_exit)
+        elif args.cmd == "stats":
+            out = q.stats()
+        elif args.cmd == "dead":
+            out = q.dead_letters()
+        else:
+            out = {"requeued": q.requeue_dead()}
+    print(json.dumps(out, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,245 @@
+# Path: app/services/rate_limiter.py
+"""
+Adaptive per-provider rate limiting for every LLM call.
+
+Each provider (openai, gemini, grok, ...) gets one Limiter holding:
+- a requests-per-minute token bucket and a tokens-per-minute token bucket
+  (0 = unlimited), refilled continuously;
+- an AIMD concurrency window: +1/limit per success (about +1 per round of
+  calls), halved on every 429, clamped to [1, max];
+- a shared pause: a 429 with Retry-After (or our own backoff) holds *all*
+  callers of that provider until it expires, so one throttle does not turn
+  into a storm of parallel retries.
+
+Retries honour Retry-After (seconds or HTTP-date); without it, jittered
+exponential backoff (full jitter, base AIO_RL_BACKOFF_BASE) is used. 5xx
+responses are retried without shrinking the window.
+
+Env (per provider, upper-cased name, e.g. AIO_RL_OPENAI_RPM):
+  AIO_RL_<P>_RPM             : requests per minute (default 0 = unlimited)
+  AIO_RL_<P>_TPM             : tokens per minute (default 0 = unlimited)
+  AIO_RL_<P>_CONCURRENCY     : initial in-flight window (default 4)
+  AIO_RL_<P>_MAX_CONCURRENCY : window ceiling (default 16)
+  AIO_RL_RETRIES             : attempts after the first (default 4)
+  AIO_RL_BACKOFF_BASE        : seconds (default 1.0), capped at 60s
+"""
+from __future__ import annotations
+
+import email.utils
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.services import http_transport
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def estimate_tokens(*texts: Any) -> int:
+    """Cheap token estimate (~4 chars per token) for TPM accounting."""
+    return max(1, sum(len(str(t)) for t in texts if t) // 4)
+
+
+def retry_after(headers: Any) -> Optional[float]:
+    """Seconds from a Retry-After / retry-after-ms header, or None."""
+    if not headers:
+        return None
+    try:
+        ms = headers.get("retry-after-ms") or headers.get("Retry-After-Ms")
+        if ms:
+            return max(0.0, float(ms) / 1000.0)
+        raw = headers.get("retry-after") or headers.get("Retry-After")
+    except Exception:
+        return None
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(raw)
+        return max(0.0, when.timestamp() - time.time())
+    except Exception:
+        return None
+
+
+def classify(result: Any = None, exc: Optional[BaseException] = None) -> Tuple[Optional[int], Any]:
+    """(status code, headers) from an HTTP response or an SDK exception."""
+    src = exc if exc is not None else result
+    status = getattr(src, "status_code", None)
+    if status is None and exc is not None:
+        code = getattr(exc, "code", None)
+        status = code if isinstance(code, int) else None
+        if status is None and exc.__class__.__name__ in ("RateLimitError", "ResourceExhausted"):
+            status = 429
+    resp = getattr(exc, "response", None) if exc is not None else result
+    headers = getattr(resp, "headers", None)
+    return (status if isinstance(status, int) else None), headers
+
+
+class TokenBucket:
+    """Continuous-refill bucket; `rate_per_min` <= 0 means unlimited."""
+
+    def __init__(self, rate_per_min: float, burst: Optional[float] = None) -> None:
+        self.rate = rate_per_min / 60.0
+        self.capacity = burst if burst is not None else max(1.0, rate_per_min / 6.0)
+        self.level = self.capacity
+        self.stamp = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def wait_time(self, n: float, now: float) -> float:
+        """Seconds until `n` units are available (0 = now). Caller holds the lock."""
+        if self.rate <= 0:
+            return 0.0
+        self._refill(now)
+        n = min(n, self.capacity)  # oversized requests wait for a full bucket, never forever
+        return 0.0 if self.level >= n else (n - self.level) / self.rate
+
+    def take(self, n: float) -> None:
+        if self.rate > 0:
+            self.level -= min(n, self.capacity)
+
+
+class Limiter:
+    """RPM/TPM buckets + AIMD concurrency window for one provider."""
+
+    def __init__(self, provider: str, rpm: float = 0, tpm: float = 0,
+                 concurrency: float = 4, max_concurrency: float = 16) -> None:
+        self.provider = provider
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_limit = max(1.0, float(max_concurrency))
+        self.limit = min(self.max_limit, max(1.0, float(concurrency)))
+        self.inflight = 0
+        self.paused_until = 0.0
+        self.stats = {"calls": 0, "ok": 0, "throttled": 0, "retried": 0, "errors": 0}
+        self._cv = threading.Condition()
+
+    @classmethod
+    def from_env(cls, provider: str) -> "Limiter":
+        p = f"AIO_RL_{provider.upper()}_"
+        return cls(provider,
+                   rpm=_env_float(p + "RPM", 0), tpm=_env_float(p + "TPM", 0),
+                   concurrency=_env_float(p + "CONCURRENCY", 4),
+                   max_concurrency=_env_float(p + "MAX_CONCURRENCY", 16))
+
+    # -- admission --
+    def acquire(self, tokens: int = 1) -> None:
+        with self._cv:
+            while True:
+                now = time.monotonic()
+                wait = self.paused_until - now
+                if wait <= 0 and self.inflight >= int(self.limit):
+                    wait = None  # woken by release()
+                elif wait <= 0:
+                    wait = max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+                    if wait <= 0:
+                        self.requests.take(1)
+                        self.tokens.take(tokens)
+                        self.inflight += 1
+                        self.stats["calls"] += 1
+                        return
+                self._cv.wait(timeout=wait)
+
+    def release(self, status: Optional[int], pause: float = 0.0, retry: bool = False) -> None:
+        with self._cv:
+            self.inflight = max(0, self.inflight - 1)
+            self.stats["retried"] += int(retry)
+            if status == 429:
+                self.limit = max(1.0, self.limit / 2.0)
+                self.stats["throttled"] += 1
+            elif status is not None and status < 400:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self.stats["ok"] += 1
+            else:
+                self.stats["errors"] += 1
+            if pause > 0:
+                self.paused_until = max(self.paused_until, time.monotonic() + pause)
+            self._cv.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cv:
+            return {"provider": self.provider, "limit": round(self.limit, 2),
+                    "inflight": self.inflight, **self.stats}
+
+
+_LIMITERS: Dict[str, Limiter] = {}
+_LOCK = threading.Lock()
+
+
+def limiter(provider: str) -> Limiter:
+    key = provider.lower()
+    with _LOCK:
+        lim = _LIMITERS.get(key)
+        if lim is None:
+            lim = _LIMITERS[key] = Limiter.from_env(key)
+        return lim
+
+
+def reset() -> None:
+    """Drop all limiters (tests / env changes)."""
+    with _LOCK:
+        _LIMITERS.clear()
+
+
+def _backoff(attempt: int, hinted: Optional[float]) -> float:
+    if hinted is not None:
+        return hinted + random.uniform(0, 0.25)  # small jitter so waiters don't wake in lockstep
+    base = _env_float("AIO_RL_BACKOFF_BASE", 1.0)
+    return random.uniform(0, min(60.0, base * (2 ** attempt)))
+
+
+def call(provider: str, fn: Callable[[], Any], *, tokens: int = 1,
+         retries: Optional[int] = None, sleep: Callable[[float], None] = time.sleep) -> Any:
+    """
+    Run `fn()` under the provider's limiter, retrying 429/5xx.
+
+    `fn` may return an HTTP response (status_code is inspected; the last
+    response is returned even if it is still an error) or raise an SDK
+    exception (re-raised once retries are exhausted or if not retryable).
+    """
+    lim = limiter(provider)
+    attempts = 1 + (int(_env_float("AIO_RL_RETRIES", 4)) if retries is None else max(0, retries))
+    for attempt in range(attempts):
+        lim.acquire(tokens)
+        result, exc = None, None
+        try:
+            result = fn()
+        except Exception as e:
+            exc = e
+        status, headers = classify(result, exc)
+        if exc is not None and status is None:
+            lim.release(None)
+            raise exc
+        retryable = status == 429 or (status is not None and 500 <= status < 600)
+        if not retryable or attempt == attempts - 1:
+            lim.release(status if status is not None else 200)
+            if exc is not None:
+                raise exc
+            return result
+        delay = _backoff(attempt, retry_after(headers))
+        if exc is None and hasattr(result, "close"):
+            result.close()  # release the pooled connection (streamed bodies are still open)
+        if status == 429:
+            # pause the whole provider; acquire() holds this caller (and everyone else) until it lifts
+            lim.release(status, pause=delay, retry=True)
+        else:
+            lim.release(status, retry=True)
+            sleep(delay)
+    raise RuntimeError("unreachable")  # pragma: no cover
+
+
+def post(provider: str, url: str, *, tokens: int = 1, retries: Optional[int] = None, **kw: Any) -> Any:
+    """http_transport.post() behind the provider's limiter (see call())."""
+    return call(provider, lambda: http_transport.post(provider, url, **kw), tokens=tokens, retries=retries)
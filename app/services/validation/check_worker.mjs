@@ -0,0 +1,150 @@
+// Path: app/services/validation/check_worker.mjs
+// Warm per-project type-check / lint worker (JSON-lines RPC, same protocol as
+// app/services/node_worker.mjs). Started with cwd = the project root.
+//   ts.check     {path, code?}        -> {diagnostics: [...], ms}
+//   eslint.check {path, code?, fix?}  -> {messages: [...], errors, warnings, fixed, output?, ms}
+//   check        {path, code?, fix?}  -> {ts, eslint}   (either may be {error})
+// typescript and eslint resolve from the project's node_modules. The
+// TypeScript LanguageService (the engine behind tsserver) and the ESLint
+// instance are built once and reused, so only the first check pays for
+// loading tsconfig, lib files and the lint config.
+// With fix, on-disk files are rewritten in place; for unsaved `code` nothing
+// is written and the fixed text comes back as `output` instead.
+// Driven by app/services/validation/daemon.py.
+import fs from "node:fs";
+import path from "node:path";
+import readline from "node:readline";
+import { createRequire } from "node:module";
+
+const once = (load) => { let p; return () => (p ??= load()); };
+
+const projectRequire = (name) => {
+  for (const base of [path.join(process.cwd(), "package.json"), import.meta.url]) {
+    try { return createRequire(base)(name); } catch { /* try next */ }
+  }
+  throw new Error(`${name} not installed in ${process.cwd()}`);
+};
+
+const MAX_ROOTS = 500;
+const now = () => performance.now();
+
+// ---- TypeScript ----------------------------------------------------------------
+const loadService = once(() => {
+  const ts = projectRequire("typescript");
+  let options = {
+    noEmit: true, allowJs: true, skipLibCheck: true, strict: true,
+    target: ts.ScriptTarget.ES2020, module: ts.ModuleKind.ESNext,
+    moduleResolution: ts.ModuleResolutionKind.NodeJs, jsx: ts.JsxEmit.ReactJSX, esModuleInterop: true,
+  };
+  const configPath = ts.findConfigFile(process.cwd(), ts.sys.fileExists, "tsconfig.json");
+  if (configPath) {
+    const cfg = ts.readConfigFile(configPath, ts.sys.readFile);
+    if (!cfg.error) {
+      options = { ...ts.parseJsonConfigFileContent(cfg.config, ts.sys, path.dirname(configPath)).options, noEmit: true };
+    }
+  }
+  // root files checked so far: path -> {version, text|null (read from disk)}
+  const roots = new Map();
+  const mtime = (f) => { try { return String(fs.statSync(f).mtimeMs); } catch { return "0"; } };
+  const host = {
+    getScriptFileNames: () => [...roots.keys()],
+    getScriptVersion: (f) => (roots.get(f)?.text != null ? roots.get(f).version : mtime(f)),
+    getScriptSnapshot: (f) => {
+      const text = roots.get(f)?.text ?? ts.sys.readFile(f);
+      return text === undefined ? undefined : ts.ScriptSnapshot.fromString(text);
+    },
+    getCurrentDirectory: () => process.cwd(),
+    getCompilationSettings: () => options,
+    getDefaultLibFileName: (o) => ts.getDefaultLibFilePath(o),
+    fileExists: ts.sys.fileExists,
+    readFile: ts.sys.readFile,
+    readDirectory: ts.sys.readDirectory,
+    directoryExists: ts.sys.directoryExists,
+    getDirectories: ts.sys.getDirectories,
+  };
+  const service = ts.createLanguageService(host, ts.createDocumentRegistry());
+  let version = 0;
+  const open = (file, code) => {
+    roots.delete(file); // re-insert so eviction is least-recently-checked
+    roots.set(file, { version: String(++version), text: code ?? null });
+    if (roots.size > MAX_ROOTS) roots.delete(roots.keys().next().value);
+  };
+  return { ts, service, open };
+});
+
+const tsCheck = async (p) => {
+  const t0 = now();
+  const { ts, service, open } = loadService();
+  const file = path.resolve(p.path);
+  open(file, p.code);
+  const diags = [...service.getSyntacticDiagnostics(file), ...service.getSemanticDiagnostics(file)];
+  return {
+    diagnostics: diags.map((d) => {
+      const pos = d.file && d.start != null ? d.file.getLineAndCharacterOfPosition(d.start) : { line: 0, character: 0 };
+      return {
+        line: pos.line + 1, col: pos.character + 1, code: d.code,
+        severity: ts.DiagnosticCategory[d.category].toLowerCase(),
+        message: ts.flattenDiagnosticMessageText(d.messageText, "\n"),
+      };
+    }),
+    ms: Math.round((now() - t0) * 100) / 100,
+  };
+};
+
+// ---- ESLint --------------------------------------------------------------------
+const loadESLint = once(async () => {
+  const mod = projectRequire("eslint");
+  const ESLint = mod.loadESLint ? await mod.loadESLint() : mod.ESLint;
+  if (!ESLint) throw new Error("eslint has no ESLint class (eslint < 7)");
+  return { ESLint, byFix: new Map() };
+});
+
+const eslintCheck = async (p) => {
+  const t0 = now();
+  const { ESLint, byFix } = await loadESLint();
+  const fix = !!p.fix;
+  if (!byFix.has(fix)) byFix.set(fix, new ESLint({ cwd: process.cwd(), fix }));
+  const eslint = byFix.get(fix);
+  const file = path.resolve(p.path);
+  const results = p.code != null ? await eslint.lintText(p.code, { filePath: file }) : await eslint.lintFiles([file]);
+  // unsaved text must not overwrite the file on disk; hand the fixed text back instead
+  if (fix && p.code == null) await ESLint.outputFixes(results);
+  const r = results[0] || { messages: [], errorCount: 0, warningCount: 0 };
+  return {
+    messages: r.messages.map((m) => ({
+      line: m.line || 0, col: m.column || 0, rule: m.ruleId || null,
+      severity: m.severity === 2 ? "error" : "warning", message: m.message,
+    })),
+    errors: r.errorCount, warnings: r.warningCount, fixed: r.output != null,
+    ...(p.code != null && r.output != null ? { output: r.output } : {}),
+    ms: Math.round((now() - t0) * 100) / 100,
+  };
+};
+
+// Both checkers; a missing tool is reported per side instead of failing the call.
+const settle = async (fn, p) => { try { return await fn(p); } catch (e) { return { error: String(e?.message || e) }; } };
+
+const ops = {
+  ping: async () => ({ pid: process.pid, node: process.version, cwd: process.cwd() }),
+  "ts.check": tsCheck,
+  "eslint.check": eslintCheck,
+  check: async (p) => ({ ts: await settle(tsCheck, p), eslint: await settle(eslintCheck, p) }),
+};
+
+const send = (msg) => process.stdout.write(JSON.stringify(msg) + "\n");
+
+const handle = async (line) => {
+  let req;
+  try { req = JSON.parse(line); } catch { return send({ id: null, ok: false, error: "bad json" }); }
+  const fn = ops[req.op];
+  if (!fn) return send({ id: req.id, ok: false, error: `unknown op: ${req.op}` });
+  try { send({ id: req.id, ok: true, result: await fn(req.params || {}) }); }
+  catch (e) { send({ id: req.id, ok: false, error: String(e?.message || e) }); }
+};
+
+// Why: stray console.log from plugins must not corrupt the protocol.
+console.log = (...a) => process.stderr.write(a.join(" ") + "\n");
+
+const rl = readline.createInterface({ input: process.stdin, crlfDelay: Infinity });
+rl.on("line", (line) => { if (line.trim()) handle(line); });
+rl.on("close", () => process.exit(0));
@@ -0,0 +1,135 @@
+# Path: app/services/validation/daemon.py
+"""
+Warm per-project validation workers (TypeScript LanguageService + ESLint).
+
+Each project root gets a small NodePool running check_worker.mjs with the
+project as cwd; typescript / eslint load once per worker and stay warm, so
+checking one generated file costs the incremental type-check and lint
+instead of a cold `npx tsc` / `npx eslint` start each time.
+
+check_file / check_files return structured per-file diagnostics:
+  {"path", "ok", "ts": [diag...], "eslint": [msg...], "errors": {...}, "ms"}
+where a diag is {"line", "col", "code", "severity", "message"} and an ESLint
+message is {"line", "col", "rule", "severity", "message"}. A checker that is
+not installed in the project shows up under "errors" and does not fail the
+file. None means no worker could be used at all (node missing); callers fall
+back to the per-file npx commands.
+
+Env:
+  AIO_VALIDATE_DAEMON  : "0" disables the workers (default on)
+  AIO_VALIDATE_WORKERS : worker processes per project (default 1)
+  AIO_VALIDATE_TIMEOUT : seconds per file check (default 120; the first
+                         check in a project loads the whole program)
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.services.node_pool import NodePool, NodeWorkerError, node_bin
+
+CHECK_SCRIPT = Path(__file__).with_name("check_worker.mjs")
+
+
+def enabled() -> bool:
+    return os.getenv("AIO_VALIDATE_DAEMON", "1").strip().lower() not in {"0", "off", "false", "no"}
+
+
+def _timeout() -> float:
+    try:
+        return float(os.getenv("AIO_VALIDATE_TIMEOUT", "120") or 120)
+    except ValueError:
+        return 120.0
+
+
+def project_root_for(path: str) -> Path:
+    """Nearest ancestor with a tsconfig.json or package.json (else the file's directory)."""
+    p = Path(path).resolve()
+    for d in [p.parent, *p.parent.parents]:
+        if (d / "tsconfig.json").exists() or (d / "package.json").exists():
+            return d
+    return p.parent
+
+
+_POOLS: Dict[str, NodePool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def pool_for(project_root: Path) -> Optional[NodePool]:
+    """Process-wide worker pool for `project_root`, or None when unavailable."""
+    if not enabled() or node_bin() is None or not CHECK_SCRIPT.exists():
+        return None
+    key = str(Path(project_root).resolve())
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            try:
+                size = int(os.getenv("AIO_VALIDATE_WORKERS", "1"))
+            except ValueError:
+                size = 1
+            if not _POOLS:
+                atexit.register(shutdown)
+            pool = _POOLS[key] = NodePool(size, script=CHECK_SCRIPT, cwd=Path(key))
+        return pool
+
+
+def shutdown() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _shape(path: str, res: Dict[str, Any]) -> Dict[str, Any]:
+    ts = res.get("ts") or {}
+    es = res.get("eslint") or {}
+    errors = {k: v["error"] for k, v in (("ts", ts), ("eslint", es)) if "error" in v}
+    ts_diags = ts.get("diagnostics") or []
+    es_msgs = es.get("messages") or []
+    ok = not any(d.get("severity") == "error" for d in ts_diags) and not any(
+        m.get("severity") == "error" for m in es_msgs)
+    out = {"path": path, "ok": ok, "ts": ts_diags, "eslint": es_msgs, "fixed": bool(es.get("fixed")),
+           "errors": errors, "ms": round(float(ts.get("ms") or 0) + float(es.get("ms") or 0), 2)}
+    if es.get("output") is not None:
+        out["output"] = es["output"]  # fixed text for unsaved code (the file itself is left alone)
+    return out
+
+
+def check_files(paths: Iterable[str], fix: bool = False, codes: Optional[Dict[str, str]] = None,
+                project_root: Optional[Path] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Type-check and lint `paths` on the warm workers (all requests in flight
+    at once); `codes` optionally maps path -> unsaved text. With `fix`,
+    files on disk are rewritten, while unsaved text is never written: its
+    fixed version comes back under "output". Results keep input order. Returns None when the workers cannot be used.
+    """
+    paths = [str(p) for p in paths]
+    codes = codes or {}
+    futs = []
+    for p in paths:
+        pool = pool_for(project_root or project_root_for(p))
+        if pool is None:
+            return None
+        params: Dict[str, Any] = {"path": str(Path(p).resolve()), "fix": fix}
+        if p in codes:
+            params["code"] = codes[p]
+        futs.append(pool.submit("check", params))
+    out: List[Dict[str, Any]] = []
+    for p, fut in zip(paths, futs):
+        try:
+            res = fut.result(timeout=_timeout())
+        except (NodeWorkerError, FutureTimeout) as e:
+            res = {"ts": {"error": str(e) or "timeout"}, "eslint": {"error": str(e) or "timeout"}}
+        out.append(_shape(p, res))
+    return out
+
+
+def check_file(path: str, code: Optional[str] = None, fix: bool = False,
+               project_root: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    res = check_files([path], fix=fix, codes={path: code} if code is not None else None, project_root=project_root)
+    return res[0] if res else None
@@ -20,6 +20,23 @@ def _parse_jest_coverage(output: str) -> Optional[float]:
     m = re.search(r"All files.*?(\d+(?:\.\d+)?)\s*%\s*$", output, re.S | re.M)
     return float(m.group(1)) if m else None
 
+def _format_diags(path: str, items: list[dict], tool: str) -> str:
+    """tsc / eslint style text for the structured diagnostics (keeps `output` readable)."""
+    lines = []
+    for d in items:
+        tag = f"TS{d.get('code')}" if tool == "tsc" else (d.get("rule") or "eslint")
+        lines.append(f"{path}({d.get('line')},{d.get('col')}): {d.get('severity')} {tag}: {d.get('message')}")
+    return "\n".join(lines)
+
+def _daemon_checks(paths: list[str]) -> Dict[str, Dict[str, Any]]:
+    """path -> warm-worker result (see daemon.check_files); empty when unavailable."""
+    try:
+        from app.services.validation import daemon
+        res = daemon.check_files(paths, fix=True)
+    except Exception:
+        res = None
+    return {r["path"]: r for r in res or []}
+
 def run_full_validation(
     paths: Optional[Iterable[str]] = None,
     test_path: Optional[str] = None,
@@ -30,15 +47,28 @@ def run_full_validation(
       - tsc --noEmit {path} for each path (best-effort single-file typecheck)
       - jest {test_path} --coverage (log coverage %)
       - eslint {path} --fix for each path
+    tsc and eslint run on the warm per-project workers (validation/daemon.py)
+    when possible; a path/tool the workers cannot serve falls back to npx.
     If required tool isn't available, record reason but do NOT hard-fail.
     On failure, attempt 'ts-migrate migrate .' as a best-effort assist.
     """
     reasons = []
     ok = True
 
+    paths = list(paths or [])
+    warm = _daemon_checks(paths) if paths else {}
+
     # tsc per file
     if paths:
         for p in paths:
+            w = warm.get(p)
+            if w is not None and "ts" not in w["errors"]:
+                errs = [d for d in w["ts"] if d.get("severity") == "error"]
+                if errs:
+                    ok = False
+                    reasons.append({"tool": "tsc", "path": p, "output": _format_diags(p, errs, "tsc"),
+                                    "diagnostics": errs})
+                continue
             rc, out = _run(["npx", "tsc", "--noEmit", p])
             if rc != 0 and "not found" not in out.lower():
                 ok = False
@@ -59,6 +89,14 @@ def run_full_validation(
     # eslint per file
     if paths:
         for p in paths:
+            w = warm.get(p)
+            if w is not None and "eslint" not in w["errors"]:
+                errs = [m for m in w["eslint"] if m.get("severity") == "error"]
+                if errs:
+                    ok = False
+                    reasons.append({"tool": "eslint", "path": p, "output": _format_diags(p, errs, "eslint"),
+                                    "diagnostics": errs})
+                continue
             rc, out = _run(["npx", "eslint", p, "--ext", ".ts,.tsx", "--fix"])
             if rc != 0 and "not found" not in out.lower():
                 ok = False
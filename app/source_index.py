@@ -0,0 +1,312 @@
+# Path: app/source_index.py
+"""
+Persistent, incremental index of frontend source files (SQLite).
+
+Each row is keyed by absolute path and stores size / mtime / sha1 plus the
+derived facts the scanners need (function names, worth score, import count,
+JSX flag). A refresh only
+re-reads files whose size or mtime moved since the last scan; if the content
+hash still matches, the cached facts are kept and only the stat columns are
+touched. Everything else is served straight from the database.
+
+Env:
+  AIO_SOURCE_INDEX : path to the SQLite file (default reports/source_index.sqlite);
+                     "0" / "off" / "false" disables the index.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+SCHEMA_VERSION = "3"  # bump whenever the derived facts change meaning
+DEFAULT_DB = Path("reports") / "source_index.sqlite"
+
+# (path, size, mtime_ns) as produced by a directory walk
+StatEntry = Tuple[Path, int, int]
+# analyze(path, text, size) -> (function names, worth score[, import count, has JSX])
+Analyzer = Callable[[Path, str, int], Tuple]
+# batch form: one call for every file that needs (re)analysis, results in input order
+BatchAnalyzer = Callable[[List[Tuple[Path, str, int]]], List[Tuple]]
+
+
+@dataclass
+class IndexedFile:
+    path: Path
+    size: int
+    mtime_ns: int
+    sha1: str
+    functions: List[str] = field(default_factory=list)
+    score: float = 0.0
+    imports: int = 0
+    jsx: bool = False
+
+
+@dataclass
+class RefreshStats:
+    seen: int = 0
+    added: int = 0
+    changed: int = 0
+    rehashed_same: int = 0
+    removed: int = 0
+    elapsed_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(self.__dict__)
+
+
+def index_path_from_env() -> Optional[Path]:
+    """Resolve the index location from AIO_SOURCE_INDEX (None when disabled)."""
+    raw = os.getenv("AIO_SOURCE_INDEX", "").strip()
+    if raw.lower() in {"0", "off", "false", "no"}:
+        return None
+    return Path(raw) if raw else DEFAULT_DB
+
+
+def stat_entries(paths: Iterable[Path]) -> List[StatEntry]:
+    """stat() each path; missing/unreadable files are dropped."""
+    out: List[StatEntry] = []
+    for p in paths:
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        out.append((p, int(st.st_size), int(st.st_mtime_ns)))
+    return out
+
+
+def _read(path: Path) -> Optional[bytes]:
+    try:
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+class SourceIndex:
+    """Thread-safe wrapper around the on-disk index."""
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+
+    # ---- schema -------------------------------------------------------------
+    def _init_schema(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            row = self._conn.execute("SELECT value FROM meta WHERE key='schema'").fetchone()
+            if row and row[0] != SCHEMA_VERSION:
+                # Why: derived facts are cheap to rebuild; never migrate, just reset.
+                self._conn.execute("DROP TABLE IF EXISTS files")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path       TEXT PRIMARY KEY,
+                    size       INTEGER NOT NULL,
+                    mtime_ns   INTEGER NOT NULL,
+                    sha1       TEXT NOT NULL,
+                    functions  TEXT NOT NULL,
+                    score      REAL NOT NULL,
+                    imports    INTEGER NOT NULL DEFAULT 0,
+                    jsx        INTEGER NOT NULL DEFAULT 0,
+                    indexed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS files_score ON files(score DESC)")
+            self._conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('schema', ?)", (SCHEMA_VERSION,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---- reads --------------------------------------------------------------
+    @staticmethod
+    def _row_to_file(row: Tuple) -> IndexedFile:
+        path, size, mtime_ns, sha1, functions, score, imports, jsx = row
+        return IndexedFile(Path(path), int(size), int(mtime_ns), sha1, json.loads(functions), float(score),
+                           int(imports), bool(jsx))
+
+    def _rows_for(self, paths: List[str]) -> Dict[str, IndexedFile]:
+        out: Dict[str, IndexedFile] = {}
+        # Why: stay well under SQLITE_MAX_VARIABLE_NUMBER on old builds.
+        for i in range(0, len(paths), 500):
+            chunk = paths[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for row in self._conn.execute(
+                "SELECT path, size, mtime_ns, sha1, functions, score, imports, jsx FROM files"
+                f" WHERE path IN ({marks})", chunk
+            ):
+                out[row[0]] = self._row_to_file(row)
+        return out
+
+    def _rows_under(self, root: Path) -> Dict[str, IndexedFile]:
+        lo, hi = _prefix_range(root)
+        return {
+            row[0]: self._row_to_file(row)
+            for row in self._conn.execute(
+                "SELECT path, size, mtime_ns, sha1, functions, score, imports, jsx FROM files"
+                " WHERE path >= ? AND path < ?",
+                (lo, hi),
+            )
+        }
+
+    def get(self, path: Path) -> Optional[IndexedFile]:
+        with self._lock:
+            return self._rows_for([str(path)]).get(str(path))
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0])
+
+    # ---- writes -------------------------------------------------------------
+    def _apply(
+        self,
+        entries: List[StatEntry],
+        known: Dict[str, IndexedFile],
+        analyze: Analyzer,
+        stats: RefreshStats,
+        analyze_many: Optional[BatchAnalyzer] = None,
+    ) -> List[IndexedFile]:
+        out: List[Optional[IndexedFile]] = []
+        todo: List[Tuple[int, Path, int, int, str, str, bool]] = []  # slot, path, size, mtime, sha1, text, is_new
+        touches: List[Tuple] = []
+        now = time.time()
+        for path, size, mtime_ns in entries:
+            key = str(path)
+            stats.seen += 1
+            row = known.get(key)
+            if row is not None and row.size == size and row.mtime_ns == mtime_ns:
+                out.append(row)
+                continue
+            data = _read(path)
+            if data is None:
+                continue
+            sha1 = hashlib.sha1(data).hexdigest()
+            if row is not None and row.sha1 == sha1:
+                # Content unchanged (touch/checkout): keep facts, refresh stat columns.
+                stats.rehashed_same += 1
+                row = IndexedFile(path, size, mtime_ns, sha1, row.functions, row.score, row.imports, row.jsx)
+                touches.append((size, mtime_ns, now, key))
+                out.append(row)
+                continue
+            todo.append((len(out), path, size, mtime_ns, sha1, data.decode("utf-8", errors="ignore"), row is None))
+            out.append(None)
+
+        items = [(path, text, size) for _slot, path, size, _m, _h, text, _new in todo]
+        if analyze_many is not None:
+            facts = analyze_many(items)
+        else:
+            facts = [analyze(*it) for it in items]
+        upserts: List[Tuple] = []
+        for (slot, path, size, mtime_ns, sha1, _text, is_new), fact in zip(todo, facts):
+            if is_new:
+                stats.added += 1
+            else:
+                stats.changed += 1
+            functions, score, *extra = fact
+            imports, jsx = (int(extra[0]), bool(extra[1])) if len(extra) >= 2 else (0, False)
+            row = IndexedFile(path, size, mtime_ns, sha1, list(functions), float(score), imports, jsx)
+            upserts.append((str(path), size, mtime_ns, sha1, json.dumps(row.functions), row.score,
+                            row.imports, int(row.jsx), now))
+            out[slot] = row
+
+        if upserts or touches:
+            with self._conn:
+                if upserts:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO files"
+                        "(path, size, mtime_ns, sha1, functions, score, imports, jsx, indexed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        upserts,
+                    )
+                if touches:
+                    self._conn.executemany(
+                        "UPDATE files SET size = ?, mtime_ns = ?, indexed_at = ? WHERE path = ?", touches
+                    )
+        return [r for r in out if r is not None]
+
+    def update(
+        self,
+        entries: Iterable[StatEntry],
+        analyze: Analyzer,
+        analyze_many: Optional[BatchAnalyzer] = None,
+    ) -> Tuple[List[IndexedFile], RefreshStats]:
+        """
+        Bring the rows for `entries` up to date and return them (input order).
+        Rows for paths not listed are left untouched. When `analyze_many` is
+        given, all new/changed files are analyzed in one batch call.
+        """
+        t0 = time.perf_counter()
+        entries = list(entries)
+        stats = RefreshStats()
+        with self._lock:
+            known = self._rows_for([str(p) for p, _s, _m in entries])
+            out = self._apply(entries, known, analyze, stats, analyze_many)
+        stats.elapsed_ms = round((time.perf_counter() - t0) * 1000.0, 2)
+        return out, stats
+
+    def sync(
+        self,
+        root: Path,
+        entries: Iterable[StatEntry],
+        analyze: Analyzer,
+        analyze_many: Optional[BatchAnalyzer] = None,
+    ) -> Tuple[List[IndexedFile], RefreshStats]:
+        """
+        Like update(), but treats `entries` as the complete listing of `root`:
+        rows under `root` that were not seen are deleted.
+        """
+        t0 = time.perf_counter()
+        entries = list(entries)
+        stats = RefreshStats()
+        with self._lock:
+            known = self._rows_under(root)
+            out = self._apply(entries, known, analyze, stats, analyze_many)
+            gone = set(known) - {str(p) for p, _s, _m in entries}
+            if gone:
+                with self._conn:
+                    self._conn.executemany("DELETE FROM files WHERE path = ?", [(g,) for g in gone])
+            stats.removed = len(gone)
+        stats.elapsed_ms = round((time.perf_counter() - t0) * 1000.0, 2)
+        return out, stats
+
+
+def _prefix_range(root: Path) -> Tuple[str, str]:
+    """[lo, hi) key range covering every path strictly below `root`."""
+    base = str(root).rstrip("/\\") + os.sep
+    return base, base[:-1] + chr(ord(os.sep) + 1)
+
+
+_OPEN: Dict[str, SourceIndex] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def open_index(db_path: Optional[Path] = None) -> Optional[SourceIndex]:
+    """
+    Return a process-wide SourceIndex for `db_path` (or the env default).
+    Returns None when the index is disabled or cannot be opened.
+    """
+    path = db_path or index_path_from_env()
+    if path is None:
+        return None
+    key = str(Path(path).resolve())
+    with _OPEN_LOCK:
+        idx = _OPEN.get(key)
+        if idx is None:
+            try:
+                idx = SourceIndex(Path(path))
+            except sqlite3.Error:
+                return None
+            _OPEN[key] = idx
+        return idx
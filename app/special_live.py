@@ -3,12 +3,17 @@ import os
 import re
 import json
 import csv
+import hashlib
 import uuid
 import argparse
 import logging
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
+from core.walker import walk_files
+from app.services import rate_limiter
+
 # .env autoload (safe if missing)
 try:
     from dotenv import load_dotenv
@@ -16,13 +21,10 @@ try:
 except Exception:
     pass
 
-# optional OpenAI client (only used if live and key present)
+# optional OpenAI client (only used if live and key present); shared + pooled
 def _openai_client():
-    try:
-        from openai import OpenAI  # openai>=1.35,<2
-        return OpenAI()
-    except Exception as e:
-        raise RuntimeError(f"OpenAI client unavailable: {e}")
+    from app.services.http_transport import openai_client  # openai>=1.35,<2
+    return openai_client()
 
 log = logging.getLogger("special_live")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
@@ -41,32 +43,25 @@ DEFAULT_SKIP = {
 def _split_csv(v: str|None) -> list[str]:
     return [p.strip() for p in (v or "").replace(";",",").split(",") if p.strip()]
 
-def _should_skip(path: Path, extra_skips: set[str]) -> bool:
-    parts = {p.lower() for p in path.parts}
-    return bool(parts & extra_skips)
-
 def scan_roots(roots: list[str], exts: list[str], skip_dirs: list[str]) -> list[dict]:
     exts = [e.lower().lstrip(".") for e in exts]
     skip_set = {s.strip().lower() for s in skip_dirs if s.strip()} | {s.lower() for s in DEFAULT_SKIP}
-    inv: list[dict] = []
+    live_roots: list[str] = []
     for root in roots:
         root = root.strip()
         if not root:
             continue
-        rp = Path(root)
-        if not rp.exists():
+        if not Path(root).exists():
             log.warning("root missing: %s", root)
             continue
-        for p in rp.rglob("*"):
-            if not p.is_file():
-                continue
-            if _should_skip(p, skip_set):
-                continue
-            ext = p.suffix.lower().lstrip(".")
-            if ext not in exts:
-                continue
-            category = "test" if (".test." in p.name or p.name.endswith(".test") or p.parent.name == "tests") else "letters_only" if re.fullmatch(r"[A-Za-z]+", p.stem or "") else "other"
-            inv.append({"path": str(p.as_posix()), "size": p.stat().st_size, "ext": ext, "category": category})
+        live_roots.append(root)
+    inv: list[dict] = []
+    # skip dirs are pruned before descent; roots fan out across the walker's thread pool
+    for e in walk_files(live_roots, skip_dirs=skip_set, exts=exts):
+        p = e.path
+        ext = p.suffix.lower().lstrip(".")
+        category = "test" if (".test." in p.name or p.name.endswith(".test") or p.parent.name == "tests") else "letters_only" if re.fullmatch(r"[A-Za-z]+", p.stem or "") else "other"
+        inv.append({"path": str(p.as_posix()), "size": e.size, "ext": ext, "category": category})
     return inv
 
 def _sanitize_name(path: str) -> str:
@@ -126,37 +121,120 @@ def write_inventory(inv: list[dict], run_id: str) -> None:
         for row in inv:
             w.writerow(row)
 
-def openai_review_for(path: str, model: str) -> dict:
-    client = _openai_client()
-    # keep prompt tiny to be fast/cheap
-    head = ""
+SPECIAL_SYSTEM = "You are a concise senior TS migration reviewer."
+
+def _review_messages(prompt: str, body: str) -> list[dict]:
+    return [{"role":"system","content":SPECIAL_SYSTEM},
+            {"role":"user","content": prompt + "\n\n" + body}]
+
+def _openai_review_call(client, model: str, prompt: str, body: str, max_tokens: int = 200) -> str:
+    res = rate_limiter.call("openai", lambda: client.chat.completions.create(
+        model=model,
+        messages=_review_messages(prompt, body),
+        temperature=0.2,
+        max_tokens=max_tokens
+    ), tokens=rate_limiter.estimate_tokens(prompt, body) + max_tokens)
+    return (res.choices[0].message.content or "").strip()
+
+def _review_plan(path: str) -> tuple:
+    """
+    (prompt, [(chunk or None, body, max_tokens)]) for one file. Small files
+    (<= AIO_SPECIAL_CHUNK_TOKENS, default 500) are one request on the whole
+    text; larger ones are split at declaration boundaries.
+    """
+    from core.chunking import count_tokens, split_source
+    text = ""
     try:
         with open(path, "r", encoding="utf-8", errors="ignore") as fh:
-            head = fh.read(2000)
+            text = fh.read()
     except Exception:
         pass
     prompt = f"File: {path}\nBriefly assess what this file does and list 3-5 TypeScript risks to check when migrating."
+    budget = int(os.getenv("AIO_SPECIAL_CHUNK_TOKENS", "500") or 500)
+    chunks = split_source(text, budget) if count_tokens(text) > budget else []
+    if len(chunks) <= 1:
+        return prompt, [(None, "--- File ---\n" + text, 200)]
+    return prompt, [(c, f"--- Part {c.index + 1}/{len(chunks)} (lines {c.start_line}-{c.end_line}) ---\n{c.text}", 150)
+                    for c in chunks]
+
+def _join_parts(chunks: list, texts: list[str]) -> str:
+    return "\n\n".join(f"[lines {c.start_line}-{c.end_line}]\n{t}" for c, t in zip(chunks, texts))
+
+def openai_review_for(path: str, model: str) -> dict:
+    """
+    One call for small files; larger files are reviewed part by part in
+    parallel and merged by one reduce call, instead of only the first 2000
+    characters being read.
+    """
+    client = _openai_client()
     try:
-        res = client.chat.completions.create(
-            model=model,
-            messages=[{"role":"system","content":"You are a concise senior TS migration reviewer."},
-                      {"role":"user","content": prompt + "\n\n--- File Head (truncated) ---\n" + head}],
-            temperature=0.2,
-            max_tokens=200
-        )
-        text = (res.choices[0].message.content or "").strip()
-        return {"note":"openai-live","model":model,"review":text}
+        prompt, plan = _review_plan(path)
+        if len(plan) == 1:
+            _c, body, max_tokens = plan[0]
+            text = _openai_review_call(client, model, prompt, body, max_tokens)
+            return {"note":"openai-live","model":model,"review":text}
+
+        with ThreadPoolExecutor(max_workers=min(len(plan), 8), thread_name_prefix="special-chunk") as ex:
+            parts = list(ex.map(lambda item: _openai_review_call(client, model, prompt, item[1], item[2]), plan))
+        notes = _join_parts([c for c, _b, _m in plan], parts)
+        text = _openai_review_call(
+            client, model,
+            f"File: {path}\nMerge these per-part notes into one brief assessment of the whole file "
+            "and the 3-5 most important TypeScript migration risks.", "--- Part notes ---\n" + notes, max_tokens=250)
+        return {"note":"openai-live","model":model,"review":text,"chunks":len(plan)}
     except Exception as e:
         return {"note":"openai-error","error":str(e)}
 
-def process(items: list[dict], run_id: str, limit: int, providers_csv: str, dry_run: bool, model: str) -> list[dict]:
+def openai_batch_reviews(paths: list[str], run_id: str, model: str) -> dict:
+    """
+    Batch-API variant of openai_review_for for many files: one job under
+    artifacts/batches/<run_id>/special (resumable); multi-part files get their
+    part notes joined instead of a reduce round. Returns path -> generation.
+    """
+    from app.services.llm import batch_jobs
+    requests: dict = {}
+    plans: dict = {}
+    for path in paths:
+        prompt, plan = _review_plan(path)
+        plans[path] = []
+        # keyed on the path, not the position: a resumed job with another file list stays correct
+        pid = hashlib.sha1(os.path.normcase(os.path.abspath(path)).encode("utf-8")).hexdigest()[:16]
+        for j, (chunk, body, max_tokens) in enumerate(plan):
+            cid = f"{pid}:{j}"
+            plans[path].append((chunk, cid))
+            requests[cid] = {"model": model, "messages": _review_messages(prompt, body),
+                             "temperature": 0.2, "max_tokens": max_tokens}
+    try:
+        got = batch_jobs.run_job(PROJECT_ROOT / "artifacts" / "batches" / run_id / "special", requests,
+                                 metadata={"run_id": run_id})
+    except Exception as e:
+        return {p: {"note":"openai-error","error":str(e)} for p in paths}
+    out: dict = {}
+    for path, slots in plans.items():
+        results = [got[cid] for _c, cid in slots]
+        failed = next((r for r in results if not r.ok), None)
+        if failed is not None:
+            out[path] = {"note":"openai-error","error":failed.error}
+        elif len(slots) == 1:
+            out[path] = {"note":"openai-batch","model":model,"review":results[0].content.strip()}
+        else:
+            out[path] = {"note":"openai-batch","model":model,"chunks":len(slots),
+                         "review":_join_parts([c for c, _cid in slots], [r.content.strip() for r in results])}
+    return out
+
+def process(items: list[dict], run_id: str, limit: int, providers_csv: str, dry_run: bool, model: str,
+            batch: bool = False) -> list[dict]:
     providers = [p.strip().lower() for p in _split_csv(providers_csv)]
+    live = not dry_run and "openai" in providers
+    batched = openai_batch_reviews([it["path"] for it in items[:limit]], run_id, model) if live and batch else {}
     out: list[dict] = []
     for it in items[:limit]:
         p = it["path"]
         payload = {"run_id": run_id, "path": p, "tier": "Free", "generation": {}}
-        if dry_run or ("openai" not in providers):
+        if not live:
             payload["generation"] = {"kind": "special-ai-review", "note": "placeholder"}
+        elif batch:
+            payload["generation"] = batched[p]
         else:
             payload["generation"] = openai_review_for(p, model)
         # write artifact
@@ -174,6 +252,8 @@ def main():
     ap.add_argument("--providers", default=os.getenv("AIO_PROVIDERS","openai"))
     ap.add_argument("--dry-run", default=os.getenv("AIO_DRY_RUN","true").lower()=="true")
     ap.add_argument("--model", default=os.getenv("AIO_MODEL","gpt-4o-mini"))
+    ap.add_argument("--batch", action="store_true", default=os.getenv("AIO_BATCH","").lower()=="true",
+                    help="submit reviews as one Batch API job and wait for it (overnight runs)")
     args = ap.parse_args()
 
     run_id = uuid.uuid4().hex[:8]
@@ -188,7 +268,7 @@ def main():
     write_grouped_reports(inv, run_id)
 
     log.info("process:start limit=%d providers=%s dry=%s model=%s", args.limit, args.providers, args.dry_run, args.model)
-    out = process(inv, run_id, args.limit, args.providers, args.dry_run, args.model)
+    out = process(inv, run_id, args.limit, args.providers, args.dry_run, args.model, batch=args.batch)
     log.info("process:done emitted=%d -> artifacts/generations_special/*.gen.json", len(out))
     print(json.dumps({"ok": True, "run_id": run_id, "processed": len(out)}))
 
@@ -0,0 +1,170 @@
+"""
+Path: core/affected.py
+Changed files -> affected modules -> related tests, for affected-only gates.
+
+The import graph is built from the js_lexer import specifiers of every
+source file under a root. Relative specifiers ("./x", "../y") and aliases
+are resolved the way bundlers do: exact file, then each source extension,
+then <dir>/index.<ext>. Aliases come from tsconfig.json compilerOptions
+(paths + baseUrl), else "@/" -> <root>/src. Bare package imports are
+ignored.
+
+Alias map keys: "prefix/" matches by prefix, "name" matches exactly, and
+"*" is the baseUrl fallback tried for any other bare specifier.
+
+The affected set is the changed files plus everything that imports them,
+transitively; related tests are the test files in that set plus tests
+named after a changed file (foo.ts -> foo.test.ts). The persistent,
+incremental form of this graph is app/import_index.py.
+
+Env:
+  AIO_IMPORT_ALIASES : JSON {"prefix/": "dir relative to root"}; overrides tsconfig
+                       (default: tsconfig paths, else {"@/": "src"})
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from core.js_lexer import scan_files
+from core.walker import SOURCE_EXTS, walk_files
+
+RESOLVE_EXTS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+TEST_RE = re.compile(r"\.(test|spec)\.[cm]?[jt]sx?$", re.I)
+
+
+def is_test_file(path: Path) -> bool:
+    return bool(TEST_RE.search(path.name)) or "__tests__" in path.parts
+
+
+_JSONC_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|//[^\n]*|/\*.*?\*/', re.S)
+
+
+def _load_jsonc(text: str) -> Any:
+    """tsconfig flavour of JSON: comments and trailing commas allowed."""
+    text = _JSONC_TOKEN.sub(lambda m: m.group(0) if m.group(0).startswith('"') else "", text)
+    return json.loads(re.sub(r",(\s*[}\]])", r"\1", text))
+
+
+def aliases_from_tsconfig(root: Path) -> Dict[str, str]:
+    """compilerOptions.paths / baseUrl of <root>/tsconfig.json as an alias map ({} if none)."""
+    cfg_path = Path(root) / "tsconfig.json"
+    try:
+        opts = (_load_jsonc(cfg_path.read_text(encoding="utf-8")) or {}).get("compilerOptions") or {}
+    except (OSError, ValueError, AttributeError):
+        return {}
+    base = os.path.normpath(opts.get("baseUrl") or ".")
+    out: Dict[str, str] = {}
+    for key, targets in (opts.get("paths") or {}).items():
+        if not targets:
+            continue
+        target = os.path.normpath(os.path.join(base, targets[0]))
+        if key == "*":
+            continue  # handled by the baseUrl fallback below
+        if key.endswith("/*") and targets[0].endswith("/*"):
+            out[key[:-1]] = target[:-1].rstrip("/\\") if target.endswith("*") else target
+        else:
+            out[key] = target
+    if opts.get("baseUrl"):
+        out["*"] = base
+    return out
+
+
+def aliases_for(root: Path) -> Dict[str, str]:
+    try:
+        raw = json.loads(os.getenv("AIO_IMPORT_ALIASES", "") or "{}")
+    except ValueError:
+        raw = {}
+    if isinstance(raw, dict) and raw:
+        return raw
+    return aliases_from_tsconfig(root) or {"@/": "src"}
+
+
+def resolve_import(spec: str, importer: Path, root: Path, exists: Callable[[Path], bool],
+                   aliases: Optional[Dict[str, str]] = None) -> Optional[Path]:
+    """Absolute path `spec` refers to from `importer`, or None for packages / misses."""
+    aliases = aliases if aliases is not None else aliases_for(root)
+    if spec.startswith("./") or spec.startswith("../") or spec in (".", ".."):
+        bases = [importer.parent / spec]
+    else:
+        bases = [root / target / spec[len(key):] for key, target in aliases.items()
+                 if key != "*" and (spec.startswith(key) if key.endswith("/") else spec == key)]
+        if "*" in aliases:
+            bases.append(root / aliases["*"] / spec)
+    for base in bases:
+        hit = _probe(Path(os.path.normpath(base)), exists)
+        if hit is not None:
+            return hit
+    return None
+
+
+def _probe(base: Path, exists: Callable[[Path], bool]) -> Optional[Path]:
+    candidates = ([base] + [base.with_name(base.name + e) for e in RESOLVE_EXTS]
+                  + [base / f"index{e}" for e in RESOLVE_EXTS])
+    # "./x.js" written in TS sources that point at x.ts
+    if base.suffix in (".js", ".jsx"):
+        candidates += [base.with_suffix(e) for e in (".ts", ".tsx")]
+    for c in candidates:
+        if c.suffix and exists(c):
+            return c
+    return None
+
+
+@dataclass
+class ImportGraph:
+    root: Path
+    imports: Dict[Path, Set[Path]] = field(default_factory=dict)     # module -> modules it imports
+    importers: Dict[Path, Set[Path]] = field(default_factory=dict)   # module -> modules importing it
+
+    @classmethod
+    def from_specifiers(cls, root: Path, specs: Dict[Path, Iterable[str]],
+                        aliases: Optional[Dict[str, str]] = None) -> "ImportGraph":
+        root = Path(root).resolve()
+        aliases = aliases if aliases is not None else aliases_for(root)
+        known = set(specs)
+        g = cls(root)
+        for mod, mod_specs in specs.items():
+            deps = {d for d in (resolve_import(s, mod, root, known.__contains__, aliases) for s in mod_specs) if d}
+            g.imports[mod] = deps
+            for d in deps:
+                g.importers.setdefault(d, set()).add(mod)
+        return g
+
+    @classmethod
+    def build(cls, root: Path, aliases: Optional[Dict[str, str]] = None) -> "ImportGraph":
+        """Full scan of the source files under `root`."""
+        root = Path(root).resolve()
+        files = [e.path.resolve() for e in walk_files([root], exts=SOURCE_EXTS)]
+        aliases = aliases if aliases is not None else aliases_for(root)
+        return cls.from_specifiers(root, {p: f.imports for p, f in scan_files(files).items()}, aliases)
+
+    @property
+    def modules(self) -> List[Path]:
+        return sorted(self.imports)
+
+    def affected(self, changed: Iterable[Path]) -> Set[Path]:
+        """`changed` plus every module that (transitively) imports one of them."""
+        seen: Set[Path] = set()
+        todo = [Path(c).resolve() for c in changed]
+        while todo:
+            m = todo.pop()
+            if m in seen:
+                continue
+            seen.add(m)
+            todo.extend(self.importers.get(m, ()))
+        return seen
+
+    def related_tests(self, changed: Iterable[Path]) -> List[Path]:
+        changed = [Path(c).resolve() for c in changed]
+        tests = {m for m in self.affected(changed) if is_test_file(m) and m in self.imports}
+        stems = {(c.parent, c.name.split(".")[0]) for c in changed}
+        for m in self.imports:
+            if is_test_file(m):
+                stem = m.name.split(".")[0]
+                if (m.parent, stem) in stems or (m.parent.parent, stem) in stems:  # foo.ts <- __tests__/foo.test.ts
+                    tests.add(m)
+        return sorted(tests)
@@ -0,0 +1,136 @@
+"""
+Path: core/chunking.py
+Token-budgeted splitting of JS/TS sources at declaration boundaries.
+
+Boundaries come from the js_lexer token stream: a new top-level segment
+starts after a `;` or `}` that returns to depth 0, or at a declaration
+keyword (import/export/function/class/const/...) at depth 0 (covers
+semicolon-less code). Segments start at a line start, so leading comments
+and JSDoc stay with the declaration they describe. Segments are packed
+greedily into chunks under the token budget; a single declaration larger
+than the budget is split at line boundaries.
+
+Token counts use tiktoken (cl100k_base) when installed, else ~4 chars per
+token.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from core.js_lexer import tokenize
+
+try:
+    import tiktoken
+    _ENC = tiktoken.get_encoding("cl100k_base")
+except Exception:  # pragma: no cover - optional dependency
+    _ENC = None
+
+_DECL_START = frozenset({
+    "import", "export", "function", "class", "const", "let", "var", "interface",
+    "type", "enum", "async", "abstract", "declare", "namespace", "module", "@",
+})
+_OPEN = frozenset({"{", "(", "["})
+_CLOSE = frozenset({"}", ")", "]"})
+
+
+def count_tokens(text: str) -> int:
+    if _ENC is not None:
+        return len(_ENC.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+@dataclass(frozen=True)
+class Chunk:
+    index: int
+    start_line: int  # 1-based, inclusive
+    end_line: int    # 1-based, inclusive
+    text: str
+    tokens: int
+
+
+def boundaries(text: str) -> List[int]:
+    """Char offsets (line starts) where a top-level segment may begin; always includes 0."""
+    spans: List[int] = []
+    toks = tokenize(text, spans)
+    out = [0]
+    depth = 0
+    prev_kind, prev_val, prev_start = "", "", 0
+    for (kind, val), start in zip(toks, spans):
+        if depth == 0 and prev_kind:
+            after_stmt = prev_kind == "punct" and prev_val in (";", "}")
+            # only single-line previous tokens, so the newline search cannot land inside a literal
+            new_decl = val in _DECL_START and prev_kind in ("id", "num", "punct", "regex")
+            if after_stmt or new_decl:
+                nl = text.find("\n", prev_start, start)
+                if nl != -1:
+                    cut = nl + 1
+                    # blank lines stay with the previous segment
+                    while True:
+                        nxt = text.find("\n", cut, start)
+                        if nxt == -1 or text[cut:nxt].strip():
+                            break
+                        cut = nxt + 1
+                    if cut > out[-1]:
+                        out.append(cut)
+        if kind == "punct":
+            if val in _OPEN:
+                depth += 1
+            elif val in _CLOSE and depth:
+                depth -= 1
+        prev_kind, prev_val, prev_start = kind, val, start
+    return out
+
+
+def _line_split(text: str, budget: int, count: Callable[[str], int]) -> List[str]:
+    parts: List[str] = []
+    cur: List[str] = []
+    used = 0
+    for line in text.splitlines(keepends=True):
+        n = count(line)
+        if cur and used + n > budget:
+            parts.append("".join(cur))
+            cur, used = [], 0
+        cur.append(line)
+        used += n
+    if cur:
+        parts.append("".join(cur))
+    return parts
+
+
+def split_source(text: str, budget: int, count: Optional[Callable[[str], int]] = None) -> List[Chunk]:
+    """Chunks of `text`, each at most `budget` tokens unless a single line is larger."""
+    count = count or count_tokens
+    if not text:
+        return []
+    cuts = boundaries(text) + [len(text)]
+    segments: List[str] = []
+    for a, b in zip(cuts, cuts[1:]):
+        seg = text[a:b]
+        if count(seg) > budget:
+            segments.extend(_line_split(seg, budget, count))
+        elif seg:
+            segments.append(seg)
+
+    chunks: List[Chunk] = []
+    cur: List[str] = []
+    used = 0
+    line = 1
+
+    def flush() -> None:
+        nonlocal cur, used, line
+        body = "".join(cur)
+        lines = body.count("\n") + (0 if body.endswith("\n") else 1)
+        chunks.append(Chunk(len(chunks), line, line + lines - 1, body, used))
+        line += body.count("\n")
+        cur, used = [], 0
+
+    for seg in segments:
+        n = count(seg)
+        if cur and used + n > budget:
+            flush()
+        cur.append(seg)
+        used += n
+    if cur:
+        flush()
+    return chunks
@@ -0,0 +1,129 @@
+"""
+Path: core/dag.py
+Tiny dependency-aware step runner.
+
+Steps name their dependencies; every step whose dependencies have finished
+is started at once on a thread pool, so wall time tracks the critical path
+instead of the sum of all steps. Each step receives the results of its
+dependencies as {dep_name: result}. Per-step start/end offsets are recorded.
+
+A failing step stops new steps from being scheduled; steps already running
+finish, then the first error is re-raised.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Step:
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+
+
+@dataclass
+class StepTiming:
+    start_ms: float
+    end_ms: float = 0.0
+    ok: bool = True
+
+    @property
+    def ms(self) -> float:
+        return round(self.end_ms - self.start_ms, 2)
+
+
+@dataclass
+class DagRun:
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, StepTiming] = field(default_factory=dict)
+    total_ms: float = 0.0
+
+    def timings_ms(self) -> Dict[str, float]:
+        return {name: t.ms for name, t in self.timings.items()}
+
+
+def _check(steps: Sequence[Step]) -> Dict[str, Step]:
+    by_name: Dict[str, Step] = {}
+    for s in steps:
+        if s.name in by_name:
+            raise ValueError(f"duplicate step {s.name!r}")
+        by_name[s.name] = s
+    for s in steps:
+        missing = [d for d in s.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"step {s.name!r} depends on unknown {missing}")
+    # Kahn: every step must be reachable in topological order
+    indeg = {s.name: len(s.deps) for s in steps}
+    ready = [n for n, d in indeg.items() if d == 0]
+    seen = 0
+    while ready:
+        n = ready.pop()
+        seen += 1
+        for s in steps:
+            if n in s.deps:
+                indeg[s.name] -= 1
+                if indeg[s.name] == 0:
+                    ready.append(s.name)
+    if seen != len(steps):
+        raise ValueError("step graph has a cycle")
+    return by_name
+
+
+def run_dag(steps: Sequence[Step], max_workers: Optional[int] = None) -> DagRun:
+    """Run `steps` respecting dependencies; returns results and timings."""
+    by_name = _check(steps)
+    run = DagRun()
+    t0 = time.perf_counter()
+
+    def now_ms() -> float:
+        return round((time.perf_counter() - t0) * 1000.0, 2)
+
+    pending = dict(by_name)
+    running: Dict[Future, str] = {}
+    error: Optional[BaseException] = None
+
+    def _start(ex: ThreadPoolExecutor) -> None:
+        for name in [n for n, s in pending.items() if all(d in run.results for d in s.deps)]:
+            s = pending.pop(name)
+            inputs = {d: run.results[d] for d in s.deps}
+            run.timings[name] = StepTiming(now_ms())
+            running[ex.submit(s.fn, inputs)] = name
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(1, len(steps)), thread_name_prefix="dag") as ex:
+        _start(ex)
+        while running:
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                timing = run.timings[name]
+                timing.end_ms = now_ms()
+                try:
+                    run.results[name] = fut.result()
+                except BaseException as e:  # noqa: BLE001 - re-raised below
+                    timing.ok = False
+                    error = error or e
+            if error is None:
+                _start(ex)
+    run.total_ms = now_ms()
+    if error is not None:
+        raise error
+    return run
+
+
+def critical_path(steps: Sequence[Step], run: DagRun) -> List[str]:
+    """Longest chain of step names by recorded duration (for reporting)."""
+    by_name = _check(steps)
+    best: Dict[str, Tuple[float, List[str]]] = {}
+
+    def walk(name: str) -> Tuple[float, List[str]]:
+        if name not in best:
+            dep = max((walk(d) for d in by_name[name].deps), default=(0.0, []), key=lambda x: x[0])
+            t = run.timings.get(name)
+            best[name] = (dep[0] + (t.ms if t else 0.0), dep[1] + [name])
+        return best[name]
+
+    return max((walk(n) for n in by_name), key=lambda x: x[0], default=(0.0, []))[1]
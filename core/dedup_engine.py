@@ -0,0 +1,120 @@
+"""
+Path: core/dedup_engine.py
+Content-based duplicate detection with staged hashing.
+
+Files are bucketed by size first; only buckets with more than one member are
+hashed on their first 4 KB, and only head-hash collisions of files larger than
+the head are hashed in full. The expensive full read therefore happens just
+for real collision candidates. Hashing runs on core.hashing's thread pool.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .hashing import hash_files
+
+HEAD_BYTES = 4096
+
+
+@dataclass
+class ContentGroup:
+    size: int
+    digest: Optional[str]          # None for files that were never hashed (unique size)
+    paths: List[Path] = field(default_factory=list)
+
+    @property
+    def is_duplicate(self) -> bool:
+        return len(self.paths) > 1
+
+
+@dataclass
+class DedupStats:
+    files: int = 0
+    size_buckets: int = 0
+    head_hashed: int = 0
+    full_hashed: int = 0
+    groups: int = 0
+    duplicate_groups: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.__dict__)
+
+
+def _split(paths: List[Path], digests: Dict) -> Dict[Optional[str], List[Path]]:
+    out: Dict[Optional[str], List[Path]] = defaultdict(list)
+    for p in paths:
+        out[digests.get(p)].append(p)
+    return out
+
+
+def group_by_content(
+    entries: Iterable[Tuple[Path, int]],
+    head_bytes: int = HEAD_BYTES,
+    algo: str = "sha1",
+    workers: Optional[int] = None,
+) -> Tuple[List[ContentGroup], DedupStats]:
+    """
+    Partition (path, size) entries into groups of byte-identical files.
+    Every input path lands in exactly one group (unique files form singletons).
+    Unreadable files are kept as singletons rather than merged.
+    """
+    stats = DedupStats()
+    by_size: Dict[int, List[Path]] = defaultdict(list)
+    for p, size in entries:
+        by_size[int(size)].append(Path(p))
+        stats.files += 1
+    stats.size_buckets = len(by_size)
+
+    groups: List[ContentGroup] = []
+    head_candidates: List[Path] = []
+    for size, paths in by_size.items():
+        if len(paths) == 1:
+            groups.append(ContentGroup(size, None, paths))
+        elif size == 0:
+            groups.append(ContentGroup(0, "empty", paths))
+        else:
+            head_candidates.extend(paths)
+
+    # stage 2: first `head_bytes` of every size collision
+    heads = hash_files(head_candidates, algo, max_bytes=head_bytes, workers=workers)
+    stats.head_hashed = len(head_candidates)
+
+    full_candidates: List[Path] = []
+    staged: List[Tuple[int, List[Path]]] = []
+    for size, paths in by_size.items():
+        if len(paths) < 2 or size == 0:
+            continue
+        for digest, members in _split(paths, heads).items():
+            if digest is None:
+                groups.extend(ContentGroup(size, None, [m]) for m in members)
+            elif len(members) == 1:
+                groups.append(ContentGroup(size, None, members))
+            elif size <= head_bytes:
+                # head covered the whole file: the head hash is the content hash
+                groups.append(ContentGroup(size, digest, members))
+            else:
+                staged.append((size, members))
+                full_candidates.extend(members)
+
+    # stage 3: full content hash only for head collisions
+    fulls = hash_files(full_candidates, algo, workers=workers)
+    stats.full_hashed = len(full_candidates)
+    for size, members in staged:
+        for digest, same in _split(members, fulls).items():
+            if digest is None:
+                groups.extend(ContentGroup(size, None, [m]) for m in same)
+            else:
+                groups.append(ContentGroup(size, digest if len(same) > 1 else None, same))
+
+    stats.groups = len(groups)
+    stats.duplicate_groups = sum(1 for g in groups if g.is_duplicate)
+    return groups, stats
+
+
+def choose_keeper(paths: List[Path], rank: Callable[[Path], Tuple]) -> Tuple[Path, List[Path]]:
+    """Split a group into (keeper, discarded) using the caller's ranking key."""
+    ordered = sorted(paths, key=rank)
+    return ordered[0], ordered[1:]
@@ -0,0 +1,153 @@
+"""
+Path: core/dispatch.py
+Bounded parallel map with per-item isolation and timeouts.
+
+Every item runs in its own worker (a daemon thread or a child process), at
+most `workers` at a time. An item that exceeds `timeout` seconds is recorded
+as timed out and its slot is handed to the next item: child processes are
+terminated, threads are abandoned (they cannot be killed, but no longer hold
+up the batch). Results come back in input order, one Outcome per item;
+exceptions are captured, never raised.
+
+Process mode needs a picklable (module-level) `fn` and picklable results;
+a result that cannot be pickled, or a child that exits without reporting,
+is recorded as that item's error.
+
+Env:
+  AIO_MAX_WORKERS      : default worker count (default 8; see core.config.Settings)
+  AIO_DISPATCH_MODE    : "thread" (default) | "process"
+  AIO_DISPATCH_TIMEOUT : per-item timeout in seconds (default 0 = none)
+"""
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import pickle
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+MODES = ("thread", "process")
+
+
+@dataclass
+class Outcome:
+    index: int
+    item: Any
+    ok: bool
+    value: Any = None
+    error: str = ""
+    timed_out: bool = False
+    ms: float = 0.0
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)) or default)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)) or default)
+    except ValueError:
+        return default
+
+
+def default_workers() -> int:
+    return max(1, _env_int("AIO_MAX_WORKERS", 8))
+
+
+def _call(fn: Callable[[Any], Any], index: int, item: Any, out: Any, encode: bool = False) -> None:
+    # encode (process mode): pickle here so an unpicklable result becomes the
+    # item's error instead of dying silently in the queue's feeder thread
+    try:
+        value = fn(item)
+        out.put((index, True, pickle.dumps(value) if encode else value, ""))
+    except BaseException as e:  # noqa: BLE001 - reported as the item's error
+        try:
+            out.put((index, False, None, f"{e.__class__.__name__}: {e}"))
+        except Exception:
+            pass
+
+
+def _start(mode: str, fn: Callable[[Any], Any], index: int, item: Any, out: Any) -> Any:
+    if mode == "process":
+        w = mp.Process(target=_call, args=(fn, index, item, out, True), daemon=True, name=f"dispatch-{index}")
+    else:
+        w = threading.Thread(target=_call, args=(fn, index, item, out), daemon=True, name=f"dispatch-{index}")
+    w.start()
+    return w
+
+
+def _stop(w: Any) -> None:
+    if isinstance(w, mp.Process):
+        w.terminate()
+        w.join(1.0)
+        if w.is_alive():
+            w.kill()
+
+
+def dispatch(fn: Callable[[Any], Any], items: Sequence[Any], *,
+             workers: Optional[int] = None, mode: Optional[str] = None,
+             timeout: Optional[float] = None,
+             on_done: Optional[Callable[[Outcome], None]] = None) -> List[Outcome]:
+    """Run fn(item) for every item; returns Outcomes in input order."""
+    mode = (mode or os.getenv("AIO_DISPATCH_MODE", "thread")).strip().lower()
+    if mode not in MODES:
+        raise ValueError(f"dispatch mode must be one of {MODES}, got {mode!r}")
+    workers = max(1, workers or default_workers())
+    timeout = timeout if timeout is not None else _env_float("AIO_DISPATCH_TIMEOUT", 0.0)
+    out: Any = mp.Queue() if mode == "process" else queue.Queue()
+
+    results: List[Optional[Outcome]] = [None] * len(items)
+    running: Dict[int, Tuple[Any, float]] = {}  # index -> (worker, started)
+    nxt = 0
+
+    def _finish(o: Outcome) -> None:
+        results[o.index] = o
+        if on_done:
+            on_done(o)
+
+    while nxt < len(items) or running:
+        while nxt < len(items) and len(running) < workers:
+            running[nxt] = (_start(mode, fn, nxt, items[nxt], out), time.perf_counter())
+            nxt += 1
+
+        now = time.perf_counter()
+        wait_s = 0.5
+        if timeout and timeout > 0:
+            wait_s = max(0.0, min(started + timeout for _, started in running.values()) - now)
+        try:
+            index, ok, value, error = out.get(timeout=wait_s)
+        except queue.Empty:
+            index = None
+        now = time.perf_counter()
+
+        if index is not None and index in running:
+            w, started = running.pop(index)
+            if mode == "process":
+                w.join(1.0)
+                if ok:
+                    try:
+                        value = pickle.loads(value)
+                    except Exception as e:
+                        ok, value, error = False, None, f"result could not be unpickled: {e.__class__.__name__}: {e}"
+            _finish(Outcome(index, items[index], ok, value, error, ms=round((now - started) * 1000.0, 2)))
+
+        for i, (w, started) in list(running.items()):
+            if timeout and timeout > 0 and now - started >= timeout:
+                running.pop(i)
+                _stop(w)
+                _finish(Outcome(i, items[i], False, error=f"timed out after {timeout:g}s", timed_out=True,
+                                ms=round((now - started) * 1000.0, 2)))
+            elif mode == "process" and not w.is_alive() and out.empty():
+                # child died without reporting (segfault, os._exit, OOM kill, sys.exit(0) in fn)
+                running.pop(i)
+                _finish(Outcome(i, items[i], False, error=f"worker exited with code {w.exitcode} without a result",
+                                ms=round((now - started) * 1000.0, 2)))
+
+    return [o for o in results if o is not None]
@@ -0,0 +1,214 @@
+"""
+Path: core/gate_cache.py
+Gate result cache keyed by an input fingerprint.
+
+fingerprint() hashes everything a build/test/lint run depends on:
+- the source tree (path + content sha1 of every source / config file under
+  the project, node_modules and build output excluded),
+- the lockfile(s),
+- tooling versions (node, npm or the configured npm binary),
+- the gate command lines and mode.
+Content hashes are memoised by (path, size, mtime_ns), so an unchanged tree
+is fingerprinted from stat() calls alone.
+
+A hit returns the stored per-step results; callers mark them cached and
+skip running the gates. Only all-green runs are stored, so a failure is
+always re-run rather than replayed. Entries are evicted by age and by count (least
+recently used first).
+
+Env:
+  AIO_GATE_CACHE              : SQLite path (default reports/gate_cache.sqlite); "0"/"off" disables
+  AIO_GATE_CACHE_MAX_AGE_DAYS : drop entries unused for this long (default 14)
+  AIO_GATE_CACHE_MAX_ENTRIES  : keep at most this many entries (default 200)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.hashing import hash_files
+from core.walker import SOURCE_EXTS, walk_files
+
+DEFAULT_DB = Path("reports") / "gate_cache.sqlite"
+LOCKFILES = ("package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml", "bun.lockb")
+CONFIG_EXTS = frozenset({".json", ".cjs", ".mjs", ".yaml", ".yml", ".css", ".scss", ".html", ".svg"})
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def cache_path_from_env() -> Optional[Path]:
+    raw = os.getenv("AIO_GATE_CACHE", "").strip()
+    if raw.lower() in {"0", "off", "false", "no"}:
+        return None
+    return Path(raw) if raw else DEFAULT_DB
+
+
+def tool_versions(bins: Sequence[str] = ("node", "npm")) -> Dict[str, str]:
+    out: Dict[str, str] = {}
+    for b in bins:
+        try:
+            p = subprocess.run([b, "--version"], capture_output=True, text=True, timeout=30, check=False)
+            out[b] = (p.stdout or p.stderr).strip() if p.returncode == 0 else f"exit {p.returncode}"
+        except (OSError, subprocess.SubprocessError):
+            out[b] = "missing"
+    return out
+
+
+class GateCache:
+    def __init__(self, db_path: Path, max_age_s: Optional[float] = None, max_entries: Optional[int] = None) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age_s = float(max_age_s if max_age_s is not None
+                               else _env_float("AIO_GATE_CACHE_MAX_AGE_DAYS", 14) * 86400)
+        self.max_entries = int(max_entries if max_entries is not None
+                               else _env_float("AIO_GATE_CACHE_MAX_ENTRIES", 200))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key        TEXT PRIMARY KEY,
+                    run_id     TEXT,
+                    steps      TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    used_at    REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_used ON entries(used_at);
+                CREATE TABLE IF NOT EXISTS file_hashes (
+                    path     TEXT PRIMARY KEY,
+                    size     INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    sha1     TEXT NOT NULL
+                );
+                """
+            )
+        self.evict()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---- fingerprint --------------------------------------------------------
+    def _content_hashes(self, files: List[Tuple[Path, int, int]]) -> Dict[str, str]:
+        """path -> sha1, re-hashing only files whose (size, mtime_ns) changed."""
+        with self._lock:
+            known = {r[0]: (r[1], r[2], r[3]) for r in self._conn.execute(
+                "SELECT path, size, mtime_ns, sha1 FROM file_hashes")}
+        out: Dict[str, str] = {}
+        stale: List[Tuple[Path, int, int]] = []
+        for p, size, mtime in files:
+            k = known.get(str(p))
+            if k and k[0] == size and k[1] == mtime:
+                out[str(p)] = k[2]
+            else:
+                stale.append((p, size, mtime))
+        if stale:
+            fresh = hash_files([p for p, _s, _m in stale])
+            rows = []
+            for p, size, mtime in stale:
+                digest = fresh.get(p) or "unreadable"
+                out[str(p)] = digest
+                rows.append((str(p), size, mtime, digest))
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO file_hashes(path, size, mtime_ns, sha1) VALUES (?,?,?,?)", rows)
+        return out
+
+    def fingerprint(self, root: Path, commands: Dict[str, Any], tools: Optional[Dict[str, str]] = None,
+                    extra: Optional[Dict[str, Any]] = None) -> str:
+        root = Path(root).resolve()
+        exts = set(SOURCE_EXTS) | CONFIG_EXTS
+        entries = walk_files([root], exts=exts, skip_file=lambda name: name in LOCKFILES)
+        files = sorted((e.path.resolve(), e.size, e.mtime_ns) for e in entries)
+        locks = []
+        for name in LOCKFILES:
+            p = root / name
+            if p.is_file():
+                st = p.stat()
+                locks.append((p.resolve(), st.st_size, st.st_mtime_ns))
+        digests = self._content_hashes(files + locks)
+        h = hashlib.sha256()
+        for p, _s, _m in files + locks:
+            h.update(os.path.relpath(p, root).replace(os.sep, "/").encode("utf-8"))
+            h.update(b"\0" + digests[str(p)].encode("ascii") + b"\n")
+        h.update(json.dumps({"commands": commands, "tools": tools or {}, "extra": extra or {}},
+                            sort_keys=True, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+    # ---- entries ------------------------------------------------------------
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """{"run_id", "steps", "created_at"} for `key`, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT run_id, steps, created_at FROM entries WHERE key=?", (key,)).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE entries SET used_at=? WHERE key=?", (time.time(), key))
+        return {"run_id": row[0], "steps": json.loads(row[1]), "created_at": row[2]}
+
+    def put(self, key: str, run_id: str, steps: Dict[str, Any]) -> bool:
+        """
+        Store `steps` under `key` if every step passed. A failure may be flaky
+        (a test, a network hiccup), so it is never replayed; returns whether
+        the entry was stored.
+        """
+        if not steps or not all(step.get("pass") for step in steps.values()):
+            return False
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries(key, run_id, steps, created_at, used_at) VALUES (?,?,?,?,?)",
+                (key, run_id, json.dumps(steps, default=str), now, now))
+        self.evict()
+        return True
+
+    def evict(self) -> int:
+        with self._lock, self._conn:
+            dropped = self._conn.execute("DELETE FROM entries WHERE used_at<?",
+                                         (time.time() - self.max_age_s,)).rowcount
+            dropped += self._conn.execute(
+                "DELETE FROM entries WHERE key NOT IN (SELECT key FROM entries ORDER BY used_at DESC LIMIT ?)",
+                (max(0, self.max_entries),)).rowcount
+            return dropped
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            n = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            f = self._conn.execute("SELECT COUNT(*) FROM file_hashes").fetchone()[0]
+        return {"entries": int(n), "hashed_files": int(f)}
+
+
+_OPEN: Dict[str, GateCache] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def open_cache(db_path: Optional[Path] = None) -> Optional[GateCache]:
+    """Process-wide GateCache for `db_path` (or the env default); None when disabled."""
+    path = db_path or cache_path_from_env()
+    if path is None:
+        return None
+    key = str(Path(path).resolve())
+    with _OPEN_LOCK:
+        cache = _OPEN.get(key)
+        if cache is None:
+            try:
+                cache = GateCache(Path(path))
+            except sqlite3.Error:
+                return None
+            _OPEN[key] = cache
+        return cache
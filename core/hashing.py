@@ -0,0 +1,122 @@
+"""
+Path: core/hashing.py
+Content hashing engine shared by ops, inventory and snapshot tooling.
+
+- Small files are hashed from a single read(); large files are memory-mapped
+  and fed to hashlib in big slices (hashlib drops the GIL for large buffers,
+  so a thread pool scales across cores and disks).
+- hash_file()   : one file, raises OSError on failure.
+- iter_hashes() : streaming batch API; yields (path, digest|None) as files finish,
+                  with a bounded number of in-flight jobs so huge listings stay lazy.
+- hash_files()  : batch API; returns {path: digest|None} for the whole input.
+
+Env:
+  AIO_HASH_WORKERS : default thread count (default min(32, cpu + 4))
+"""
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+PathLike = Union[str, Path]
+
+SMALL_FILE_BYTES = 1 << 20       # <= 1 MiB: one read() call
+MMAP_SLICE_BYTES = 16 << 20      # feed mmaps to hashlib 16 MiB at a time
+
+
+def default_workers() -> int:
+    raw = os.getenv("AIO_HASH_WORKERS", "").strip()
+    if raw:
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            pass
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def hash_bytes(data: bytes, algo: str = "sha1") -> str:
+    return hashlib.new(algo, data).hexdigest()
+
+
+def hash_file(path: PathLike, algo: str = "sha1", max_bytes: Optional[int] = None) -> str:
+    """
+    Hex digest of a file (or of its first `max_bytes` bytes).
+    Raises OSError if the file cannot be read.
+    """
+    h = hashlib.new(algo)
+    with open(path, "rb") as f:
+        if max_bytes is not None:
+            h.update(f.read(max_bytes))
+            return h.hexdigest()
+        size = os.fstat(f.fileno()).st_size
+        if size <= SMALL_FILE_BYTES:
+            h.update(f.read())
+            # Why: file may have grown between fstat and read; finish it off.
+            for chunk in iter(lambda: f.read(SMALL_FILE_BYTES), b""):
+                h.update(chunk)
+            return h.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for off in range(0, len(view), MMAP_SLICE_BYTES):
+                    h.update(view[off:off + MMAP_SLICE_BYTES])
+            finally:
+                view.release()
+    return h.hexdigest()
+
+
+def _safe_hash(path: PathLike, algo: str, max_bytes: Optional[int]) -> Optional[str]:
+    try:
+        return hash_file(path, algo, max_bytes)
+    except (OSError, ValueError):
+        return None
+
+
+def iter_hashes(
+    paths: Iterable[PathLike],
+    algo: str = "sha1",
+    max_bytes: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[PathLike, Optional[str]]]:
+    """
+    Hash many files on a thread pool, yielding (path, digest) in completion
+    order. Unreadable files yield None. Input is consumed lazily.
+    """
+    n = default_workers() if workers is None else max(1, int(workers))
+    if n <= 1:
+        for p in paths:
+            yield p, _safe_hash(p, algo, max_bytes)
+        return
+
+    limit = n * 4
+    with ThreadPoolExecutor(max_workers=n) as ex:
+        pending: Dict[Future, PathLike] = {}
+        it = iter(paths)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < limit:
+                try:
+                    p = next(it)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[ex.submit(_safe_hash, p, algo, max_bytes)] = p
+            if not pending:
+                break
+            done: Set[Future] = wait(pending, return_when=FIRST_COMPLETED)[0]
+            for fut in done:
+                yield pending.pop(fut), fut.result()
+
+
+def hash_files(
+    paths: Iterable[PathLike],
+    algo: str = "sha1",
+    max_bytes: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[PathLike, Optional[str]]:
+    """Batch form of iter_hashes(): {path: digest or None}."""
+    return dict(iter_hashes(paths, algo=algo, max_bytes=max_bytes, workers=workers))
@@ -0,0 +1,414 @@
+"""
+Path: core/js_lexer.py
+Single-pass JS/TS/JSX tokenizer and declaration extractor (no Node needed).
+
+The tokenizer skips whitespace, comments, string / template / regex literals
+(regex vs division is decided from the previous significant token, template
+`${...}` holes are tokenized as code). A second pass over the token list
+collects:
+
+- functions : function declarations, function-valued bindings
+              (`const X = () =>`, `= function`, `= memo(() => ...)`) and
+              class methods as "Class.method"
+- classes, exports (names; "default" for default exports), imports
+  (module specifiers from import / export-from / require / import())
+- has_jsx   : JSX element or fragment in expression position (never for .ts;
+              `<T,>(x: T) =>` type parameters in .tsx do not count)
+
+scan_sources() / scan_files() are the batch API; large batches fan out to a
+process pool (the lexer is CPU-bound Python), created once per process and
+reused across calls.
+
+Env:
+  AIO_LEX_WORKERS : processes for batch scans (default cpu count; 1 = in-process)
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+Token = Tuple[str, str]  # (kind, value); kind in id/num/str/tpl/regex/punct
+
+# leading whitespace/comments are folded into every token match (one match per token)
+_TOKEN_RE = re.compile(
+    r"""
+    (?:\s+|//[^\n]*|/\*.*?(?:\*/|\Z))*
+    (?:
+     (?P<id>[A-Za-z_$\u0080-\uffff][\w$\u0080-\uffff]*)
+    |(?P<punct>=>|\.\.\.|\?\?=?|\?\.|&&=?|\|\|=?|[=!]={0,2}|\*\*=?|\+\+|--|<<=?|>>>?=?|[<>]=?|[-+*%&|^]=?|[{}()\[\];,.:?~@\#\\])
+    |(?P<str>"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?)
+    |(?P<num>\.?\d[\w.]*)
+    |(?P<slash>/=?)
+    |(?P<tick>`)
+    )
+    """,
+    re.X | re.S,
+)
+_SKIP_RE = re.compile(r"(?:\s+|//[^\n]*|/\*.*?(?:\*/|\Z))*", re.S)
+_REGEX_RE = re.compile(r"/(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[A-Za-z]*")
+_TEMPLATE_RE = re.compile(r"(?:\\.|\$(?!\{)|[^`\\$])*", re.S)
+
+# after these identifiers a "/" starts a regex literal
+_REGEX_AFTER_KW = frozenset({
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+    "throw", "case", "do", "else", "yield", "await",
+})
+_NO_REGEX_AFTER_PUNCT = frozenset({")", "]", "}", "++", "--", "<"})  # "<" : JSX closing tag
+
+# tokens after which "<" opens JSX
+_JSX_AFTER = frozenset({
+    "(", ",", "=", ":", "?", "{", "[", "&&", "||", "??", "=>", "return",
+    "default", "yield", "await", "<START>",
+})
+_NOT_METHOD = frozenset({
+    "if", "for", "while", "switch", "catch", "with", "return", "function", "super", "new", "typeof",
+})
+_METHOD_PREFIX = frozenset({
+    ";", "{", "}", "static", "async", "get", "set", "*", "public", "private",
+    "protected", "readonly", "override", "abstract",
+})
+_DECL_AFTER_EXPORT = frozenset({"function", "class", "const", "let", "var", "interface", "type", "enum", "abstract"})
+
+
+def tokenize(text: str, spans: Optional[List[int]] = None) -> List[Token]:
+    """
+    Significant tokens of `text` (comments and whitespace dropped). If
+    `spans` is given, the start offset of every token is appended to it.
+    """
+    out: List[Token] = []
+    append = out.append
+    mark = spans.append if spans is not None else None
+    stack: List[str] = []   # "{" or "tpl" per open brace
+    pos, n = 0, len(text)
+    prev_kind, prev_val = "", ""
+    match = _TOKEN_RE.match
+    while pos < n:
+        m = match(text, pos)
+        if m is None:
+            # trailing comments/whitespace, or a character no token starts with
+            pos = _SKIP_RE.match(text, pos).end() + 1
+            continue
+        kind = m.lastgroup
+        val = m.group(kind)
+        pos = m.end()
+        if mark is not None:
+            mark(m.start(kind))
+        if kind == "punct":
+            if val == "{":
+                stack.append("{")
+            elif val == "}" and stack and stack.pop() == "tpl":
+                kind = "tick"   # back inside a template after a ${...} hole
+        if kind == "tick":
+            end = _TEMPLATE_RE.match(text, pos).end()
+            if text.startswith("${", end):
+                stack.append("tpl")
+                pos = end + 2
+            else:
+                pos = end + 1
+            kind, val = "tpl", ""
+        elif kind == "slash":
+            regex_ok = (
+                prev_kind == ""
+                or (prev_kind == "punct" and prev_val not in _NO_REGEX_AFTER_PUNCT)
+                or (prev_kind == "id" and prev_val in _REGEX_AFTER_KW)
+            )
+            rm = _REGEX_RE.match(text, m.start(kind)) if regex_ok else None
+            if rm:
+                pos = rm.end()
+                kind, val = "regex", ""
+            else:
+                kind = "punct"
+        elif kind == "str":
+            val = val[1:-1] if len(val) > 1 and val[-1] == val[0] else val[1:]
+        append((kind, val))
+        prev_kind, prev_val = kind, val
+    return out
+
+
+@dataclass
+class JsFacts:
+    functions: List[str] = field(default_factory=list)
+    classes: List[str] = field(default_factory=list)
+    exports: List[str] = field(default_factory=list)
+    imports: List[str] = field(default_factory=list)
+    has_jsx: bool = False
+
+    @property
+    def default_export(self) -> bool:
+        return "default" in self.exports
+
+
+def _uniq(xs: Iterable[str]) -> List[str]:
+    seen: Dict[str, None] = {}
+    for x in xs:
+        seen.setdefault(x, None)
+    return list(seen)
+
+
+def _skip_balanced(toks: List[Token], i: int, open_: str, close: str) -> int:
+    """Index just past the bracket that closes toks[i] (== open_)."""
+    depth = 0
+    for j in range(i, len(toks)):
+        v = toks[j][1] if toks[j][0] == "punct" else ""
+        if v == open_:
+            depth += 1
+        elif v == close:
+            depth -= 1
+            if depth == 0:
+                return j + 1
+    return len(toks)
+
+
+def _arrow_ahead(toks: List[Token], j: int, limit: int = 64) -> bool:
+    """True if an `=>` follows at bracket depth 0 before `;` (covers return-type annotations)."""
+    depth = 0
+    for k in range(j, min(len(toks), j + limit)):
+        kind, v = toks[k]
+        if kind != "punct":
+            continue
+        if v in ("(", "[", "{", "<"):
+            depth += 1
+        elif v in (")", "]", "}", ">"):
+            depth -= 1
+            if depth < 0:
+                return False
+        elif v == "=>" and depth == 0:
+            return True
+        elif v == ";" and depth == 0:
+            return False
+    return False
+
+
+def _is_function_value(toks: List[Token], j: int) -> bool:
+    """Does the expression starting at toks[j] evaluate to a function?"""
+    n = len(toks)
+    if j < n and toks[j] == ("id", "async"):
+        j += 1
+    if j >= n:
+        return False
+    kind, v = toks[j]
+    if kind == "id" and v == "function":
+        return True
+    if kind == "id" and j + 1 < n and toks[j + 1] == ("punct", "=>"):
+        return True
+    if kind == "punct" and v == "<":           # generic arrow: <T,>(x) => ...
+        j = _skip_balanced(toks, j, "<", ">")
+        kind, v = toks[j] if j < n else ("", "")
+    if kind == "punct" and v == "(":
+        k = _skip_balanced(toks, j, "(", ")")
+        return k < n and (toks[k] == ("punct", "=>") or (toks[k] == ("punct", ":") and _arrow_ahead(toks, k + 1)))
+    if kind == "id":
+        # wrapper call: memo(() => ...), React.forwardRef(function ...), styled.div(...)
+        while j + 2 < n and toks[j + 1] == ("punct", ".") and toks[j + 2][0] == "id":
+            j += 2
+        if j + 1 < n and toks[j + 1] == ("punct", "("):
+            return _is_function_value(toks, j + 2)
+    return False
+
+
+def _type_params_ahead(toks: List[Token], i: int) -> bool:
+    """`<T,>` / `<T extends U>` at toks[i]: a TSX generic arrow's type parameters, not an element."""
+    if i + 2 >= len(toks) or toks[i + 1][0] != "id":
+        return False
+    after = toks[i + 2]
+    if after == ("punct", ","):
+        return True
+    # `<Foo extends="x">` is still JSX (an attribute named extends)
+    return after == ("id", "extends") and (i + 3 >= len(toks) or toks[i + 3] != ("punct", "="))
+
+
+def extract(toks: List[Token], jsx_allowed: bool = True) -> JsFacts:
+    """Collect declarations / exports / imports / JSX from a token list."""
+    facts = JsFacts()
+    fns, classes, exports, imports = facts.functions, facts.classes, facts.exports, facts.imports
+    n = len(toks)
+    braces: List[Optional[str]] = []      # class name for class-body braces, else None
+    pending_class: Optional[str] = None
+    prev: Token = ("punct", "<START>")
+
+    for i, (kind, v) in enumerate(toks):
+        nxt = toks[i + 1] if i + 1 < n else ("", "")
+        if kind == "punct":
+            if v == "{":
+                braces.append(pending_class)
+                pending_class = None
+            elif v == "}":
+                if braces:
+                    braces.pop()
+            elif v == "<" and jsx_allowed and not facts.has_jsx:
+                if prev[1] in _JSX_AFTER and (nxt[0] == "id" or nxt[1] == ">") and not _type_params_ahead(toks, i):
+                    facts.has_jsx = True
+            prev = (kind, v)
+            continue
+        if kind != "id":
+            if kind == "str" and prev == ("id", "from"):
+                imports.append(v)
+            prev = (kind, v)
+            continue
+        if prev == ("punct", ".") or prev == ("punct", "?."):
+            prev = (kind, v)
+            continue
+
+        if v == "function":
+            j = i + 1
+            if j < n and toks[j] == ("punct", "*"):
+                j += 1
+            if j < n and toks[j][0] == "id":
+                fns.append(toks[j][1])   # declarations and named function expressions
+        elif v == "class" and nxt[0] == "id" and nxt[1] not in ("extends", "implements"):
+            classes.append(nxt[1])
+            pending_class = nxt[1]
+        elif v == "class":
+            pending_class = "<anonymous>"
+        elif v in ("const", "let", "var") and nxt[0] == "id":
+            j = i + 2
+            if j < n and toks[j] == ("punct", ":"):
+                # skip a type annotation up to the initializer
+                depth = 0
+                while j < n:
+                    t = toks[j]
+                    if t[0] == "punct":
+                        if t[1] in ("<", "(", "[", "{"):
+                            depth += 1
+                        elif t[1] in (">", ")", "]", "}"):
+                            depth -= 1
+                        elif t[1] in ("=", ";") and depth <= 0:
+                            break
+                        elif t[1] == "=>" and depth <= 0:
+                            j += 1
+                            continue
+                    j += 1
+            if j < n and toks[j] == ("punct", "=") and _is_function_value(toks, j + 1):
+                fns.append(nxt[1])
+        elif v == "export":
+            j = i + 1
+            if nxt == ("id", "default"):
+                exports.append("default")
+            elif nxt == ("punct", "{"):
+                j += 1
+                while j < n and toks[j] != ("punct", "}"):
+                    if toks[j][0] == "id" and toks[j][1] != "type":
+                        name = toks[j][1]
+                        if j + 2 < n and toks[j + 1] == ("id", "as"):
+                            name = toks[j + 2][1]
+                            j += 2
+                        exports.append(name)
+                    j += 1
+            elif nxt == ("punct", "*"):
+                if j + 2 < n and toks[j + 1] == ("id", "as") and toks[j + 2][0] == "id":
+                    exports.append(toks[j + 2][1])
+                else:
+                    exports.append("*")
+            else:
+                while j < n and toks[j][1] in ("async", "declare", "abstract"):
+                    j += 1
+                if j < n and toks[j][1] in _DECL_AFTER_EXPORT:
+                    j += 1
+                    if j < n and toks[j] == ("punct", "*"):
+                        j += 1
+                    if j < n and toks[j][0] == "id":
+                        exports.append(toks[j][1])
+        elif v == "import":
+            if nxt == ("punct", "(") and i + 2 < n and toks[i + 2][0] == "str":
+                imports.append(toks[i + 2][1])
+            elif nxt[0] == "str":
+                imports.append(nxt[1])
+        elif v == "require" and nxt == ("punct", "(") and i + 2 < n and toks[i + 2][0] == "str":
+            imports.append(toks[i + 2][1])
+        elif braces and braces[-1] and v not in _NOT_METHOD:
+            # class body member: name( ... ) {  or  name = (...) =>
+            if prev[1] in _METHOD_PREFIX or prev == ("punct", "<START>"):
+                if nxt == ("punct", "(") or nxt == ("punct", "<"):
+                    fns.append(f"{braces[-1]}.{v}")
+                elif nxt == ("punct", "=") and _is_function_value(toks, i + 2):
+                    fns.append(f"{braces[-1]}.{v}")
+        prev = (kind, v)
+
+    facts.functions = _uniq(fns)
+    facts.classes = _uniq(classes)
+    facts.exports = _uniq(exports)
+    facts.imports = _uniq(imports)
+    return facts
+
+
+def scan_source(text: str, suffix: str = "") -> JsFacts:
+    """Lex + extract one source text; `suffix` (".ts" etc.) only gates JSX detection."""
+    return extract(tokenize(text), jsx_allowed=suffix.lower() != ".ts")
+
+
+def _scan_item(item: Tuple[str, str]) -> JsFacts:
+    return scan_source(item[0], item[1])
+
+
+def default_workers() -> int:
+    try:
+        return max(1, int(os.getenv("AIO_LEX_WORKERS", "") or (os.cpu_count() or 1)))
+    except ValueError:
+        return 1
+
+
+BATCH_MIN = 64  # below this a process pool costs more than it saves
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_SIZE = 0
+_POOL_LOCK = threading.Lock()
+
+
+def _shared_pool(n: int) -> ProcessPoolExecutor:
+    """Module-wide process pool, started once (spawn is expensive on Windows) and reused."""
+    global _POOL, _POOL_SIZE
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_SIZE != n:
+            if _POOL is None:
+                atexit.register(shutdown_pool)
+            else:
+                _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL, _POOL_SIZE = ProcessPoolExecutor(max_workers=n), n
+        return _POOL
+
+
+def shutdown_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def scan_sources(items: Sequence[Tuple[str, str]], workers: Optional[int] = None) -> List[JsFacts]:
+    """Batch scan_source() over (text, suffix) pairs; output order matches input."""
+    n = default_workers() if workers is None else max(1, int(workers))
+    if n <= 1 or len(items) < BATCH_MIN:
+        return [_scan_item(it) for it in items]
+    try:
+        ex = _shared_pool(n)
+        return list(ex.map(_scan_item, items, chunksize=max(8, len(items) // (n * 4))))
+    except Exception:
+        # Why: spawn can fail (frozen apps, missing __main__ guard) or a worker
+        # can die (BrokenProcessPool); drop the pool and stay correct.
+        shutdown_pool()
+        return [_scan_item(it) for it in items]
+
+
+def _read(path: Path) -> str:
+    try:
+        return path.read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return ""
+
+
+def scan_file(path: Path) -> JsFacts:
+    p = Path(path)
+    return scan_source(_read(p), p.suffix)
+
+
+def scan_files(paths: Iterable[Path], workers: Optional[int] = None) -> Dict[Path, JsFacts]:
+    plist = [Path(p) for p in paths]
+    facts = scan_sources([(_read(p), p.suffix) for p in plist], workers)
+    return dict(zip(plist, facts))
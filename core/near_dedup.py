@@ -0,0 +1,246 @@
+"""
+Path: core/near_dedup.py
+Near-duplicate clustering (MinHash + LSH) for JS/TS sources, in NumPy.
+
+Exact-match dedup (core.dedup_engine) cannot collapse copies that differ only
+in formatting, a header comment or a reshuffled import block. Here each file is
+normalized (comments dropped, whitespace ignored), split into k-token shingles,
+summarized by a MinHash signature, and bucketed with banded LSH. Bucket mates
+whose estimated Jaccard similarity clears the threshold are unioned into
+clusters. Signatures are computed for many files at once with
+np.minimum.reduceat, so hundreds of thousands of files take minutes; texts
+are streamed and each hash block is capped by bytes (block_bytes), so peak
+memory does not grow with the input.
+
+numpy is optional at import time; calling into the engine without it raises
+RuntimeError.
+"""
+from __future__ import annotations
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/|//[^\n]*", re.S)
+_TOKEN_RE = re.compile(r"[A-Za-z_$][\w$]*|\d+(?:\.\d+)?|\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'|`[^`]*`|\S")
+_MASK32 = 0xFFFFFFFF
+_SHINGLE_MULT = 0x100000001B3  # FNV-ish multiplier for the rolling k-gram hash
+
+
+@dataclass(frozen=True)
+class NearDupConfig:
+    num_perm: int = 128
+    bands: int = 16            # rows per band = num_perm // bands
+    shingle: int = 5           # tokens per shingle
+    threshold: float = 0.8     # min estimated Jaccard to join a cluster
+    seed: int = 1
+    batch_shingles: int = 0    # shingles hashed per NumPy block; 0 = derive from block_bytes
+    block_bytes: int = 64 << 20  # cap on the uint64 hash matrix per block
+
+    @property
+    def rows(self) -> int:
+        return self.num_perm // self.bands
+
+
+@dataclass
+class NearDupCluster:
+    representative: Path
+    members: List[Path] = field(default_factory=list)   # includes the representative
+    similarity: Dict[Path, float] = field(default_factory=dict)  # member -> est. Jaccard vs representative
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for near-duplicate clustering (pip install numpy)")
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Drop comments, then tokenize (whitespace and formatting vanish)."""
+    return _TOKEN_RE.findall(_COMMENT_RE.sub(" ", text))
+
+
+def _shingle_hashes(tokens: List[str], vocab: Dict[str, int], k: int):
+    """32-bit hashes of every k-token window (a single window for short files)."""
+    ids = np.fromiter((vocab.setdefault(t, len(vocab) + 1) for t in tokens), dtype=np.uint64, count=len(tokens))
+    if ids.size == 0:
+        return ids
+    k = min(k, int(ids.size))
+    n = ids.size - k + 1
+    h = np.zeros(n, dtype=np.uint64)
+    mult = np.uint64(_SHINGLE_MULT)
+    with np.errstate(over="ignore"):
+        for j in range(k):
+            h = h * mult + ids[j:j + n]
+    h ^= h >> np.uint64(32)
+    return np.unique(h & np.uint64(_MASK32))
+
+
+def _perm_params(cfg: NearDupConfig):
+    rng = np.random.default_rng(cfg.seed)
+    a = rng.integers(1, _MASK32, size=cfg.num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, _MASK32, size=cfg.num_perm, dtype=np.uint64)
+    return a, b
+
+
+def _block_budget(cfg: NearDupConfig) -> int:
+    """Shingles per NumPy block: caps the num_perm x S uint64 hash matrix at cfg.block_bytes."""
+    return cfg.batch_shingles or max(1, cfg.block_bytes // (8 * cfg.num_perm))
+
+
+def _min_hashes(xs, offsets, a, b, budget_bytes: int):
+    """[files, num_perm] minima for the packed shingles `xs`, in permutation chunks within budget."""
+    step = max(1, budget_bytes // (8 * max(1, int(xs.size))))
+    out = np.empty((len(offsets), a.size), dtype=np.uint32)
+    mask = np.uint64(_MASK32)
+    for lo in range(0, a.size, step):
+        with np.errstate(over="ignore"):
+            hv = a[lo:lo + step, None] * xs[None, :]
+            hv += b[lo:lo + step, None]
+        hv &= mask
+        out[:, lo:lo + step] = np.minimum.reduceat(hv, offsets, axis=1).T
+    return out
+
+
+def signatures(texts: Iterable[str], cfg: NearDupConfig = NearDupConfig()):
+    """
+    MinHash signatures for `texts`: (uint32 array [n, num_perm], bool mask of
+    rows that had at least one token). Rows without tokens are all-ones.
+
+    `texts` is consumed lazily: each text is reduced to its shingle hashes
+    on arrival and only one block of shingles is held at a time, so memory
+    stays at the signatures plus about cfg.block_bytes of hash matrix.
+    """
+    _require_numpy()
+    vocab: Dict[str, int] = {}
+    a, b = _perm_params(cfg)
+    budget = _block_budget(cfg)
+    budget_bytes = 8 * cfg.num_perm * budget
+    rows: List = []
+    valid: List[bool] = []
+    block: List = []
+    total = 0
+
+    def flush() -> None:
+        nonlocal block, total
+        sig = np.full((len(block), cfg.num_perm), _MASK32, dtype=np.uint32)
+        live = [j for j, sh in enumerate(block) if sh.size]
+        if live:
+            xs = np.concatenate([block[j] for j in live])
+            offsets = np.cumsum([0] + [block[j].size for j in live[:-1]])
+            sig[live] = _min_hashes(xs, offsets, a, b, budget_bytes)
+        rows.append(sig)
+        block, total = [], 0
+
+    for t in texts:
+        sh = _shingle_hashes(normalize_tokens(t), vocab, cfg.shingle)
+        if block and total + sh.size > budget:
+            flush()
+        block.append(sh)
+        valid.append(sh.size > 0)
+        total += sh.size
+    if block:
+        flush()
+    sig = np.concatenate(rows) if rows else np.full((0, cfg.num_perm), _MASK32, dtype=np.uint32)
+    return sig, np.array(valid, dtype=bool)
+
+
+def _band_keys(sig, cfg: NearDupConfig):
+    """One uint64 key per (file, band): a wrapping dot product of the band's rows."""
+    rng = np.random.default_rng(cfg.seed + 7)
+    coef = rng.integers(1, 2**63 - 1, size=cfg.rows, dtype=np.uint64)
+    usable = cfg.bands * cfg.rows
+    bands = sig[:, :usable].astype(np.uint64).reshape(sig.shape[0], cfg.bands, cfg.rows)
+    with np.errstate(over="ignore"):
+        return (bands * coef).sum(axis=2, dtype=np.uint64)
+
+
+class _UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def cluster_signatures(sig, valid, cfg: NearDupConfig = NearDupConfig()) -> List[List[int]]:
+    """Group row indices whose signatures collide in an LSH band and clear the threshold."""
+    _require_numpy()
+    n = sig.shape[0]
+    uf = _UnionFind(n)
+    keys = _band_keys(sig, cfg)
+    idx_valid = np.flatnonzero(valid)
+    for band in range(cfg.bands):
+        col = keys[idx_valid, band]
+        order = np.argsort(col, kind="stable")
+        sorted_keys = col[order]
+        # boundaries of equal-key runs
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        ends = np.r_[starts[1:], sorted_keys.size]
+        for s, e in zip(starts, ends):
+            if e - s < 2:
+                continue
+            members = idx_valid[order[s:e]]
+            head = members[0]
+            # Why: compare to the run head instead of all pairs; big exact-copy
+            # buckets stay linear and other bands catch the rest.
+            sims = (sig[members[1:]] == sig[head]).mean(axis=1)
+            for m, sim in zip(members[1:], sims):
+                if sim >= cfg.threshold:
+                    uf.union(int(head), int(m))
+    groups: Dict[int, List[int]] = {}
+    for i in range(n):
+        groups.setdefault(uf.find(i), []).append(i)
+    return list(groups.values())
+
+
+def _read_text(p: Path) -> str:
+    try:
+        return p.read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return ""
+
+
+def _iter_texts(paths: Sequence[Path], workers: int) -> Iterator[str]:
+    """File texts in order, read in thread-pool chunks so only a chunk is held at once."""
+    chunk = 64 * max(1, workers)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        for i in range(0, len(paths), chunk):
+            yield from ex.map(_read_text, paths[i:i + chunk])
+
+
+def cluster_files(
+    paths: Iterable[Path],
+    rank: Callable[[Path], Tuple],
+    cfg: NearDupConfig = NearDupConfig(),
+    workers: int = 8,
+) -> List[NearDupCluster]:
+    """
+    Cluster files into near-duplicate groups. `rank` orders members; the
+    first becomes the cluster's canonical representative. Every input path
+    appears in exactly one cluster (singletons included).
+    """
+    _require_numpy()
+    plist = [Path(p) for p in paths]
+    sig, valid = signatures(_iter_texts(plist, workers), cfg)
+    out: List[NearDupCluster] = []
+    for idxs in cluster_signatures(sig, valid, cfg):
+        order = sorted(idxs, key=lambda i: rank(plist[i]))
+        rep_i = order[0]
+        sims = {plist[i]: float((sig[i] == sig[rep_i]).mean()) for i in order}
+        out.append(NearDupCluster(plist[rep_i], [plist[i] for i in order], sims))
+    return out
@@ -13,6 +13,7 @@ from typing import Dict, List, Optional
 
 from core.providers.base import LLMProvider
 from core.providers import load_provider
+from core.walker import walk_files
 
 
 @dataclass
@@ -109,19 +110,17 @@ class Orchestrator:
         root = Path(root)
         items: List[Dict[str, str]] = []
         skip = {"node_modules", ".git", "venv", ".pytest_cache"}
-        for pat in ("**/*.js", "**/*.jsx"):
-            for src in root.glob(pat):
-                if any(part in skip for part in src.parts):
-                    continue
-                ts = src.with_suffix(".tsx" if src.suffix.lower() == ".jsx" else ".ts")
-                items.append(
-                    {
-                        "src": str(src.resolve()),
-                        "ts_target": str(ts.resolve()),
-                        "test_target": "",
-                        "kind": "module",
-                    }
-                )
+        for entry in walk_files([root], skip_dirs=skip, exts=(".js", ".jsx")):
+            src = entry.path
+            ts = src.with_suffix(".tsx" if src.suffix.lower() == ".jsx" else ".ts")
+            items.append(
+                {
+                    "src": str(src.resolve()),
+                    "ts_target": str(ts.resolve()),
+                    "test_target": "",
+                    "kind": "module",
+                }
+            )
         return items
 
     def convert_file(
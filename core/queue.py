@@ -1,4 +1,348 @@
 # === AI‑ORCH HEADER ===
 # File: core/queue.py
-# Purpose: In‑memory FIFO for tasks during dev.
-# Notes: Replace with Redis/SQS in production.
\ No newline at end of file
+# Purpose: Durable SQLite work queue (WAL) shared by worker processes.
+# Notes: Leases, retries and dead letters; no server needed.
+"""
+Path: core/queue.py
+Durable work queue on a single SQLite file in WAL mode.
+
+A job is (kind, JSON payload, priority). Workers `dequeue` a batch: the
+highest-priority ready jobs are claimed in one IMMEDIATE transaction, so
+several processes can drain the same file without handing out a job twice.
+A claim is a lease that expires after the visibility timeout; a worker that
+crashes simply lets the lease lapse and the job becomes ready again. While
+`work` runs a handler, a heartbeat thread renews the leases of the batch it
+claimed, so a job may run far longer than the visibility timeout without
+being handed to a second worker. `ack` completes a job, `nack` (or a lapsed
+lease) retries it with exponential backoff until max_attempts, after which
+it is dead-lettered (state "dead") for inspection and `requeue_dead`.
+
+States: ready -> leased -> done | ready (retry) | dead
+
+`key` makes enqueue idempotent: a second enqueue with the same key while
+the first is not done returns the existing job id.
+
+Env:
+  AIO_QUEUE_DB           : SQLite path (default reports/queue.sqlite)
+  AIO_QUEUE_VISIBILITY_S : lease length in seconds (default 300)
+  AIO_QUEUE_MAX_ATTEMPTS : attempts before dead-lettering (default 5)
+  AIO_QUEUE_BACKOFF_S    : base retry delay, doubled per attempt (default 5)
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_DB = Path("reports") / "queue.sqlite"
+STATES = ("ready", "leased", "done", "dead")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind          TEXT    NOT NULL,
+    payload       TEXT    NOT NULL,
+    priority      INTEGER NOT NULL DEFAULT 0,
+    state         TEXT    NOT NULL DEFAULT 'ready',
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL,
+    available_at  REAL    NOT NULL,
+    lease_owner   TEXT,
+    lease_until   REAL,
+    key           TEXT,
+    result        TEXT,
+    last_error    TEXT,
+    created_at    REAL    NOT NULL,
+    updated_at    REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs(state, priority DESC, id);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_key ON jobs(key) WHERE key IS NOT NULL AND state != 'done';
+"""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+@dataclass
+class Job:
+    id: int
+    kind: str
+    payload: Any
+    priority: int
+    attempts: int
+    max_attempts: int
+    lease_owner: Optional[str] = None
+    lease_until: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+class WorkQueue:
+    """One connection per instance; safe to share between threads of a process."""
+
+    def __init__(self, db_path: Optional[Path] = None, visibility_s: Optional[float] = None,
+                 max_attempts: Optional[int] = None, backoff_s: Optional[float] = None) -> None:
+        self.db_path = Path(db_path or os.getenv("AIO_QUEUE_DB") or DEFAULT_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.visibility_s = float(visibility_s if visibility_s is not None
+                                  else _env_float("AIO_QUEUE_VISIBILITY_S", 300))
+        self.max_attempts = int(max_attempts if max_attempts is not None else _env_float("AIO_QUEUE_MAX_ATTEMPTS", 5))
+        self.backoff_s = float(backoff_s if backoff_s is not None else _env_float("AIO_QUEUE_BACKOFF_S", 5))
+        self._lock = threading.Lock()
+        # isolation_level=None: transactions are explicit (BEGIN IMMEDIATE for claims)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "WorkQueue":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ---- transactions ---------------------------------------------------------
+    def _tx(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                out = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return out
+
+    # ---- producers ------------------------------------------------------------
+    def enqueue(self, kind: str, payload: Any = None, *, priority: int = 0, delay: float = 0.0,
+                max_attempts: Optional[int] = None, key: Optional[str] = None) -> int:
+        return self.enqueue_many([{"kind": kind, "payload": payload, "priority": priority, "delay": delay,
+                                   "max_attempts": max_attempts, "key": key}])[0]
+
+    def enqueue_many(self, jobs: Iterable[Dict[str, Any]]) -> List[int]:
+        """Insert jobs ({kind, payload, priority?, delay?, max_attempts?, key?}) in one transaction."""
+        rows = list(jobs)
+
+        def _do(c: sqlite3.Connection) -> List[int]:
+            now = time.time()
+            ids: List[int] = []
+            for j in rows:
+                key = j.get("key")
+                if key is not None:
+                    hit = c.execute("SELECT id FROM jobs WHERE key=? AND state!='done'", (key,)).fetchone()
+                    if hit:
+                        ids.append(hit[0])
+                        continue
+                cur = c.execute(
+                    "INSERT INTO jobs(kind, payload, priority, max_attempts, available_at, key, created_at, updated_at)"
+                    " VALUES (?,?,?,?,?,?,?,?)",
+                    (j["kind"], json.dumps(j.get("payload"), ensure_ascii=False), int(j.get("priority") or 0),
+                     int(j.get("max_attempts") or self.max_attempts), now + float(j.get("delay") or 0.0),
+                     key, now, now))
+                ids.append(int(cur.lastrowid))
+            return ids
+
+        return self._tx(_do) if rows else []
+
+    # ---- consumers ------------------------------------------------------------
+    def dequeue(self, n: int = 1, *, owner: Optional[str] = None, kinds: Optional[Sequence[str]] = None,
+                visibility_s: Optional[float] = None) -> List[Job]:
+        """
+        Lease up to `n` jobs, highest priority first then FIFO. Jobs whose
+        lease lapsed count as ready; if that lapse used their last attempt they
+        are dead-lettered instead of handed out.
+        """
+        owner = owner or worker_id()
+        lease = float(visibility_s if visibility_s is not None else self.visibility_s)
+        kind_sql, kind_args = "", []
+        if kinds:
+            kind_sql = f" AND kind IN ({','.join('?' * len(kinds))})"
+            kind_args = list(kinds)
+
+        def _do(c: sqlite3.Connection) -> List[Job]:
+            now = time.time()
+            c.execute("UPDATE jobs SET state='dead', last_error=COALESCE(last_error, 'lease expired'), updated_at=?"
+                      " WHERE state='leased' AND lease_until<=? AND attempts>=max_attempts", (now, now))
+            rows = c.execute(
+                "SELECT id, kind, payload, priority, attempts, max_attempts, last_error FROM jobs"
+                " WHERE ((state='ready' AND available_at<=?) OR (state='leased' AND lease_until<=?))"
+                f"{kind_sql} ORDER BY priority DESC, id LIMIT ?",
+                [now, now, *kind_args, int(n)]).fetchall()
+            until = now + lease
+            c.executemany(
+                "UPDATE jobs SET state='leased', attempts=attempts+1, lease_owner=?, lease_until=?, updated_at=?"
+                " WHERE id=?", [(owner, until, now, r[0]) for r in rows])
+            return [Job(r[0], r[1], json.loads(r[2]), r[3], r[4] + 1, r[5], owner, until, r[6]) for r in rows]
+
+        return self._tx(_do)
+
+    def _owned(self, c: sqlite3.Connection, job: Job) -> bool:
+        row = c.execute("SELECT state, lease_owner FROM jobs WHERE id=?", (job.id,)).fetchone()
+        return bool(row) and row[0] == "leased" and row[1] == job.lease_owner
+
+    def ack(self, job: Job, result: Any = None) -> bool:
+        """Mark done. False if the lease was lost (expired and re-claimed) meanwhile."""
+        def _do(c: sqlite3.Connection) -> bool:
+            if not self._owned(c, job):
+                return False
+            c.execute("UPDATE jobs SET state='done', result=?, lease_owner=NULL, lease_until=NULL, updated_at=?"
+                      " WHERE id=?", (json.dumps(result, ensure_ascii=False, default=str), time.time(), job.id))
+            return True
+        return self._tx(_do)
+
+    def nack(self, job: Job, error: str = "", delay: Optional[float] = None) -> str:
+        """Release a failed job; returns its new state ("ready", "dead", or "lost")."""
+        def _do(c: sqlite3.Connection) -> str:
+            if not self._owned(c, job):
+                return "lost"
+            now = time.time()
+            if job.attempts >= job.max_attempts:
+                state, wait = "dead", 0.0
+            else:
+                state = "ready"
+                wait = delay if delay is not None else self.backoff_s * (2 ** (job.attempts - 1))
+            c.execute("UPDATE jobs SET state=?, available_at=?, last_error=?, lease_owner=NULL, lease_until=NULL,"
+                      " updated_at=? WHERE id=?", (state, now + wait, error[:2000], now, job.id))
+            return state
+        return self._tx(_do)
+
+    def extend(self, job: Job, seconds: Optional[float] = None) -> bool:
+        """Heartbeat: push the lease out for long-running jobs."""
+        def _do(c: sqlite3.Connection) -> bool:
+            if not self._owned(c, job):
+                return False
+            job.lease_until = time.time() + float(seconds if seconds is not None else self.visibility_s)
+            c.execute("UPDATE jobs SET lease_until=?, updated_at=? WHERE id=?", (job.lease_until, time.time(), job.id))
+            return True
+        return self._tx(_do)
+
+    # ---- inspection / maintenance ---------------------------------------------
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        out = {s: 0 for s in STATES}
+        out.update({s: int(n) for s, n in rows})
+        return out
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cur = self._conn.execute("SELECT * FROM jobs WHERE id=?", (job_id,))
+            row = cur.fetchone()
+            cols = [d[0] for d in cur.description]
+        if not row:
+            return None
+        rec = dict(zip(cols, row))
+        rec["payload"] = json.loads(rec["payload"])
+        rec["result"] = json.loads(rec["result"]) if rec["result"] is not None else None
+        return rec
+
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            ids = [r[0] for r in self._conn.execute(
+                "SELECT id FROM jobs WHERE state='dead' ORDER BY id LIMIT ?", (limit,)).fetchall()]
+        return [rec for rec in (self.get(i) for i in ids) if rec]
+
+    def requeue_dead(self, ids: Optional[Sequence[int]] = None) -> int:
+        """Give dead jobs a fresh set of attempts (all of them when `ids` is None)."""
+        if ids is not None and not ids:
+            return 0
+
+        def _do(c: sqlite3.Connection) -> int:
+            now = time.time()
+            sql = "UPDATE jobs SET state='ready', attempts=0, available_at=?, updated_at=? WHERE state='dead'"
+            args: List[Any] = [now, now]
+            if ids is not None:
+                sql += f" AND id IN ({','.join('?' * len(ids))})"
+                args += list(ids)
+            return c.execute(sql, args).rowcount
+        return self._tx(_do)
+
+    def purge_done(self, older_than_s: float = 7 * 86400) -> int:
+        return self._tx(lambda c: c.execute("DELETE FROM jobs WHERE state='done' AND updated_at<?",
+                                            (time.time() - older_than_s,)).rowcount)
+
+
+Handler = Callable[[Any], Any]
+
+
+class _Heartbeat:
+    """Renews the leases of a claimed batch every visibility_s / 3 until each job is released."""
+
+    def __init__(self, q: WorkQueue, jobs: Sequence[Job]) -> None:
+        self._q = q
+        self._jobs = list(jobs)
+        self._interval = max(0.01, q.visibility_s / 3.0)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="queue-heartbeat", daemon=True)
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def release(self, job: Job) -> None:
+        self._jobs = [j for j in self._jobs if j is not job]
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            for job in self._jobs:
+                try:
+                    self._q.extend(job)
+                except sqlite3.Error:
+                    pass  # transient lock contention; the next beat retries well inside the lease
+
+
+def work(q: WorkQueue, handlers: Dict[str, Handler], *, batch: int = 1, owner: Optional[str] = None,
+         idle_exit: bool = False, poll_s: float = 1.0, max_jobs: Optional[int] = None,
+         stop: Optional[threading.Event] = None) -> Dict[str, int]:
+    """
+    Drain `q` with `handlers` (kind -> fn(payload) -> JSON-able result).
+    Exceptions nack the job. Leases are renewed while handlers run, so long
+    jobs are not re-claimed. Returns counts of done / retried / dead / lost.
+    With idle_exit the loop returns once nothing is ready; otherwise it polls.
+    """
+    owner = owner or worker_id()
+    counts = {"done": 0, "ready": 0, "dead": 0, "lost": 0}
+    handled = 0
+    while not (stop and stop.is_set()) and (max_jobs is None or handled < max_jobs):
+        want = batch if max_jobs is None else min(batch, max_jobs - handled)
+        jobs = q.dequeue(want, owner=owner, kinds=list(handlers))
+        if not jobs:
+            if idle_exit:
+                break
+            time.sleep(poll_s)
+            continue
+        with _Heartbeat(q, jobs) as beat:
+            for job in jobs:
+                handled += 1
+                try:
+                    result = handlers[job.kind](job.payload)
+                except Exception as e:
+                    beat.release(job)
+                    counts[q.nack(job, f"{e.__class__.__name__}: {e}")] += 1
+                    continue
+                beat.release(job)
+                counts["done" if q.ack(job, result) else "lost"] += 1
+    return counts
@@ -10,8 +10,20 @@ import json
 
 
 def latest_report_path(reports_dir: Path) -> Optional[Path]:
+    """
+    Report of the newest run: a run store lookup, falling back to the newest
+    run-*.json by mtime for runs that predate the store.
+    """
     if not reports_dir.exists():
         return None
+    from core.storage import open_store
+
+    st = open_store()
+    run_id = st.latest_run_id() if st else None
+    if run_id:
+        p = reports_dir / f"{run_id}.json"
+        if p.exists():
+            return p
     items = sorted(reports_dir.glob("run-*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
     return items[0] if items else None
 
@@ -1,4 +1,291 @@
 # === AI‑ORCH HEADER ===
 # File: core/storage.py
-# Purpose: SQLite run log (append‑only) using SQLAlchemy.
-# Notes: Migration‑free; safe for local/dev.
\ No newline at end of file
+# Purpose: SQLite run log (append‑only), stdlib sqlite3 in WAL mode.
+# Notes: Migration‑free; safe for local/dev.
+"""
+Path: core/storage.py
+Append-only run store: runs, per-file results, gate outcomes, PR URLs and
+timings in one SQLite file (WAL; readers never block the writer).
+
+Result rows are buffered and written in batches (executemany in one
+transaction) once AIO_RUN_STORE_BATCH rows are pending, and before every
+query, so callers can record per file without paying a commit each. Only
+the run row itself is ever updated (finish status / time).
+
+Queries are index lookups, e.g. latest_pr(run_id) or pass_rate(since)
+instead of globbing reports/ and sorting on mtime.
+
+Env:
+  AIO_RUN_STORE       : SQLite path (default reports/runs.sqlite); "0"/"off" disables
+  AIO_RUN_STORE_BATCH : buffered rows before an automatic flush (default 200)
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_DB = Path("reports") / "runs.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    source      TEXT,
+    mode        TEXT,
+    status      TEXT NOT NULL DEFAULT 'running',
+    meta        TEXT,
+    started_at  REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS runs_started ON runs(started_at);
+
+CREATE TABLE IF NOT EXISTS file_results (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id     TEXT NOT NULL,
+    path       TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    ms         REAL,
+    detail     TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS file_results_run ON file_results(run_id);
+CREATE INDEX IF NOT EXISTS file_results_path ON file_results(path, created_at);
+
+CREATE TABLE IF NOT EXISTS gates (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id     TEXT NOT NULL,
+    step       TEXT NOT NULL,
+    pass       INTEGER,
+    exit_code  INTEGER,
+    ms         REAL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS gates_run ON gates(run_id);
+CREATE INDEX IF NOT EXISTS gates_created ON gates(created_at);
+
+CREATE TABLE IF NOT EXISTS prs (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id     TEXT NOT NULL,
+    url        TEXT NOT NULL,
+    number     INTEGER,
+    branch     TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS prs_run ON prs(run_id, id);
+
+CREATE TABLE IF NOT EXISTS timings (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id     TEXT NOT NULL,
+    name       TEXT NOT NULL,
+    ms         REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS timings_run ON timings(run_id);
+"""
+
+_INSERT = {
+    "file_results": "INSERT INTO file_results(run_id, path, status, ms, detail, created_at) VALUES (?,?,?,?,?,?)",
+    "gates": "INSERT INTO gates(run_id, step, pass, exit_code, ms, created_at) VALUES (?,?,?,?,?,?)",
+    "prs": "INSERT INTO prs(run_id, url, number, branch, created_at) VALUES (?,?,?,?,?)",
+    "timings": "INSERT INTO timings(run_id, name, ms, created_at) VALUES (?,?,?,?)",
+}
+
+
+def store_path_from_env() -> Optional[Path]:
+    raw = os.getenv("AIO_RUN_STORE", "").strip()
+    if raw.lower() in {"0", "off", "false", "no"}:
+        return None
+    return Path(raw) if raw else DEFAULT_DB
+
+
+def pr_number(url: str) -> Optional[int]:
+    try:
+        return int(url.rstrip("/").split("/")[-1])
+    except (ValueError, IndexError):
+        return None
+
+
+def _rows(cur: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+
+class RunStore:
+    """Thread-safe; one connection per instance, writes buffered per table."""
+
+    def __init__(self, db_path: Path, batch: Optional[int] = None) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch = int(batch if batch is not None else os.getenv("AIO_RUN_STORE_BATCH", "200") or 200)
+        self._pending: Dict[str, List[Tuple[Any, ...]]] = {t: [] for t in _INSERT}
+        self._npending = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    # ---- writes -------------------------------------------------------------
+    def _add(self, table: str, rows: Iterable[Tuple[Any, ...]]) -> None:
+        with self._lock:
+            for r in rows:
+                self._pending[table].append(r)
+                self._npending += 1
+            due = self._npending >= self.batch
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all buffered rows in one transaction; returns the row count."""
+        with self._lock:
+            if not self._npending:
+                return 0
+            pending, n = self._pending, self._npending
+            self._pending, self._npending = {t: [] for t in _INSERT}, 0
+            with self._conn:
+                for table, rows in pending.items():
+                    if rows:
+                        self._conn.executemany(_INSERT[table], rows)
+            return n
+
+    def start_run(self, run_id: str, source: str = "", mode: str = "", **meta: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs(run_id, source, mode, meta, started_at) VALUES (?,?,?,?,?)",
+                (run_id, source, mode, json.dumps(meta, default=str) if meta else None, time.time()))
+
+    def finish_run(self, run_id: str, status: str = "done", source: Optional[str] = None) -> None:
+        """Close `run_id`; with `source`, only if the run was started by that source."""
+        self.flush()
+        sql, args = "UPDATE runs SET status=?, finished_at=? WHERE run_id=?", [status, time.time(), run_id]
+        if source is not None:
+            sql, args = sql + " AND source=?", args + [source]
+        with self._lock, self._conn:
+            self._conn.execute(sql, args)
+
+    def add_file_results(self, run_id: str, results: Iterable[Dict[str, Any]]) -> None:
+        """`results`: {"path", "status", "ms"?, ...}; extra keys land in `detail`."""
+        now = time.time()
+        rows = []
+        for r in results:
+            extra = {k: v for k, v in r.items() if k not in ("path", "status", "ms")}
+            rows.append((run_id, str(r.get("path", "")), str(r.get("status", "ok")), r.get("ms"),
+                         json.dumps(extra, default=str) if extra else None, now))
+        self._add("file_results", rows)
+
+    def add_gates(self, run_id: str, steps: Dict[str, Dict[str, Any]]) -> None:
+        """`steps` as in reports/gates_<run_id>.json: {name: {"pass", "exit", "ms"?}}."""
+        now = time.time()
+        self._add("gates", [(run_id, name, None if s.get("pass") is None else int(bool(s.get("pass"))),
+                             s.get("exit"), s.get("ms"), now) for name, s in steps.items()])
+
+    def add_pr(self, run_id: str, url: str, branch: Optional[str] = None) -> None:
+        self._add("prs", [(run_id, url, pr_number(url), branch, time.time())])
+
+    def add_timings(self, run_id: str, timings: Dict[str, float]) -> None:
+        now = time.time()
+        self._add("timings", [(run_id, name, float(ms), now) for name, ms in timings.items()])
+
+    # ---- queries ------------------------------------------------------------
+    def _query(self, sql: str, args: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+        self.flush()
+        with self._lock:
+            return _rows(self._conn.execute(sql, args))
+
+    def run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT * FROM runs WHERE run_id=?", (run_id,))
+        if not rows:
+            return None
+        run = rows[0]
+        run["meta"] = json.loads(run["meta"]) if run["meta"] else {}
+        run["files"] = self._query(
+            "SELECT path, status, ms, detail FROM file_results WHERE run_id=? ORDER BY id", (run_id,))
+        run["gates"] = self._query(
+            "SELECT step, pass, exit_code, ms FROM gates WHERE run_id=? ORDER BY id", (run_id,))
+        run["prs"] = self._query(
+            "SELECT url, number, branch, created_at FROM prs WHERE run_id=? ORDER BY id", (run_id,))
+        run["timings"] = {r["name"]: r["ms"] for r in self._query(
+            "SELECT name, ms FROM timings WHERE run_id=? ORDER BY id", (run_id,))}
+        return run
+
+    def recent_runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return self._query("SELECT run_id, source, mode, status, started_at, finished_at FROM runs"
+                           " ORDER BY started_at DESC LIMIT ?", (limit,))
+
+    def latest_run_id(self) -> Optional[str]:
+        """Newest pipeline run; gates-only rows (source='gates') are not runs of their own."""
+        rows = self._query("SELECT run_id FROM runs WHERE source != 'gates' ORDER BY started_at DESC LIMIT 1")
+        return rows[0]["run_id"] if rows else None
+
+    def latest_pr(self, run_id: Optional[str] = None) -> Optional[str]:
+        """PR URL recorded last for `run_id` (or across all runs)."""
+        if run_id is None:
+            rows = self._query("SELECT url FROM prs ORDER BY id DESC LIMIT 1")
+        else:
+            rows = self._query("SELECT url FROM prs WHERE run_id=? ORDER BY id DESC LIMIT 1", (run_id,))
+        return rows[0]["url"] if rows else None
+
+    def pass_rate(self, since: Optional[float] = None, step: Optional[str] = None) -> Dict[str, Any]:
+        """Gate pass rate over rows created at or after `since` (default: last 7 days)."""
+        since = since if since is not None else time.time() - 7 * 86400
+        sql = ("SELECT COUNT(*) AS total, COALESCE(SUM(pass), 0) AS passed FROM gates"
+               " WHERE created_at>=? AND pass IS NOT NULL")
+        args: Tuple[Any, ...] = (since,)
+        if step:
+            sql += " AND step=?"
+            args += (step,)
+        row = self._query(sql, args)[0]
+        total, passed = int(row["total"]), int(row["passed"])
+        return {"since": since, "step": step, "total": total, "passed": passed,
+                "rate": round(passed / total, 4) if total else None}
+
+    def file_history(self, path: str, limit: int = 20) -> List[Dict[str, Any]]:
+        return self._query("SELECT run_id, status, ms, detail, created_at FROM file_results WHERE path=?"
+                           " ORDER BY created_at DESC LIMIT ?", (path, limit))
+
+
+_OPEN: Dict[str, RunStore] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def open_store(db_path: Optional[Path] = None) -> Optional[RunStore]:
+    """
+    Process-wide RunStore for `db_path` (or the env default). Returns None
+    when the store is disabled or cannot be opened.
+    """
+    path = db_path or store_path_from_env()
+    if path is None:
+        return None
+    key = str(Path(path).resolve())
+    with _OPEN_LOCK:
+        st = _OPEN.get(key)
+        if st is None:
+            try:
+                st = RunStore(Path(path))
+            except sqlite3.Error:
+                return None
+            _OPEN[key] = st
+            atexit.register(st.flush)  # buffered rows must not die with the process
+        return st
+
+
+def record(fn_name: str, *args: Any, **kwargs: Any) -> None:
+    """Best-effort write-through (`record("add_pr", run_id, url)`); never raises."""
+    st = open_store()
+    if st is None:
+        return
+    try:
+        getattr(st, fn_name)(*args, **kwargs)
+    except sqlite3.Error:
+        pass
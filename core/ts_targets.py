@@ -7,8 +7,11 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, List, Optional
 
+from .walker import walk_files
+
 JS_EXTS = {".js", ".jsx"}
 TS_EXTS = {".ts", ".tsx"}
+SKIP_DIRS = {"node_modules", ".git"}
 TEST_SUFFIXES = {".test.js", ".test.jsx", ".test.ts", ".test.tsx"}
 
 
@@ -52,9 +55,8 @@ def find_conversion_candidates(root: Path, includes: Optional[Iterable[str]] = N
     deny: set[str] = set(excludes or [])
 
     results: List[ConversionTarget] = []
-    for p in root.rglob("*"):
-        if not p.is_file():
-            continue
+    for e in walk_files([root], skip_dirs=SKIP_DIRS, exts=JS_EXTS | TS_EXTS):
+        p = e.path
         if allow and not any(str(p).endswith(s) for s in allow):
             # allowlist active: keep only matching suffixes
             continue
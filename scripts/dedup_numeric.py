@@ -2,8 +2,9 @@
 from pathlib import Path
 import csv
 import os
-from collections import defaultdict
 from app.utils.numeric_junk import is_numeric_junk
+from core.dedup_engine import group_by_content
+from core.walker import walk_files
 
 ROOTS = [p.strip() for p in os.getenv("AIO_SCAN_ROOTS", "").split(",") if p.strip()]
 SKIP  = {p.strip().lower() for p in os.getenv("AIO_SKIP_DIRS", "").split(",") if p.strip()}
@@ -15,34 +16,16 @@ CAND_PATH = OUT_DIR / "conversion_candidates.txt"
 
 EXTS = {".js", ".jsx", ".ts", ".tsx"}
 
-def in_skip_parts(path: Path) -> bool:
-    parts = {p.lower() for p in path.parts}
-    return any(s in parts for s in SKIP)
-
 def main() -> None:
-    candidates = []
-    for root in ROOTS:
-        r = Path(root)
-        if not r.exists():
-            continue
-        for p in r.rglob("*"):
-            if not p.is_file(): continue
-            if in_skip_parts(p): continue
-            if p.suffix.lower() not in EXTS: continue
-            if is_numeric_junk(str(p)): continue
-            candidates.append(p)
+    # skip dirs pruned before descent; numeric junk dropped by name
+    walked = walk_files(ROOTS, skip_dirs=SKIP, exts=EXTS, skip_file=is_numeric_junk)
 
-    groups = defaultdict(list)
-    for p in candidates:
-        try:
-            size = p.stat().st_size
-        except OSError:
-            continue
-        key = (p.stem.lower(), size)
-        groups[key].append(p)
+    # byte-identical groups: size -> 4 KB head hash -> full hash on collisions only
+    groups, _stats = group_by_content((e.path, e.size) for e in walked)
 
     kept, eliminated = [], []
-    for key, files in groups.items():
+    for g in groups:
+        files = g.paths
         files_sorted = sorted(files, key=lambda z: (0 if z.suffix.lower() in {".ts", ".tsx"} else 1, str(z).lower()))
         best = files_sorted[0]
         kept.append(best)
@@ -0,0 +1,86 @@
+# Path: tests/test_affected.py
+from __future__ import annotations
+
+from pathlib import Path
+
+from core.affected import ImportGraph, is_test_file, resolve_import
+
+
+def _tree(root: Path, files: dict) -> None:
+    for rel, text in files.items():
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(text, encoding="utf-8")
+
+
+FILES = {
+    "src/utils/math.ts": "export const add = (a: number, b: number) => a + b;\n",
+    "src/utils/index.ts": "export * from './math';\n",
+    "src/lib/price.ts": "import { add } from '../utils';\nexport const total = add(1, 2);\n",
+    "src/components/Cart.tsx": ("import { total } from '@/lib/price';\nimport React from 'react';\n"
+                                "export const Cart = () => <b>{total}</b>;\n"),
+    "src/components/Cart.test.tsx": "import { Cart } from './Cart';\ntest('x', () => Cart);\n",
+    "src/lib/__tests__/price.test.ts": "import { total } from '../price.js';\n",
+    "src/other/unrelated.ts": "export const z = 1;\n",
+    "src/other/unrelated.spec.ts": "import { z } from './unrelated';\n",
+    "src/utils/math.test.ts": "test('standalone', () => 1);\n",
+}
+
+
+def test_affected_follows_importers_transitively(tmp_path):
+    _tree(tmp_path, FILES)
+    g = ImportGraph.build(tmp_path)
+    root = tmp_path.resolve()
+    changed = [root / "src/utils/math.ts"]
+    affected = {p.relative_to(root).as_posix() for p in g.affected(changed)}
+    assert affected == {
+        "src/utils/math.ts", "src/utils/index.ts", "src/lib/price.ts", "src/components/Cart.tsx",
+        "src/components/Cart.test.tsx", "src/lib/__tests__/price.test.ts",
+    }
+    tests = [p.relative_to(root).as_posix() for p in g.related_tests(changed)]
+    assert tests == ["src/components/Cart.test.tsx", "src/lib/__tests__/price.test.ts", "src/utils/math.test.ts"]
+
+
+def test_leaf_change_only_hits_its_own_tests(tmp_path):
+    _tree(tmp_path, FILES)
+    g = ImportGraph.build(tmp_path)
+    root = tmp_path.resolve()
+    assert [p.name for p in g.related_tests([root / "src/other/unrelated.ts"])] == ["unrelated.spec.ts"]
+
+
+def test_resolve_rules(tmp_path):
+    root = tmp_path
+    known = {root / "src/a.ts", root / "src/dir/index.tsx", root / "src/b.ts"}
+    imp = root / "src/x.ts"
+
+    def r(s):
+        return resolve_import(s, imp, root, known.__contains__, {"@/": "src"})
+
+    assert r("./a") == root / "src/a.ts"
+    assert r("./dir") == root / "src/dir/index.tsx"
+    assert r("@/b") == root / "src/b.ts"
+    assert r("./b.js") == root / "src/b.ts"
+    assert r("react") is None and r("./missing") is None
+    assert is_test_file(Path("a/__tests__/x.ts")) and is_test_file(Path("a.spec.jsx"))
+    assert not is_test_file(Path("a.ts"))
+
+
+def test_tsconfig_paths_and_base_url(tmp_path):
+    _tree(tmp_path, {
+        "tsconfig.json": """{
+  // comments and trailing commas are fine
+  "compilerOptions": {
+    "baseUrl": "src",
+    "paths": {"@services/*": ["services/*"], "@config": ["config/main.ts"],},
+  },
+}""",
+        "src/services/api.ts": "export const api = 1;\n",
+        "src/config/main.ts": "export const cfg = 1;\n",
+        "src/lib/util.ts": "export const u = 1;\n",
+        "src/app.ts": ("import { api } from '@services/api';\nimport { cfg } from '@config';\n"
+                       "import { u } from 'lib/util';\n"),
+    })
+    g = ImportGraph.build(tmp_path)
+    root = tmp_path.resolve()
+    assert {p.relative_to(root).as_posix() for p in g.imports[root / "src/app.ts"]} == {
+        "src/services/api.ts", "src/config/main.ts", "src/lib/util.ts"}
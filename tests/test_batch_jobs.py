@@ -0,0 +1,103 @@
+# Path: tests/test_batch_jobs.py
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app import review_multi
+from app.services import http_transport
+from app.services.llm import batch_jobs
+from app.services.llm.batch_stub import BatchStub
+
+pytestmark = pytest.mark.skipif(not http_transport.available(), reason="requests/httpx not installed")
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    def responder(body):
+        prompt = body["messages"][-1]["content"]
+        if "boom" in prompt:
+            raise ValueError("model refused")
+        return json.dumps({"summary": prompt.splitlines()[0], "score": 88})
+
+    s = BatchStub(responder, delay=0.2)
+    monkeypatch.setenv("AIO_BATCH_BASE_URL", s.start())
+    yield s
+    s.stop()
+    http_transport.close_all()
+
+
+def test_run_job_maps_results_and_resumes(stub, tmp_path):
+    reqs = {"a": {"messages": [{"role": "user", "content": "fine"}]},
+            "b": {"messages": [{"role": "user", "content": "boom"}]}}
+    got = batch_jobs.run_job(tmp_path / "job", reqs, interval=0.05)
+    assert got["a"].ok and json.loads(got["a"].content)["score"] == 88
+    assert not got["b"].ok and "model refused" in got["b"].error
+    assert (tmp_path / "job" / "input.jsonl").read_text().count("\n") == 2
+    assert json.loads((tmp_path / "job" / "job.json").read_text())["status"] == "completed"
+
+    again = batch_jobs.run_job(tmp_path / "job", reqs, interval=0.05)
+    assert stub.created == 1 and again["a"].content == got["a"].content
+
+
+def test_poll_times_out(stub, tmp_path):
+    stub.delay = 60
+    batch = batch_jobs.submit(batch_jobs.write_jsonl(tmp_path / "in.jsonl", {"a": {}}))
+    with pytest.raises(batch_jobs.BatchError):
+        batch_jobs.poll(batch["id"], interval=0.01, timeout=0.05)
+
+
+def _wow(prompt, model=""):
+    return {"ok": True, "model": "w", "summary": "wow", "score": 70}
+
+
+def test_review_run_batch_writes_usual_layout(stub, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("AIO_PROVIDERS", raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("AIO_LLM_CACHE", str(tmp_path / "cache.sqlite"))
+    monkeypatch.setenv("AIO_REVIEW_CHUNK_TOKENS", "200")
+    monkeypatch.setattr(review_multi, "_gemini_review", _wow)
+    monkeypatch.setattr(review_multi, "_grok_review", _wow)
+
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.tsx").write_text("export const A = () => null;\n")
+    (src / "big.ts").write_text("".join(f"export function f{i}() {{ return {i}; }}\n" for i in range(120)))
+    files = [str(src / "a.tsx"), str(src / "big.ts")]
+
+    links = review_multi.run_batch(files, "b1", str(tmp_path), poll_interval=0.05)
+    assert [p.replace("\\", "/").split("reviews/b1/")[1] for p in links] == [
+        "Free/src/a.tsx.json", "Premium/src/a.tsx.json", "Wow++/src/a.tsx.json",
+        "Free/src/big.ts.json", "Premium/src/big.ts.json", "Wow++/src/big.ts.json"]
+    free_a = json.loads(open(links[0]).read())
+    assert free_a["ok"] and free_a["summary"] == "File: src/a.tsx"
+    free_big = json.loads(open(links[3]).read())
+    assert free_big["ok"] and "[lines 1-" in free_big["summary"]
+    assert stub.created == 1
+
+    # every prompt is now cached: a new run sends nothing
+    review_multi.run_batch(files, "b2", str(tmp_path), poll_interval=0.05)
+    assert stub.created == 1
+
+
+def test_review_run_batch_resume_keys_on_path(stub, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("AIO_PROVIDERS", raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("AIO_LLM_CACHE", "0")
+    monkeypatch.setattr(review_multi, "_gemini_review", _wow)
+    monkeypatch.setattr(review_multi, "_grok_review", _wow)
+    src = tmp_path / "src"
+    src.mkdir()
+    for name in ("a.tsx", "b.tsx"):
+        (src / name).write_text(f"export const {name[0].upper()} = () => null;\n")
+    files = [str(src / "a.tsx"), str(src / "b.tsx")]
+
+    review_multi.run_batch(files, "r1", str(tmp_path), poll_interval=0.05)
+    # same run id, different order: the stored job is resumed, answers still land on the right file
+    links = review_multi.run_batch(files[::-1], "r1", str(tmp_path), poll_interval=0.05)
+    assert stub.created == 1
+    assert json.loads(open(links[0]).read())["summary"] == "File: src/b.tsx"
+    assert json.loads(open(links[3]).read())["summary"] == "File: src/a.tsx"
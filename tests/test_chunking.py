@@ -0,0 +1,59 @@
+# Path: tests/test_chunking.py
+from __future__ import annotations
+
+from core.chunking import boundaries, split_source
+
+SRC = """import React from "react";
+import { x } from "./x";
+
+/** Doc for A */
+export function A(props) {
+  const s = `tpl ${props.a} }`;
+  return <div>{s}</div>;
+}
+
+const B = () => {
+  if (x) { return 1 }
+  return 2
+}
+const C = 3
+export default class D {
+  m() { return "}" }
+}
+"""
+
+
+def _chars(text: str) -> int:
+    return len(text)
+
+
+def test_boundaries_fall_on_top_level_line_starts():
+    cuts = boundaries(SRC)
+    starts = [SRC[c:].split("\n", 1)[0] for c in cuts]
+    assert starts[0] == 'import React from "react";'
+    assert "/** Doc for A */" in starts  # JSDoc stays with its declaration
+    assert "const B = () => {" in starts and "const C = 3" in starts
+    assert "export default class D {" in starts
+    # nothing inside a body, string or template is a boundary
+    assert not any(s.startswith(("  ", "}")) for s in starts)
+
+
+def test_split_respects_budget_and_covers_text():
+    chunks = split_source(SRC, budget=120, count=_chars)
+    assert "".join(c.text for c in chunks) == SRC
+    assert all(c.tokens <= 120 for c in chunks)
+    assert chunks[0].start_line == 1 and chunks[-1].end_line == SRC.count("\n")
+    for a, b in zip(chunks, chunks[1:]):
+        assert b.start_line == a.end_line + 1
+
+
+def test_oversized_declaration_falls_back_to_lines():
+    body = "function big() {\n" + "".join(f"  call{i}();\n" for i in range(50)) + "}\n"
+    chunks = split_source(body, budget=60, count=_chars)
+    assert len(chunks) > 1 and "".join(c.text for c in chunks) == body
+    assert all(c.text.endswith("\n") for c in chunks)
+
+
+def test_small_source_is_one_chunk():
+    assert [c.text for c in split_source(SRC, budget=10_000, count=_chars)] == [SRC]
+    assert split_source("", budget=10) == []
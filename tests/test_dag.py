@@ -0,0 +1,83 @@
+# Path: tests/test_dag.py
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from app.services.llm import orchestrator
+from core.dag import Step, critical_path, run_dag
+
+
+def _sleepy(value, delay=0.1):
+    def fn(_inputs):
+        time.sleep(delay)
+        return value
+    return fn
+
+
+def test_independent_steps_overlap_and_get_inputs():
+    steps = [
+        Step("a", _sleepy(1)),
+        Step("b", lambda r: r["a"] + 1, ("a",)),
+        Step("c", _sleepy(10), ("a",)),
+        Step("d", lambda r: r["b"] + r["c"], ("b", "c")),
+    ]
+    run = run_dag(steps)
+    assert run.results == {"a": 1, "b": 2, "c": 10, "d": 12}
+    assert run.total_ms < 350  # a and c in series (~200ms); b overlaps c
+    assert run.timings["c"].start_ms < run.timings["b"].end_ms + 5
+    assert critical_path(steps, run) == ["a", "c", "d"]
+
+
+def test_failure_stops_scheduling_and_reraises():
+    ran = []
+    steps = [
+        Step("boom", lambda r: 1 / 0),
+        Step("after", lambda r: ran.append(1), ("boom",)),
+    ]
+    with pytest.raises(ZeroDivisionError):
+        run_dag(steps)
+    assert ran == []
+
+
+def test_bad_graphs_rejected():
+    with pytest.raises(ValueError):
+        run_dag([Step("a", lambda r: 1, ("b",)), Step("b", lambda r: 1, ("a",))])
+    with pytest.raises(ValueError):
+        run_dag([Step("a", lambda r: 1, ("missing",))])
+
+
+def _patch_pipeline(monkeypatch, reviewed_changes: bool):
+    calls = []
+
+    def tests(code, src):
+        calls.append(code)
+        time.sleep(0.05)
+        return f"tests for {code}"
+
+    def review(code, src):
+        time.sleep(0.1)
+        return code + "!" if reviewed_changes else code
+
+    monkeypatch.setattr(orchestrator, "_convert", lambda js, src: "ts")
+    monkeypatch.setattr(orchestrator, "_tests", tests)
+    monkeypatch.setattr(orchestrator, "_review", review)
+    monkeypatch.setattr(orchestrator, "_polish", lambda code, src: code + " polished")
+    return calls
+
+
+def test_pipeline_keeps_speculative_tests_when_review_agrees(monkeypatch):
+    calls = _patch_pipeline(monkeypatch, reviewed_changes=False)
+    out = orchestrator.orchestrate_conversion_pipeline("r", "github", "t", "a.jsx", "js")
+    assert out["ts_code"] == "ts polished" and out["test_code"] == "tests for ts"
+    assert calls == ["ts"]
+    assert out["timings"]["total"] < 140  # tests overlapped the 100ms review
+    assert set(out["timings"]) >= {"convert", "tests_spec", "review", "polish", "tests"}
+
+
+def test_pipeline_regenerates_tests_when_review_changes_code(monkeypatch):
+    calls = _patch_pipeline(monkeypatch, reviewed_changes=True)
+    out = orchestrator.orchestrate_conversion_pipeline("r", "github", "t", "a.jsx", "js")
+    assert out["ts_code"] == "ts! polished" and out["test_code"] == "tests for ts!"
+    assert calls == ["ts", "ts!"]
@@ -0,0 +1,32 @@
+# Path: tests/test_dedup_engine.py
+from __future__ import annotations
+
+from pathlib import Path
+
+from core.dedup_engine import group_by_content
+
+
+def _w(p: Path, data: bytes) -> tuple:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_bytes(data)
+    return p, len(data)
+
+
+def test_staged_grouping_by_content(tmp_path: Path):
+    head = b"h" * 5000
+    entries = [
+        _w(tmp_path / "a" / "Button.jsx", b"export default 1;"),
+        _w(tmp_path / "b" / "Renamed.jsx", b"export default 1;"),       # renamed copy
+        _w(tmp_path / "c" / "Button.jsx", b"export default 2;"),        # same stem+size, different content
+        _w(tmp_path / "big1.js", head + b"AAAA"),
+        _w(tmp_path / "big2.js", head + b"BBBB"),                       # head collision only
+        _w(tmp_path / "big3.js", head + b"AAAA"),
+        _w(tmp_path / "unique.ts", b"solo"),
+    ]
+    groups, stats = group_by_content(entries, workers=2)
+
+    sets = sorted(sorted(p.name for p in g.paths) for g in groups)
+    assert sets == [["Button.jsx"], ["Button.jsx", "Renamed.jsx"], ["big1.js", "big3.js"], ["big2.js"], ["unique.ts"]]
+    assert stats.files == 7 and stats.duplicate_groups == 2
+    # unique size never hashed; the small collision is settled by the head hash alone
+    assert stats.head_hashed == 6 and stats.full_hashed == 3
@@ -0,0 +1,78 @@
+# Path: tests/test_dispatch.py
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+import pytest
+
+from core.dispatch import dispatch
+
+
+def _work(x):
+    if x == "boom":
+        raise ValueError("bad file")
+    if x == "stuck":
+        time.sleep(30)
+    if x == "die":
+        os._exit(3)
+    if x == "quiet":
+        os._exit(0)
+    if x == "lock":
+        return threading.Lock()
+    time.sleep(0.05)
+    return f"ok:{x}"
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_results_keep_input_order_and_isolate_errors(mode):
+    items = ["a", "b", "boom", "c", "d"]
+    out = dispatch(_work, items, workers=3, mode=mode)
+    assert [o.index for o in out] == list(range(len(items)))
+    assert [o.value for o in out if o.ok] == ["ok:a", "ok:b", "ok:c", "ok:d"]
+    bad = out[2]
+    assert not bad.ok and "ValueError: bad file" in bad.error
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_stuck_item_times_out_without_blocking_batch(mode):
+    items = ["stuck"] + [str(i) for i in range(6)]
+    t0 = time.perf_counter()
+    out = dispatch(_work, items, workers=2, mode=mode, timeout=0.5)
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 5.0
+    assert out[0].timed_out and not out[0].ok
+    assert all(o.ok for o in out[1:])
+
+
+def test_parallel_is_faster_than_sequential():
+    items = [str(i) for i in range(8)]
+    t0 = time.perf_counter()
+    dispatch(_work, items, workers=8, mode="thread")
+    assert time.perf_counter() - t0 < 8 * 0.05
+
+
+def test_dead_child_is_reported():
+    out = dispatch(_work, ["die", "x"], workers=2, mode="process", timeout=10)
+    assert not out[0].ok and "exited with code 3" in out[0].error
+    assert out[1].ok
+
+
+def test_unpicklable_result_and_silent_exit_do_not_hang():
+    # no timeout: before, both items left the loop waiting forever
+    out = dispatch(_work, ["lock", "quiet", "x"], workers=3, mode="process")
+    assert not out[0].ok and "pickle" in out[0].error.lower()
+    assert not out[1].ok and "exited with code 0 without a result" in out[1].error
+    assert out[2].ok and out[2].value == "ok:x"
+
+
+def test_workers_default_from_env(monkeypatch):
+    monkeypatch.setenv("AIO_MAX_WORKERS", "1")
+    out = dispatch(_work, ["a", "b"])
+    assert [o.value for o in out] == ["ok:a", "ok:b"]
+
+
+def test_bad_mode_rejected():
+    with pytest.raises(ValueError):
+        dispatch(_work, ["a"], mode="fiber")
@@ -0,0 +1,82 @@
+# Path: tests/test_gate_cache.py
+from __future__ import annotations
+
+import os
+import time
+
+from core.gate_cache import GateCache, open_cache
+
+CMDS = {"build": ["npm", "run", "build"], "lint": ["npm", "run", "lint"]}
+
+
+def _tree(root):
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "a.ts").write_text("export const a = 1;\n", encoding="utf-8")
+    (root / "package.json").write_text('{"name": "fe"}', encoding="utf-8")
+    (root / "package-lock.json").write_text('{"lockfileVersion": 3}', encoding="utf-8")
+    (root / "node_modules" / "x").mkdir(parents=True)
+    (root / "node_modules" / "x" / "index.js").write_text("1", encoding="utf-8")
+    return root
+
+
+def test_fingerprint_tracks_inputs(tmp_path):
+    root = _tree(tmp_path / "fe")
+    gc = GateCache(tmp_path / "gc.sqlite")
+    tools = {"node": "v20", "npm": "10"}
+    k1 = gc.fingerprint(root, CMDS, tools)
+    assert gc.fingerprint(root, CMDS, tools) == k1
+
+    # node_modules does not count; sources, lockfile, tools and commands do
+    (root / "node_modules" / "x" / "index.js").write_text("2", encoding="utf-8")
+    assert gc.fingerprint(root, CMDS, tools) == k1
+    (root / "src" / "a.ts").write_text("export const a = 2;\n", encoding="utf-8")
+    k2 = gc.fingerprint(root, CMDS, tools)
+    assert k2 != k1
+    (root / "package-lock.json").write_text('{"lockfileVersion": 2}', encoding="utf-8")
+    k3 = gc.fingerprint(root, CMDS, tools)
+    assert k3 != k2
+    assert gc.fingerprint(root, CMDS, {"node": "v22", "npm": "10"}) != k3
+    assert gc.fingerprint(root, {"build": ["npm", "run", "build", "--x"]}, tools) != k3
+
+
+def test_touch_without_content_change_keeps_key(tmp_path):
+    root = _tree(tmp_path / "fe")
+    gc = GateCache(tmp_path / "gc.sqlite")
+    k1 = gc.fingerprint(root, CMDS)
+    p = root / "src" / "a.ts"
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert gc.fingerprint(root, CMDS) == k1
+
+
+def test_put_get_and_eviction(tmp_path):
+    gc = GateCache(tmp_path / "gc.sqlite", max_entries=2)
+    steps = {"build": {"cmd": "npm run build", "exit": 0, "pass": True}}
+    gc.put("k1", "r1", steps)
+    assert gc.get("k1") == {"run_id": "r1", "steps": steps, "created_at": gc.get("k1")["created_at"]}
+    time.sleep(0.01)
+    gc.put("k2", "r2", steps)
+    time.sleep(0.01)
+    gc.get("k1")  # k1 is now more recently used than k2
+    time.sleep(0.01)
+    gc.put("k3", "r3", steps)
+    assert gc.get("k2") is None and gc.get("k1") and gc.get("k3")
+
+    aged = GateCache(tmp_path / "gc.sqlite", max_age_s=0)
+    assert aged.stats()["entries"] == 0
+
+
+def test_failures_are_never_cached(tmp_path):
+    gc = GateCache(tmp_path / "gc.sqlite")
+    ok = {"cmd": "npm run build", "exit": 0, "pass": True}
+    flaky = {"cmd": "npm run test", "exit": 1, "pass": False}
+    assert not gc.put("k1", "r1", {"build": ok, "test": flaky})
+    assert not gc.put("k2", "r2", {"build": ok, "lint": {"cmd": "eslint", "exit": 127, "pass": False}})
+    assert gc.get("k1") is None and gc.get("k2") is None
+    assert gc.put("k1", "r3", {"build": ok, "test": {**flaky, "exit": 0, "pass": True}})
+    assert gc.get("k1")["run_id"] == "r3"
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setenv("AIO_GATE_CACHE", "off")
+    assert open_cache() is None
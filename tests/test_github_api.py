@@ -0,0 +1,119 @@
+# Path: tests/test_github_api.py
+from __future__ import annotations
+
+import json
+import time
+from urllib.parse import parse_qs, urlparse
+
+from app.services.github_api import GitHubAPI
+
+
+class _Resp:
+    def __init__(self, status, data=None, headers=None):
+        self.status_code = status
+        self._data = data
+        self.headers = {"x-ratelimit-remaining": "4000", "x-ratelimit-reset": str(time.time() + 3600),
+                        **(headers or {})}
+        self.text = json.dumps(data)
+
+    def json(self):
+        return self._data
+
+
+class FakeGitHub:
+    """Serves a tiny repo and honours If-None-Match like the real API."""
+
+    def __init__(self):
+        self.prs = {7: {"number": 7, "state": "open", "html_url": "https://gh/pr/7",
+                        "head": {"ref": "feat"}, "base": {"ref": "main"}}}
+        self.labels = {"analysis": {"name": "analysis"}}
+        self.issue_labels = {7: []}
+        self.log = []
+        self.remaining = 4000
+
+    def _ok(self, data, headers):
+        etag = '"%x"' % (hash(json.dumps(data, sort_keys=True)) & 0xFFFFFFFF)
+        if headers.get("If-None-Match") == etag:
+            return _Resp(304, None, {"etag": etag, "x-ratelimit-remaining": str(self.remaining)})
+        self.remaining -= 1
+        return _Resp(200, data, {"etag": etag, "x-ratelimit-remaining": str(self.remaining)})
+
+    def __call__(self, method, url, headers, body):
+        u = urlparse(url)
+        path, q = u.path.replace("/repos/o/r", ""), {k: v[0] for k, v in parse_qs(u.query).items()}
+        self.log.append((method, path, q.get("head")))
+        if method == "GET" and path == "/pulls":
+            hits = [p for p in self.prs.values() if p["state"] == "open"
+                    and ("head" not in q or q["head"] == "o:" + p["head"]["ref"])]
+            return self._ok(hits, headers)
+        if method == "GET" and path.startswith("/pulls/"):
+            return self._ok(self.prs[int(path.split("/")[2])], headers)
+        if method == "POST" and path == "/pulls":
+            n = max(self.prs) + 1
+            self.prs[n] = {"number": n, "state": "open", "html_url": f"https://gh/pr/{n}",
+                           "head": {"ref": body["head"]}, "base": {"ref": body["base"]}}
+            self.issue_labels[n] = []
+            return _Resp(201, self.prs[n])
+        if method == "PATCH" and path.startswith("/pulls/"):
+            pr = self.prs[int(path.split("/")[2])]
+            pr.update(body)
+            return _Resp(200, pr)
+        if method == "GET" and path.startswith("/labels/"):
+            name = path.split("/")[2]
+            return self._ok(self.labels[name], headers) if name in self.labels else _Resp(404, {"message": "Not Found"})
+        if method == "POST" and path == "/labels":
+            self.labels[body["name"]] = {"name": body["name"]}
+            return _Resp(201, self.labels[body["name"]])
+        if path.endswith("/labels") and path.startswith("/issues/"):
+            n = int(path.split("/")[2])
+            if method == "POST":
+                self.issue_labels[n] += [{"name": x} for x in body["labels"]]
+                return _Resp(200, self.issue_labels[n])
+            return self._ok(self.issue_labels[n], headers)
+        raise AssertionError((method, path))
+
+
+def test_branch_map_and_conditional_requests(tmp_path):
+    fake = FakeGitHub()
+    api = GitHubAPI("o/r", "t", tmp_path / "gh.sqlite", transport=fake)
+    assert api.find_pr("feat", "main")["number"] == 7
+    assert fake.log[-1] == ("GET", "/pulls", "o:feat")  # head-filtered, never a full scan
+    assert api.find_or_create_pr("t", "b", "feat", "main")["number"] == 7
+    assert fake.log[-1] == ("GET", "/pulls/7", None)  # from the branch map
+
+    # a second process sharing the cache file answers from 304s
+    api2 = GitHubAPI("o/r", "t", tmp_path / "gh.sqlite", transport=fake)
+    before = fake.remaining
+    assert api2.find_pr("feat", "main")["number"] == 7
+    assert fake.remaining == before and api2.counts["not_modified"] == 1
+
+    # closed PR falls out of the map; a new one is created and remembered
+    api.close_pull(7)
+    pr = api.find_or_create_pr("t", "b", "feat", "main")
+    assert pr["number"] == 8 and api.stats()["branch_prs"] == 1
+
+
+def test_labels_idempotent_and_cached(tmp_path):
+    fake = FakeGitHub()
+    api = GitHubAPI("o/r", "t", tmp_path / "gh.sqlite", transport=fake)
+    labels = {"ts-migration": "0E8A16", "analysis": "5319E7"}
+    assert api.add_labels(7, labels) == ["ts-migration", "analysis"]
+    assert "ts-migration" in fake.labels
+    assert api.add_labels(7, labels) == []  # label list changed: one fresh 200
+    fake.log.clear()
+    before = fake.remaining
+    assert api.add_labels(7, labels) == []
+    assert fake.log == [("GET", "/issues/7/labels", None)] and fake.remaining == before
+    assert api.counts["not_modified"] == 1
+
+
+def test_paces_when_budget_runs_low(tmp_path):
+    fake = FakeGitHub()
+    slept = []
+    api = GitHubAPI("o/r", "t", None, transport=fake, sleep=slept.append)
+    api.low = 100
+    fake.remaining = 50
+    api.find_pr("feat", "main")
+    assert slept == []  # nothing known before the first response
+    api.find_pr("other", "main")
+    assert len(slept) == 1 and 0 < slept[0] <= api.max_sleep
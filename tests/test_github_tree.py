@@ -0,0 +1,74 @@
+# Path: tests/test_github_tree.py
+from __future__ import annotations
+
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.github_tree import blob_sha, plan_upload, push_files
+
+
+def test_blob_sha_matches_git(tmp_path):
+    p = tmp_path / "a.ts"
+    p.write_bytes(b"export const a = 1;\n")
+    try:
+        want = subprocess.run(["git", "hash-object", str(p)], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("git not available")
+    assert blob_sha(p.read_bytes()) == want
+    assert blob_sha(b"") == "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+
+
+def test_plan_skips_unchanged_and_inlines_small_text():
+    base = {"src/same.ts": blob_sha(b"same\n"), "src/edit.ts": blob_sha(b"old\n")}
+    plan = plan_upload([
+        ("src/same.ts", b"same\n"),
+        ("src/edit.ts", b"new\n"),
+        ("src/new.ts", b"x" * 10),
+        ("src/big.ts", b"y" * 100),
+        ("img/logo.png", b"\x89PNG\xff\x00"),
+    ], base, inline_max=64)
+    assert plan.unchanged == ["src/same.ts"]
+    assert plan.inline == [("src/edit.ts", "new\n"), ("src/new.ts", "x" * 10)]
+    assert [p for p, _d in plan.blobs] == ["src/big.ts", "img/logo.png"]
+    assert plan.changed == 4
+
+
+class _Repo:
+    def __init__(self, base):
+        self.base = base
+        self.calls = []
+
+    def get_git_tree(self, sha, recursive=False):
+        self.calls.append("tree")
+        return SimpleNamespace(tree=[SimpleNamespace(path=p, sha=s, type="blob") for p, s in self.base.items()])
+
+    def create_git_blob(self, content, encoding):
+        self.calls.append("blob")
+        return SimpleNamespace(sha=f"blob-{len(content)}-{encoding}")
+
+    def create_git_tree(self, elements, base_tree=None):
+        self.calls.append(("mktree", len(elements)))
+        return SimpleNamespace(sha=f"tree{len(self.calls)}")
+
+    def create_git_commit(self, message, tree, parents):
+        self.calls.append(("commit", message))
+        return SimpleNamespace(sha=f"c{len(self.calls)}", tree=tree)
+
+
+def test_push_only_sends_delta_and_chunks_commits():
+    pytest.importorskip("github")
+    base_commit = SimpleNamespace(sha="base", tree=SimpleNamespace(sha="t0"))
+    files = [(f"src/f{i}.ts", f"v{i}\n".encode()) for i in range(5)] + [("bin/x", b"\xff\xfe")]
+    repo = _Repo({"src/f0.ts": blob_sha(b"v0\n"), "src/f1.ts": blob_sha(b"v1\n")})
+    res = push_files(repo, base_commit, files, "msg", max_files=2)
+    assert (res.unchanged, res.inline, res.blobs) == (2, 3, 1)
+    assert repo.calls.count("blob") == 1
+    assert [c for c in repo.calls if isinstance(c, tuple) and c[0] == "commit"] == [
+        ("commit", "msg (1/2)"), ("commit", "msg (2/2)")]
+    assert len(res.commits) == 2 and res.commit.sha == res.commits[-1]
+
+    repo = _Repo({p: blob_sha(d) for p, d in files})
+    res = push_files(repo, base_commit, files, "msg")
+    assert res.unchanged == 6 and "blob" not in repo.calls and len(res.commits) == 1
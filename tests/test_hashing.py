@@ -0,0 +1,39 @@
+# Path: tests/test_hashing.py
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from core import hashing
+from core.hashing import hash_file, hash_files, iter_hashes
+
+
+def test_hash_small_large_and_prefix(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(hashing, "SMALL_FILE_BYTES", 1024)
+    monkeypatch.setattr(hashing, "MMAP_SLICE_BYTES", 4096)
+    small = tmp_path / "s.js"
+    small.write_bytes(b"export const a = 1;\n")
+    big = tmp_path / "b.bin"
+    big.write_bytes(bytes(range(256)) * 100)  # mmap path, several slices
+    empty = tmp_path / "e.txt"
+    empty.write_bytes(b"")
+
+    for p in (small, big, empty):
+        data = p.read_bytes()
+        assert hash_file(p) == hashlib.sha1(data).hexdigest()
+        assert hash_file(p, "sha256") == hashlib.sha256(data).hexdigest()
+    assert hash_file(big, max_bytes=100) == hashlib.sha1(big.read_bytes()[:100]).hexdigest()
+
+
+def test_batch_and_streaming_agree(tmp_path: Path):
+    paths = []
+    for i in range(40):
+        p = tmp_path / f"f{i}.ts"
+        p.write_text("x" * i, encoding="utf-8")
+        paths.append(p)
+    missing = tmp_path / "gone.ts"
+
+    batch = hash_files(paths + [missing], workers=4)
+    assert batch[missing] is None
+    assert all(batch[p] == hashlib.sha1(p.read_bytes()).hexdigest() for p in paths)
+    assert dict(iter_hashes(iter(paths), workers=1)) == {p: batch[p] for p in paths}
@@ -0,0 +1,46 @@
+# Path: tests/test_http_transport.py
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import http_transport
+
+pytestmark = pytest.mark.skipif(not http_transport.available(), reason="requests/httpx not installed")
+
+
+class _Echo(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    peers: set = set()
+
+    def do_POST(self):
+        _Echo.peers.add(self.client_address)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        out = json.dumps({"echo": json.loads(body or b"{}")}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+    def log_message(self, *a):
+        pass
+
+
+def test_post_reuses_one_pooled_connection():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Echo)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{srv.server_address[1]}/v1"
+    try:
+        assert http_transport.client("test") is http_transport.client("TEST")
+        for i in range(5):
+            r = http_transport.post("test", url, json={"i": i}, timeout=5)
+            r.raise_for_status()
+            assert r.json() == {"echo": {"i": i}}
+        assert len(_Echo.peers) == 1  # one TCP connection served every call
+    finally:
+        http_transport.close_all()
+        srv.shutdown()
@@ -0,0 +1,108 @@
+# Path: tests/test_import_index.py
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from app.import_index import ImportIndex
+
+
+def _write(root: Path, rel: str, text: str) -> Path:
+    p = root / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+    return p
+
+
+def _bump(p: Path, text: str) -> None:
+    st = p.stat()
+    p.write_text(text, encoding="utf-8")
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def _tree(root: Path) -> None:
+    _write(root, "src/utils/math.ts", "export const add = (a, b) => a + b;\n")
+    _write(root, "src/utils/index.ts", "export * from './math';\n")
+    _write(root, "src/lib/price.ts", "import { add } from '@/utils';\nexport const total = add(1, 2);\n")
+    _write(root, "src/App.tsx", "import { total } from './lib/price';\nimport React from 'react';\n")
+
+
+def test_queries_and_incremental_sync(tmp_path):
+    root = tmp_path / "fe"
+    _tree(root)
+    idx = ImportIndex(tmp_path / "idx.sqlite")
+    s = idx.sync(root, aliases={"@/": "src"})
+    assert (s.seen, s.added, s.changed, s.removed) == (4, 4, 0, 0)
+    r = root.resolve()
+    assert idx.dependencies(r / "src/lib/price.ts") == [r / "src/utils/index.ts"]
+    assert idx.dependents(r / "src/utils/math.ts") == [r / "src/utils/index.ts"]
+    assert idx.dependents(r / "src/utils/math.ts", transitive=True) == sorted(
+        [r / "src/utils/index.ts", r / "src/lib/price.ts", r / "src/App.tsx"])
+
+    # nothing moved: nothing re-lexed or re-resolved
+    s = idx.sync(root, aliases={"@/": "src"})
+    assert (s.added, s.changed, s.removed, s.resolved) == (0, 0, 0, 0)
+
+    # one edit: only that file's edges are recomputed
+    _bump(r / "src/App.tsx", "import { add } from './utils/math';\n")
+    s = idx.sync(root, aliases={"@/": "src"})
+    assert (s.changed, s.resolved) == (1, 1)
+    assert idx.dependencies(r / "src/App.tsx") == [r / "src/utils/math.ts"]
+    assert idx.dependents(r / "src/lib/price.ts") == []
+
+    # a new file can satisfy an import that used to dangle elsewhere
+    _bump(r / "src/lib/price.ts", "import { tax } from './tax';\n")
+    idx.sync(root, aliases={"@/": "src"})
+    assert idx.dependencies(r / "src/lib/price.ts") == []
+    _write(root, "src/lib/tax.ts", "export const tax = 1;\n")
+    s = idx.sync(root, aliases={"@/": "src"})
+    assert s.added == 1 and s.resolved == 5
+    assert idx.dependencies(r / "src/lib/price.ts") == [r / "src/lib/tax.ts"]
+
+    (r / "src/lib/tax.ts").unlink()
+    s = idx.sync(root, aliases={"@/": "src"})
+    assert s.removed == 1 and idx.dependencies(r / "src/lib/price.ts") == []
+    idx.close()
+
+
+def test_persisted_across_reopen_and_graph(tmp_path):
+    root = tmp_path / "fe"
+    _tree(root)
+    db = tmp_path / "idx.sqlite"
+    ImportIndex(db).sync(root, aliases={"@/": "src"})
+    idx = ImportIndex(db)
+    s = idx.sync(root, aliases={"@/": "src"})
+    assert (s.added, s.changed, s.resolved) == (0, 0, 0)
+    r = root.resolve()
+    g = idx.graph(root)
+    assert len(g.modules) == 4
+    assert g.affected([r / "src/utils/math.ts"]) == {
+        r / "src/utils/math.ts", r / "src/utils/index.ts", r / "src/lib/price.ts", r / "src/App.tsx"}
+    # alias change re-resolves everything from the stored specifiers
+    s = idx.sync(root, aliases={"~/": "src"})
+    assert s.resolved == 4 and idx.dependencies(r / "src/lib/price.ts") == []
+
+
+def test_batches_leaf_first_with_cycle(tmp_path):
+    root = tmp_path / "fe"
+    _tree(root)
+    _write(root, "src/a.ts", "import './b';\n")
+    _write(root, "src/b.ts", "import './a';\n")
+    idx = ImportIndex(tmp_path / "idx.sqlite")
+    idx.sync(root, aliases={"@/": "src"})
+    r = root.resolve()
+
+    def names(batches):
+        return [[p.relative_to(r).as_posix() for p in b] for b in batches]
+
+    every = [r / "src/App.tsx", r / "src/lib/price.ts", r / "src/utils/index.ts", r / "src/utils/math.ts",
+             r / "src/a.ts", r / "src/b.ts"]
+    assert names(idx.batches(every)) == [
+        ["src/utils/math.ts"], ["src/utils/index.ts"], ["src/lib/price.ts"], ["src/App.tsx"],
+        ["src/a.ts", "src/b.ts"],
+    ]
+    # order holds through files outside the requested set (App -> price -> utils)
+    assert names(idx.batches([r / "src/App.tsx", r / "src/utils/index.ts", r / "src/a.ts"])) == [
+        ["src/utils/index.ts"], ["src/App.tsx"], ["src/a.ts"]]
+    assert [p.name for p in idx.leaf_first([r / "src/lib/price.ts", r / "src/utils/math.ts"])] == [
+        "math.ts", "price.ts"]
@@ -0,0 +1,57 @@
+# Path: tests/test_js_lexer.py
+from __future__ import annotations
+
+from core import js_lexer
+from core.js_lexer import scan_source, scan_sources
+
+SRC = r'''
+// function commented(
+import React, { useState } from "react";
+const fs = require('fs');
+export { helper as aid } from './util';
+const s = "function inString(";
+const t = `function inTpl( ${ (() => 1)() } ${`nested ${x}`}`;
+const re = /function\s+(inRegex)\(/g;
+const ratio = a / b / c;
+function plain(a) { return a; }
+export default function App() { return <div className="x">Hi</div>; }
+export const Button: React.FC<Props> = ({ label }) => <button>{label}</button>;
+const cb = async (x: number): Promise<{ a: number }> => ({ a: x });
+const notFn = compute(1, 2);
+class Store extends Base {
+  state = { a: 1 };
+  static create(): Store { return new Store(); }
+  private onClick = (e) => { this.go(e); };
+}
+'''
+
+
+def test_declarations_skip_literals_and_comments():
+    f = scan_source(SRC, ".tsx")
+    assert f.functions == ["plain", "App", "Button", "cb", "Store.create", "Store.onClick"]
+    assert f.classes == ["Store"]
+    assert f.exports == ["aid", "default", "Button"]
+    assert f.imports == ["react", "fs", "./util"]
+    assert f.has_jsx and f.default_export
+
+
+def test_jsx_gated_by_suffix_and_context():
+    assert not scan_source("const x = a < b && c > d;", ".js").has_jsx
+    assert not scan_source("const el = <div/>;", ".ts").has_jsx
+    assert scan_source("const el = <><b/></>;", ".jsx").has_jsx
+
+
+def test_tsx_generic_arrow_is_not_jsx():
+    assert not scan_source("export const f = <T,>(x: T) => x;", ".tsx").has_jsx
+    assert not scan_source("const g = <T extends object>(x: T) => x;", ".tsx").has_jsx
+    assert scan_source('const el = <Foo extends="x" />;', ".tsx").has_jsx
+    assert scan_source("const el = <Item key={1}>a, b</Item>;", ".tsx").has_jsx
+
+
+def test_batch_matches_single():
+    items = [(SRC, ".tsx"), ("function a() {}", ".js")] * 40
+    assert [f.functions for f in scan_sources(items, workers=2)] == [scan_source(t, s).functions for t, s in items]
+    pool = js_lexer._POOL
+    assert pool is not None
+    scan_sources(items, workers=2)
+    assert js_lexer._POOL is pool  # reused, not rebuilt per call
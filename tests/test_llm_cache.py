@@ -0,0 +1,81 @@
+# Path: tests/test_llm_cache.py
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from app.services import llm_cache
+from app.services.llm import openai_client
+
+
+def test_key_covers_every_input():
+    base = llm_cache.cache_key("openai", "m", "sys", "prompt", 0.2)
+    assert base == llm_cache.cache_key("OpenAI", "m", "sys", "prompt", 0.2)
+    assert base != llm_cache.cache_key("openai", "m2", "sys", "prompt", 0.2)
+    assert base != llm_cache.cache_key("openai", "m", "sys2", "prompt", 0.2)
+    assert base != llm_cache.cache_key("openai", "m", "sys", "prompt!", 0.2)
+    assert base != llm_cache.cache_key("openai", "m", "sys", "prompt", 0.3)
+    assert base != llm_cache.cache_key("openai", "m", "sys", "prompt", 0.2, max_tokens=10)
+
+
+def test_cached_text_hits_and_skips_failures(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("AIO_LLM_CACHE", str(tmp_path / "c.sqlite"))
+    monkeypatch.delenv("AIO_LLM_CACHE_BYPASS", raising=False)
+    calls = []
+
+    def live():
+        calls.append(1)
+        return "answer"
+
+    assert llm_cache.cached_text("openai", "m", "s", "p", 0.2, live) == "answer"
+    assert llm_cache.cached_text("openai", "m", "s", "p", 0.2, live) == "answer"
+    assert len(calls) == 1
+
+    assert llm_cache.cached_text("openai", "m", "s", "other", 0.2, lambda: None) is None
+    stats = llm_cache.open_cache().stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["stores"] == 1 and stats["rows"] == 1
+
+    monkeypatch.setenv("AIO_LLM_CACHE_BYPASS", "1")
+    assert llm_cache.cached_text("openai", "m", "s", "p", 0.2, live) == "answer"
+    assert len(calls) == 2
+
+
+def test_disabled_cache_always_calls(monkeypatch):
+    monkeypatch.setenv("AIO_LLM_CACHE", "off")
+    calls = []
+    for _ in range(2):
+        llm_cache.cached_text("openai", "m", "s", "p", 0.2, lambda: calls.append(1) or "x")
+    assert len(calls) == 2
+
+
+def test_age_and_size_eviction(tmp_path: Path):
+    cache = llm_cache.LLMCache(tmp_path / "c.sqlite", max_bytes=10, max_age_s=3600)
+    cache.put("old", "openai", "m", "aaaa")
+    cache._conn.execute("UPDATE responses SET used_at = ? WHERE key = 'old'", (time.time() - 7200,))
+    cache.put("a", "openai", "m", "bbbbbb")
+    cache.put("b", "openai", "m", "cccccc")
+    assert cache.evict() == 2  # 'old' by age, then least-recently-used 'a' by size
+    assert cache.get("b") == "cccccc" and cache.get("a") is None
+    cache.close()
+
+
+class _Resp:
+    status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"choices": [{"message": {"content": "converted"}}]}
+
+
+def test_openai_chat_is_cached(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("AIO_LLM_CACHE", str(tmp_path / "c.sqlite"))
+    monkeypatch.setenv("AIO_LLM_STREAM", "0")
+    monkeypatch.setattr(openai_client, "available", lambda: True)
+    calls = []
+    monkeypatch.setattr(openai_client.rate_limiter, "post", lambda *a, **k: calls.append(1) or _Resp())
+    msgs = [{"role": "system", "content": "sys"}, {"role": "user", "content": "code"}]
+    assert openai_client._chat(msgs) == "converted"
+    assert openai_client._chat(msgs) == "converted"
+    assert len(calls) == 1
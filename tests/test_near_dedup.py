@@ -0,0 +1,50 @@
+# Path: tests/test_near_dedup.py
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.near_dedup import NearDupConfig, cluster_files, normalize_tokens, signatures  # noqa: E402
+
+BODY = "\n".join(
+    f"export function handler{i}(req, res) {{ const v = req.body.item{i} ?? {i}; return res.json({{ v }}); }}"
+    for i in range(40)
+)
+
+
+def test_normalize_ignores_comments_and_whitespace():
+    a = normalize_tokens("// header v1\nconst a=1;\n/* x */ foo( a )")
+    b = normalize_tokens("const  a = 1;\n\nfoo(a)")
+    assert a == b
+
+
+def test_signatures_identical_for_reformatted_copy():
+    sig, valid = signatures([BODY, "/* banner */\n" + BODY.replace(" ", "  "), ""])
+    assert valid.tolist() == [True, True, False]
+    assert (sig[0] == sig[1]).all()
+
+
+def test_cluster_files_groups_near_copies(tmp_path: Path):
+    (tmp_path / "a.js").write_text("// copy A\nimport x from 'x';\n" + BODY, encoding="utf-8")
+    (tmp_path / "b.ts").write_text("import x from 'x';\n\n" + BODY + "\nexport const extra = 1;", encoding="utf-8")
+    (tmp_path / "other.js").write_text(
+        "\n".join(f"let unrelated{i} = compute({i}, 'k{i}');" for i in range(60)), encoding="utf-8"
+    )
+
+    def rank(p):
+        return (0 if p.suffix == ".ts" else 1, str(p))
+
+    clusters = cluster_files(sorted(tmp_path.iterdir()), rank, NearDupConfig(threshold=0.7))
+    by_rep = {c.representative.name: sorted(m.name for m in c.members) for c in clusters}
+    assert by_rep == {"b.ts": ["a.js", "b.ts"], "other.js": ["other.js"]}
+
+
+def test_small_blocks_and_perm_chunks_match_one_block():
+    texts = [BODY, "", BODY.replace("handler", "h"), "let x = 1;"]
+    whole, valid = signatures(texts, NearDupConfig(batch_shingles=10**9, block_bytes=1 << 40))
+    # one shingle budget per block and a byte cap forcing permutation chunks
+    tiny, tiny_valid = signatures(iter(texts), NearDupConfig(batch_shingles=1, block_bytes=4096))
+    assert (whole == tiny).all() and valid.tolist() == tiny_valid.tolist()
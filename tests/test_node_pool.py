@@ -0,0 +1,48 @@
+# Path: tests/test_node_pool.py
+from __future__ import annotations
+
+import pytest
+
+from app.services.node_pool import NodePool, NodeUnavailable, NodeWorkerError, node_bin
+
+pytestmark = pytest.mark.skipif(node_bin() is None, reason="node not installed")
+
+
+def test_pool_pipelines_and_restarts():
+    pool = NodePool(2)
+    try:
+        futs = [pool.submit("ping") for _ in range(50)]
+        pids = {f.result(timeout=30)["pid"] for f in futs}
+        assert 1 <= len(pids) <= 2
+
+        with pytest.raises(NodeWorkerError, match="unknown op"):
+            pool.call("nope", timeout=30)
+
+        for w in pool.workers:
+            if w.alive:
+                w._proc.kill()
+                w._proc.wait()
+        assert pool.call("ping", timeout=30)["pid"] not in pids
+    finally:
+        pool.close()
+
+
+def test_batch_items_fail_independently(tmp_path):
+    pool = NodePool(1)
+    try:
+        res = pool.map("acorn.parseBatch", [{"path": str(tmp_path / "missing.js")}], timeout=30)
+        assert len(res) == 1 and res[0]["ok"] is False
+    finally:
+        pool.close()
+
+
+def test_unstartable_node_raises_node_unavailable(tmp_path, monkeypatch):
+    fake = tmp_path / "node"
+    fake.write_text("not a binary", encoding="utf-8")  # exists, not executable
+    monkeypatch.setenv("AIO_NODE_BIN", str(fake))
+    pool = NodePool(1)
+    try:
+        with pytest.raises(NodeUnavailable, match="cannot start"):
+            pool.call("ping", timeout=5)
+    finally:
+        pool.close()
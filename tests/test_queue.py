@@ -0,0 +1,165 @@
+# Path: tests/test_queue.py
+from __future__ import annotations
+
+import multiprocessing as mp
+import threading
+import time
+
+from core.queue import WorkQueue, work
+
+
+def test_priority_then_fifo_and_bulk(tmp_path):
+    q = WorkQueue(tmp_path / "q.sqlite")
+    ids = q.enqueue_many([{"kind": "k", "payload": i} for i in range(3)])
+    hi = q.enqueue("k", "urgent", priority=5)
+    got = q.dequeue(10, owner="w")
+    assert [j.id for j in got] == [hi, *ids]
+    assert all(j.attempts == 1 for j in got)
+    assert q.dequeue(1, owner="w") == []
+    assert q.stats()["leased"] == 4
+
+
+def test_ack_and_result(tmp_path):
+    q = WorkQueue(tmp_path / "q.sqlite")
+    q.enqueue("k", {"a": 1})
+    job = q.dequeue(owner="w")[0]
+    assert job.payload == {"a": 1}
+    assert q.ack(job, {"ok": True})
+    rec = q.get(job.id)
+    assert rec["state"] == "done" and rec["result"] == {"ok": True}
+
+
+def test_lease_expiry_redelivers_and_dead_letters(tmp_path):
+    q = WorkQueue(tmp_path / "q.sqlite", max_attempts=2)
+    jid = q.enqueue("k", "x")
+    first = q.dequeue(owner="a", visibility_s=0.05)[0]
+    time.sleep(0.1)
+    second = q.dequeue(owner="b", visibility_s=0.05)[0]
+    assert second.id == jid and second.attempts == 2
+    assert not q.ack(first)  # lease was lost to b
+    time.sleep(0.1)
+    assert q.dequeue(owner="c") == []
+    assert q.stats()["dead"] == 1
+    assert q.dead_letters()[0]["id"] == jid
+    assert q.requeue_dead() == 1 and q.stats()["ready"] == 1
+
+
+def test_nack_backoff_then_dead(tmp_path):
+    q = WorkQueue(tmp_path / "q.sqlite", max_attempts=2, backoff_s=0.05)
+    q.enqueue("k", "x")
+    job = q.dequeue(owner="w")[0]
+    assert q.nack(job, "boom") == "ready"
+    assert q.dequeue(owner="w") == []  # still backing off
+    time.sleep(0.08)
+    job = q.dequeue(owner="w")[0]
+    assert q.nack(job, "boom again") == "dead"
+    assert q.get(job.id)["last_error"] == "boom again"
+
+
+def test_key_dedups_pending_jobs(tmp_path):
+    q = WorkQueue(tmp_path / "q.sqlite")
+    a = q.enqueue("convert", {"src": "a.js"}, key="convert:a.js")
+    assert q.enqueue("convert", {"src": "a.js"}, key="convert:a.js") == a
+    q.ack(q.dequeue(owner="w")[0])
+    assert q.enqueue("convert", {"src": "a.js"}, key="convert:a.js") != a
+
+
+def test_work_loop_handles_failures(tmp_path):
+    q = WorkQueue(tmp_path / "q.sqlite", max_attempts=1)
+    q.enqueue_many([{"kind": "sq", "payload": i} for i in range(4)] + [{"kind": "sq", "payload": "bad"}])
+
+    def sq(x):
+        return x * x if isinstance(x, int) else int(x)
+
+    counts = work(q, {"sq": sq}, batch=2, idle_exit=True)
+    assert counts == {"done": 4, "ready": 0, "dead": 1, "lost": 0}
+    assert q.dead_letters()[0]["last_error"].startswith("ValueError")
+
+
+def test_heartbeat_keeps_long_jobs_leased(tmp_path):
+    db = tmp_path / "q.sqlite"
+    q = WorkQueue(db, visibility_s=0.3)
+    q.enqueue_many([{"kind": "slow", "payload": i} for i in range(2)])
+    ran = []
+
+    def slow(x):
+        ran.append(x)
+        time.sleep(1.0)
+        return x
+
+    stop = threading.Event()
+    other = {}
+    rival = threading.Thread(target=lambda: other.update(work(
+        WorkQueue(db, visibility_s=0.3), {"slow": slow}, poll_s=0.05, stop=stop)))
+    counts = {}
+    runner = threading.Thread(target=lambda: counts.update(work(q, {"slow": slow}, batch=2, idle_exit=True)))
+    runner.start()
+    time.sleep(0.1)  # the runner claims both jobs before the rival starts polling
+    rival.start()
+    runner.join(10)
+    stop.set()
+    rival.join(10)
+    assert sorted(ran) == [0, 1]  # the second job also waited past the 0.3 s lease
+    assert counts == {"done": 2, "ready": 0, "dead": 0, "lost": 0}
+    assert other == {"done": 0, "ready": 0, "dead": 0, "lost": 0}
+
+
+def _drain(db, out):
+    q = WorkQueue(db)
+    seen = []
+    work(q, {"k": lambda p: seen.append(p) or p}, batch=3, idle_exit=True)
+    out.put(seen)
+
+
+def test_several_processes_drain_without_duplicates(tmp_path):
+    db = tmp_path / "q.sqlite"
+    q = WorkQueue(db)
+    q.enqueue_many([{"kind": "k", "payload": i} for i in range(60)])
+    out = mp.Queue()
+    procs = [mp.Process(target=_drain, args=(db, out)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    seen = [x for _ in procs for x in out.get(timeout=30)]
+    for p in procs:
+        p.join(10)
+    assert sorted(seen) == list(range(60))
+    assert q.stats()["done"] == 60
+
+
+def test_review_batch_kind_is_wired(tmp_path):
+    from app.services import queue_tasks
+
+    with WorkQueue(tmp_path / "q.sqlite") as q:
+        jid = queue_tasks.enqueue_review(q, ["a.tsx"], "r1", ".", batch=True)
+        assert q.get(jid)["kind"] == "review-batch"
+    assert queue_tasks.HANDLERS["review-batch"] is queue_tasks.review_batch
+
+
+def test_review_batch_outlives_its_lease_without_rerun(tmp_path, monkeypatch):
+    from app import review_multi
+    from app.services import queue_tasks
+
+    calls = []
+
+    def slow_batch(files, run_id, root):
+        calls.append(run_id)
+        time.sleep(1.0)  # stands in for hours of Batch API polling
+        return ["link"]
+
+    monkeypatch.setattr(review_multi, "run_batch", slow_batch)
+    db = tmp_path / "q.sqlite"
+    q = WorkQueue(db, visibility_s=0.3)
+    jid = queue_tasks.enqueue_review(q, ["a.tsx"], "r1", ".", batch=True)
+    stop = threading.Event()
+    rival = threading.Thread(target=lambda: work(WorkQueue(db, visibility_s=0.3), queue_tasks.HANDLERS,
+                                                 poll_s=0.05, stop=stop))
+    runner = threading.Thread(target=lambda: work(q, queue_tasks.HANDLERS, idle_exit=True))
+    runner.start()
+    time.sleep(0.1)
+    rival.start()
+    runner.join(10)
+    stop.set()
+    rival.join(10)
+    assert calls == ["r1"]
+    rec = q.get(jid)
+    assert rec["state"] == "done" and rec["attempts"] == 1 and rec["result"] == {"links": ["link"]}
@@ -0,0 +1,47 @@
+# Path: tests/test_ranking.py
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+import core.ranking as ranking
+from core.ranking import FeatureMatrix, RankWeights, ext_code, score_one, top_k
+
+
+def _rows(n: int = 500):
+    rnd = random.Random(7)
+    exts = [".ts", ".tsx", ".js", ".jsx", ".mjs"]
+    return [
+        (Path(f"f{i}{rnd.choice(exts)}"), rnd.choice([100, 2048, 80_000, 300_000]),
+         rnd.randint(0, 12), rnd.randint(0, 5), rnd.random() < 0.3)
+        for i in range(n)
+    ]
+
+
+def _reference(rows, k, w):
+    scored = [(p, score_one(ext_code(p), s, f, i, j, w)) for p, s, f, i, j in rows]
+    return sorted(scored, key=lambda t: t[1], reverse=True)[:k]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("k", [1, 25, 500])
+def test_top_k_matches_stable_sort(monkeypatch, use_numpy, k):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(ranking, "np", None)
+    rows = _rows()
+    w = RankWeights(jsx=0.05, per_import=0.01, import_cap=0.03)
+    got = top_k(FeatureMatrix(rows), k, w)
+    want = _reference(rows, k, w)
+    assert [p for p, _ in got] == [p for p, _ in want]
+    assert [s for _, s in got] == pytest.approx([s for _, s in want])
+
+
+def test_weights_from_env(monkeypatch):
+    monkeypatch.setenv("AIO_RANK_WEIGHTS", '{"jsx": 0.2, "bogus": 1}')
+    assert RankWeights.from_env().jsx == 0.2
+    monkeypatch.setenv("AIO_RANK_WEIGHTS", "not json")
+    assert RankWeights.from_env() == RankWeights()
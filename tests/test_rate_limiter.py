@@ -0,0 +1,114 @@
+# Path: tests/test_rate_limiter.py
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.services import rate_limiter
+
+
+class _Resp:
+    def __init__(self, status: int, headers: dict | None = None) -> None:
+        self.status_code = status
+        self.headers = headers or {}
+
+
+class RateLimitError(Exception):
+    def __init__(self, headers: dict) -> None:
+        super().__init__("slow down")
+        self.status_code = 429
+        self.response = _Resp(429, headers)
+
+
+@pytest.fixture(autouse=True)
+def _fresh(monkeypatch):
+    for k in ("AIO_RL_TEST_RPM", "AIO_RL_TEST_TPM", "AIO_RL_TEST_CONCURRENCY", "AIO_RL_TEST_MAX_CONCURRENCY"):
+        monkeypatch.delenv(k, raising=False)
+    rate_limiter.reset()
+    yield
+    rate_limiter.reset()
+
+
+def test_retry_after_header_forms():
+    assert rate_limiter.retry_after({"retry-after": "3"}) == 3.0
+    assert rate_limiter.retry_after({"retry-after-ms": "250"}) == 0.25
+    assert rate_limiter.retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert rate_limiter.retry_after({}) is None
+
+
+def test_429_pauses_provider_and_halves_window():
+    responses = iter([_Resp(429, {"retry-after": "0.2"}), _Resp(200)])
+    t0 = time.monotonic()
+    out = rate_limiter.call("test", lambda: next(responses), sleep=pytest.fail)
+    assert out.status_code == 200
+    assert time.monotonic() - t0 >= 0.2
+    snap = rate_limiter.limiter("test").snapshot()
+    assert snap["throttled"] == 1 and snap["retried"] == 1 and snap["ok"] == 1
+    assert snap["limit"] == pytest.approx(2.5)  # 4 -> 2 on 429, +1/2 on success
+
+
+def test_5xx_backs_off_without_shrinking_window():
+    responses = iter([_Resp(503), _Resp(200)])
+    slept = []
+    assert rate_limiter.call("test", lambda: next(responses), sleep=slept.append).status_code == 200
+    assert len(slept) == 1
+    assert rate_limiter.limiter("test").snapshot()["throttled"] == 0
+
+
+def test_sdk_exception_retried_then_reraised():
+    def boom():
+        raise RateLimitError({"retry-after-ms": "10"})
+    with pytest.raises(RateLimitError):
+        rate_limiter.call("test", boom, retries=2, sleep=lambda s: None)
+    assert rate_limiter.limiter("test").snapshot()["calls"] == 3
+
+
+def test_non_retryable_returns_immediately():
+    calls = []
+    def bad():
+        calls.append(1)
+        return _Resp(400)
+    assert rate_limiter.call("test", bad, sleep=lambda s: None).status_code == 400
+    assert len(calls) == 1
+
+
+def test_additive_increase_capped(monkeypatch):
+    monkeypatch.setenv("AIO_RL_TEST_CONCURRENCY", "1")
+    monkeypatch.setenv("AIO_RL_TEST_MAX_CONCURRENCY", "3")
+    for _ in range(50):
+        rate_limiter.call("test", lambda: _Resp(200))
+    assert rate_limiter.limiter("test").snapshot()["limit"] == 3
+
+
+def test_concurrency_window_bounds_inflight(monkeypatch):
+    monkeypatch.setenv("AIO_RL_TEST_CONCURRENCY", "2")
+    monkeypatch.setenv("AIO_RL_TEST_MAX_CONCURRENCY", "2")
+    live, peak, lock = [0], [0], threading.Lock()
+
+    def work():
+        with lock:
+            live[0] += 1
+            peak[0] = max(peak[0], live[0])
+        time.sleep(0.02)
+        with lock:
+            live[0] -= 1
+        return _Resp(200)
+
+    threads = [threading.Thread(target=rate_limiter.call, args=("test", work)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
+
+
+def test_rpm_bucket_paces_requests(monkeypatch):
+    monkeypatch.setenv("AIO_RL_TEST_RPM", "600")  # 10/s, burst of 100
+    lim = rate_limiter.limiter("test")
+    lim.requests.capacity = lim.requests.level = 2.0
+    t0 = time.monotonic()
+    for _ in range(4):
+        rate_limiter.call("test", lambda: _Resp(200))
+    assert time.monotonic() - t0 >= 0.15  # 2 from burst, 2 more at 10/s
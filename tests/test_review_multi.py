@@ -0,0 +1,135 @@
+# Path: tests/test_review_multi.py
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from app import review_multi
+
+
+def _fake_providers(monkeypatch, delay: float = 0.05):
+    live = {"openai": 0, "gemini": 0, "grok": 0}
+    peak = dict(live)
+    lock = threading.Lock()
+
+    def make(provider: str, score: int):
+        def call(prompt: str, model: str = "") -> dict:
+            with lock:
+                live[provider] += 1
+                peak[provider] = max(peak[provider], live[provider])
+            time.sleep(delay)
+            with lock:
+                live[provider] -= 1
+            tier = "premium" if "Premium tier" in prompt else provider
+            return {"ok": True, "model": provider, "summary": f"{tier}:{prompt.splitlines()[0]}", "score": score}
+        return call
+
+    monkeypatch.setattr(review_multi, "_openai_chat", make("openai", 80))
+    monkeypatch.setattr(review_multi, "_gemini_review", make("gemini", 70))
+    monkeypatch.setattr(review_multi, "_grok_review", make("grok", 60))
+    return peak
+
+
+def _files(tmp_path, n: int):
+    out = []
+    for i in range(n):
+        p = tmp_path / "src" / f"f{i:02d}.tsx"
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(f"export const C{i} = () => null;\n")
+        out.append(str(p))
+    return out
+
+
+def _strip_ts(path: str) -> dict:
+    data = json.loads(open(path, encoding="utf-8").read())
+    data.pop("ts", None)
+    return data
+
+
+def test_concurrent_run_matches_sequential(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("AIO_PROVIDERS", raising=False)
+    _fake_providers(monkeypatch, delay=0.01)
+    files = _files(tmp_path, 6)
+
+    seq = review_multi.run(files, "seq", str(tmp_path), file_workers=1)
+    par = review_multi.run(files, "par", str(tmp_path), file_workers=4)
+
+    assert [p.replace("/par/", "/seq/") for p in par] == seq
+    assert [p.split("/")[3] for p in seq[:3]] == ["Free", "Premium", "Wow++"]
+    for a, b in zip(seq, par):
+        assert _strip_ts(a) == _strip_ts(b)
+
+
+def test_per_provider_caps_and_wall_time(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("AIO_PROVIDERS", raising=False)
+    monkeypatch.setenv("AIO_REVIEW_CAP_OPENAI", "4")
+    monkeypatch.setenv("AIO_REVIEW_CAP_GEMINI", "2")
+    monkeypatch.setenv("AIO_REVIEW_CAP_GROK", "1")
+    peak = _fake_providers(monkeypatch, delay=0.05)
+    files = _files(tmp_path, 8)
+
+    t0 = time.perf_counter()
+    links = review_multi.run(files, "caps", str(tmp_path), file_workers=8)
+    elapsed = time.perf_counter() - t0
+
+    assert len(links) == 3 * len(files)
+    assert peak == {"openai": 4, "gemini": 2, "grok": 1}
+    # sequential would be 8 files x 4 calls x 50ms = 1.6s; grok (cap 1) bounds it at ~0.4s
+    assert elapsed < 1.0
+
+
+def test_disabled_provider_note_unchanged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AIO_PROVIDERS", "OpenAI")
+    _fake_providers(monkeypatch, delay=0.0)
+    links = review_multi.run(_files(tmp_path, 1), "off", str(tmp_path))
+    wow = _strip_ts(links[2])
+    assert wow["providers"]["gemini"]["note"] == "Gemini disabled"
+    assert wow["providers"]["grok"]["note"] == "Grok disabled"
+
+
+def test_large_file_is_chunked_and_reduced(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("AIO_PROVIDERS", raising=False)
+    monkeypatch.setenv("AIO_REVIEW_CHUNK_TOKENS", "200")
+    prompts = []
+
+    def chat(prompt: str, model: str = "") -> dict:
+        prompts.append(prompt)
+        score = 90 if prompt.startswith("File: src/big.tsx\nTask: Merge") else 50
+        return {"ok": True, "model": model, "summary": f"s{len(prompts)}", "score": score}
+
+    for name in ("_openai_chat", "_gemini_review", "_grok_review"):
+        monkeypatch.setattr(review_multi, name, chat)
+    big = tmp_path / "src" / "big.tsx"
+    big.parent.mkdir(parents=True)
+    big.write_text("".join(f"export function f{i}() {{ return {i}; }}\n" for i in range(200)))
+
+    links = review_multi.run([str(big)], "big", str(tmp_path))
+    free = _strip_ts(links[0])
+    assert free["worth_score"] == review_multi._avg([review_multi._baseline_score(str(big)), 90])
+    parts = [p for p in prompts if "(part " in p]
+    assert parts and "f199" in "".join(parts)  # the tail of the file was reviewed too
+    assert sum(p.startswith("File: src/big.tsx\nTask: Merge") for p in prompts) == 4  # one reduce per tier call
+
+
+def test_chunk_calls_stay_within_provider_caps(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("AIO_PROVIDERS", raising=False)
+    monkeypatch.setenv("AIO_REVIEW_CHUNK_TOKENS", "200")
+    monkeypatch.setenv("AIO_REVIEW_CAP_OPENAI", "2")
+    monkeypatch.setenv("AIO_REVIEW_CAP_GEMINI", "1")
+    monkeypatch.setenv("AIO_REVIEW_CAP_GROK", "1")
+    peak = _fake_providers(monkeypatch, delay=0.02)
+    files = []
+    for n in range(3):
+        big = tmp_path / "src" / f"big{n}.tsx"
+        big.parent.mkdir(parents=True, exist_ok=True)
+        big.write_text("".join(f"export function f{i}() {{ return {i}; }}\n" for i in range(200)))
+        files.append(str(big))
+
+    review_multi.run(files, "chunked", str(tmp_path), file_workers=3)
+    assert peak == {"openai": 2, "gemini": 1, "grok": 1}
@@ -0,0 +1,67 @@
+# Path: tests/test_source_index.py
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from app.source_index import SourceIndex, stat_entries
+
+
+def _analyze_counter(calls: list):
+    def analyze(path: Path, text: str, size: int):
+        calls.append(path.name)
+        return [text.strip()], float(size)
+    return analyze
+
+
+def test_sync_only_reads_new_or_changed(tmp_path: Path):
+    src = tmp_path / "src"
+    src.mkdir()
+    a = src / "a.js"
+    a.write_text("alpha", encoding="utf-8")
+    b = src / "b.tsx"
+    b.write_text("beta", encoding="utf-8")
+
+    idx = SourceIndex(tmp_path / "idx.sqlite")
+    calls: list = []
+    rows, stats = idx.sync(src, stat_entries([a, b]), _analyze_counter(calls))
+    assert sorted(calls) == ["a.js", "b.tsx"] and stats.added == 2
+    assert {r.path.name: r.functions for r in rows} == {"a.js": ["alpha"], "b.tsx": ["beta"]}
+
+    # unchanged tree: nothing re-read
+    calls.clear()
+    _rows, stats = idx.sync(src, stat_entries([a, b]), _analyze_counter(calls))
+    assert calls == [] and stats.seen == 2
+
+    # touched but identical content: hash matches, facts kept
+    st = a.stat()
+    os.utime(a, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    _rows, stats = idx.sync(src, stat_entries([a, b]), _analyze_counter(calls))
+    assert calls == [] and stats.rehashed_same == 1
+
+    # edited + deleted
+    a.write_text("alpha-2", encoding="utf-8")
+    b.unlink()
+    rows, stats = idx.sync(src, stat_entries([a]), _analyze_counter(calls))
+    assert calls == ["a.js"] and stats.changed == 1 and stats.removed == 1
+    assert idx.count() == 1 and rows[0].functions == ["alpha-2"]
+    idx.close()
+
+
+def test_batch_analyzer_gets_only_changed_files(tmp_path: Path):
+    a = tmp_path / "a.js"
+    a.write_text("alpha", encoding="utf-8")
+    b = tmp_path / "b.js"
+    b.write_text("beta", encoding="utf-8")
+    idx = SourceIndex(tmp_path / "idx.sqlite")
+    batches: list = []
+
+    def many(items):
+        batches.append([p.name for p, _t, _s in items])
+        return [([t], float(s)) for _p, t, s in items]
+
+    idx.update(stat_entries([a, b]), _analyze_counter([]), many)
+    b.write_text("beta two", encoding="utf-8")
+    rows, _stats = idx.update(stat_entries([a, b]), _analyze_counter([]), many)
+    assert batches == [["a.js", "b.js"], ["b.js"]]
+    assert [r.functions for r in rows] == [["alpha"], ["beta two"]]
@@ -0,0 +1,90 @@
+# Path: tests/test_storage.py
+from __future__ import annotations
+
+import time
+
+from core.storage import RunStore, open_store, pr_number
+
+
+def test_batched_writes_flush_on_threshold_and_query(tmp_path):
+    st = RunStore(tmp_path / "runs.sqlite", batch=3)
+    st.start_run("r1", source="cli", mode="generate", count=2)
+    st.add_file_results("r1", [{"path": "a.ts", "status": "ok", "ms": 5.0}])
+    # below the threshold nothing is on disk yet (a second reader sees nothing)
+    other = RunStore(tmp_path / "runs.sqlite")
+    assert other.run("r1")["files"] == []
+    st.add_file_results("r1", [{"path": "b.ts", "status": "error", "error": "boom"}, {"path": "c.ts", "status": "ok"}])
+    assert [f["path"] for f in other.run("r1")["files"]] == ["a.ts", "b.ts", "c.ts"]
+    assert '"error": "boom"' in other.run("r1")["files"][1]["detail"]
+
+
+def test_latest_pr_per_run_and_overall(tmp_path):
+    st = RunStore(tmp_path / "runs.sqlite")
+    st.add_pr("r1", "https://github.com/o/r/pull/7", "ts-migration/rolling")
+    st.add_pr("r2", "https://github.com/o/r/pull/9")
+    st.add_pr("r1", "https://github.com/o/r/pull/8")
+    assert st.latest_pr("r1").endswith("/8")
+    assert st.latest_pr().endswith("/8")
+    assert st.latest_pr("nope") is None
+    assert st.run("r1") is None  # PRs alone do not create a run row
+    assert pr_number("https://github.com/o/r/pull/12") == 12
+
+
+def test_pass_rate_window_and_step(tmp_path):
+    st = RunStore(tmp_path / "runs.sqlite")
+    st.add_gates("r1", {"build": {"pass": True, "exit": 0}, "test": {"pass": False, "exit": 1},
+                        "lint": {"pass": True, "exit": 0}})
+    st.add_gates("r2", {"build": {"pass": True, "exit": 0}, "ci": {"exit": 0}})
+    rate = st.pass_rate()
+    assert (rate["total"], rate["passed"], rate["rate"]) == (4, 3, 0.75)
+    assert st.pass_rate(step="test")["rate"] == 0.0
+    assert st.pass_rate(since=time.time() + 60)["rate"] is None
+
+
+def test_run_record_and_recent(tmp_path):
+    st = RunStore(tmp_path / "runs.sqlite")
+    st.start_run("r1", source="cli")
+    time.sleep(0.01)
+    st.start_run("r2", source="api")
+    st.add_timings("r2", {"convert": 12.5, "total": 20.0})
+    st.finish_run("r2", "partial")
+    assert st.latest_run_id() == "r2"
+    assert [r["run_id"] for r in st.recent_runs()] == ["r2", "r1"]
+    run = st.run("r2")
+    assert run["status"] == "partial" and run["finished_at"] and run["timings"] == {"convert": 12.5, "total": 20.0}
+
+
+def test_open_store_disabled(monkeypatch):
+    monkeypatch.setenv("AIO_RUN_STORE", "off")
+    assert open_store() is None
+
+
+def test_gates_only_runs_are_finished_and_not_latest(tmp_path):
+    st = RunStore(tmp_path / "runs.sqlite")
+    st.start_run("batch", source="cli")
+    time.sleep(0.01)
+    st.start_run("g1", source="gates")
+    st.start_run("batch", source="gates")  # gates for an existing run keep its source
+    st.finish_run("g1", "failed", source="gates")
+    st.finish_run("batch", "failed", source="gates")
+    assert st.latest_run_id() == "batch"
+    assert st.run("g1")["status"] == "failed" and st.run("g1")["finished_at"]
+    assert st.run("batch")["status"] != "failed" and not st.run("batch")["finished_at"]
+
+
+def test_latest_report_path_prefers_the_store(tmp_path, monkeypatch):
+    from core.report_utils import latest_report_path
+
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    (reports / "run-old.json").write_text("{}")
+    time.sleep(0.01)
+    (reports / "run-touched.json").write_text("{}")  # newest mtime, but not the newest run
+    monkeypatch.setenv("AIO_RUN_STORE", "off")
+    assert latest_report_path(reports).name == "run-touched.json"
+    monkeypatch.setenv("AIO_RUN_STORE", str(tmp_path / "runs.sqlite"))
+    st = open_store()
+    st.start_run("run-touched", source="cli")
+    time.sleep(0.01)
+    st.start_run("run-old", source="cli")
+    assert latest_report_path(reports).name == "run-old.json"
@@ -0,0 +1,105 @@
+# Path: tests/test_streaming.py
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import http_transport, rate_limiter
+from app.services.llm import streaming
+from app.services.llm.streaming import StreamGuard
+
+pytestmark = pytest.mark.skipif(not http_transport.available(), reason="requests/httpx not installed")
+
+
+def _feed(guard: StreamGuard, pieces):
+    for p in pieces:
+        stop = guard.feed(p)
+        if stop:
+            return stop
+    return None
+
+
+def test_guard_stops_at_closing_fence_split_across_chunks():
+    g = StreamGuard("Convert to TypeScript", expect_fence=True)
+    assert _feed(g, ["Here:\n``", "`ts\nconst a", " = 1;\n`", "``\n", "trailing prose"]) == "fence"
+    assert g.text.endswith("```\n")
+    assert streaming.StreamResult(g.text, "fence").code == "const a = 1;"
+
+
+def test_guard_aborts_on_echo_and_missing_fence():
+    prompt = "Convert to TypeScript/TSX as appropriate.\n\nFile: src/a.js\nJS/JSX:\n```javascript\nx\n```"
+    echo = StreamGuard(prompt, echo_chars=24)
+    assert _feed(echo, ["Convert to TypeScript/", "TSX as appropriate. File"]) == "abort:echo"
+
+    ramble = StreamGuard("p", expect_fence=True, fence_chunks=5)
+    assert _feed(ramble, ["words "] * 10) == "abort:no_fence"
+    assert ramble.chunks == 5
+
+    fine = StreamGuard(prompt, echo_chars=24)
+    assert _feed(fine, ["```typescript\n", "const x: number = 1;\n"]) is None
+
+
+class _SSE(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # chunked, like the real SSE endpoints
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        def chunk(data: bytes) -> None:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        parts = ["```ts\n", "export const a = 1;\n", "```", "\n"] + ["more text "] * 50
+        try:
+            for part in parts:
+                ev = {"choices": [{"delta": {"content": part}}]}
+                chunk(f"data: {json.dumps(ev)}\n\n".encode())
+                time.sleep(0.02)
+            chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *a):
+        pass
+
+
+def test_stream_completion_stops_reading_at_fence():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _SSE)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    rate_limiter.reset()
+    try:
+        t0 = time.perf_counter()
+        res = streaming.stream_completion(
+            "stream-test", f"http://127.0.0.1:{srv.server_address[1]}/v1/chat/completions",
+            json_body={"stream": True}, guard=StreamGuard("prompt", expect_fence=True))
+        elapsed = time.perf_counter() - t0
+    finally:
+        srv.shutdown()
+        http_transport.close_all()
+    assert res.stop == "fence" and res.ok
+    assert res.code == "export const a = 1;"
+    assert "more text" not in res.text
+    assert elapsed < 0.5  # the 50 trailing chunks (~1s) were never waited for
+
+
+def test_stream_completion_passes_retries_to_the_limiter(monkeypatch):
+    seen = {}
+
+    def call(provider, fn, *, tokens=1, retries=None):
+        seen.update(provider=provider, tokens=tokens, retries=retries)
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(rate_limiter, "call", call)
+    res = streaming.stream_completion("openai", "http://127.0.0.1:9/v1", guard=StreamGuard(), tokens=7, retries=0)
+    assert res.stop == "error:ConnectionError"
+    assert seen == {"provider": "openai", "tokens": 7, "retries": 0}
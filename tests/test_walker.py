@@ -0,0 +1,40 @@
+# Path: tests/test_walker.py
+from __future__ import annotations
+
+from pathlib import Path
+
+from core.walker import iter_files, walk_files
+
+
+def _touch(p: Path, text: str = "x") -> Path:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+    return p
+
+
+def test_walk_prunes_skip_dirs_and_filters_exts(tmp_path: Path):
+    r1, r2 = tmp_path / "r1", tmp_path / "r2"
+    keep = [
+        _touch(r1 / "a.js"),
+        _touch(r1 / "ui" / "B.tsx", "hello"),
+        _touch(r1 / "ui" / "deep" / "c.ts"),
+        _touch(r2 / "lib" / "d.jsx"),
+    ]
+    _touch(r1 / "node_modules" / "pkg" / "index.js")
+    _touch(r1 / "ui" / "Dist" / "bundle.js")       # case-insensitive prune
+    _touch(r1 / "ui" / "notes.md")
+
+    for workers in (1, 4):
+        got = walk_files([r1, r2, tmp_path / "missing"], skip_dirs={"node_modules", "dist"},
+                         exts=["js", ".JSX", "ts", "tsx"], workers=workers)
+        assert sorted(e.path for e in got) == sorted(keep)
+        by_name = {e.name: e for e in got}
+        assert by_name["B.tsx"].size == 5 and by_name["B.tsx"].root == r1
+        assert by_name["d.jsx"].root == r2
+
+
+def test_iter_files_skip_file_predicate(tmp_path: Path):
+    _touch(tmp_path / "Widget.js")
+    _touch(tmp_path / "12345.js")
+    names = [e.name for e in iter_files(tmp_path, skip_dirs=(), skip_file=lambda n: n[0].isdigit())]
+    assert names == ["Widget.js"]
@@ -25,11 +25,17 @@ import os
 import re
 import sys
 import json
-import hashlib
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Iterator, List, Dict, Tuple, Optional
 
+# repo root on sys.path so the shared engines import when run as a script
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core.hashing import hash_file, hash_files  # noqa: E402 - needs the sys.path entry above
+
 # ---------------- Defaults ----------------
 DEFAULT_ROOT = Path(os.getenv("CFH_SCAN_ROOT") or r"C:\c\ai-orchestrator")
 REPORTS      = Path(os.getenv("CFH_REPORTS_DIR") or (DEFAULT_ROOT / "reports"))
@@ -105,14 +111,7 @@ def safe_head_sample(path: Path, max_bytes: int = MAX_SAMPLE_BYTES) -> str:
 
 def sha1_of_file(path: Path, max_bytes: Optional[int] = None) -> str:
     try:
-        h = hashlib.sha1()
-        with open(path, "rb") as f:
-            if max_bytes is None:
-                for chunk in iter(lambda: f.read(65536), b""):
-                    h.update(chunk)
-            else:
-                h.update(f.read(max_bytes))
-        return h.hexdigest()
+        return hash_file(path, "sha1", max_bytes)
     except Exception:
         return ""
 
@@ -126,6 +125,7 @@ def rel(root: Path, p: Path) -> str:
 def collect_inventory(root: Path, grep: Optional[str] = None) -> Dict:
     debug_lines: List[str] = []
     files: List[Dict] = []
+    hash_paths: List[Path] = []
     counts_by_ext: Dict[str, int] = {}
     top_dirs: Dict[str, int] = {}
 
@@ -168,9 +168,15 @@ def collect_inventory(root: Path, grep: Optional[str] = None) -> Dict:
                 "ext": ext,
                 "size": size,
                 "mtime": mtime,
-                "sha1_64k": sha1_of_file(p, 65536),  # fast-ish integrity/fingerprint
+                "sha1_64k": "",                      # filled by the batch hasher below
                 "sample": sample[:4000],             # cap per-file sample
             })
+            hash_paths.append(p)
+
+    # fast-ish integrity/fingerprint: first 64 KB, hashed concurrently
+    digests = hash_files(hash_paths, "sha1", max_bytes=65536)
+    for f, p in zip(files, hash_paths):
+        f["sha1_64k"] = digests.get(p) or ""
 
     # pretty dir tree
     tree_lines = []
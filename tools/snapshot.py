@@ -5,14 +5,21 @@ Directory Snapshot Utility — generates JSON/Markdown tree under reports/.
 """
 from __future__ import annotations
 import argparse
-import hashlib
 import json
 import os
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
+# repo root on sys.path so the shared engines import when run as a script
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from core.hashing import hash_file, hash_files  # noqa: E402 - needs the sys.path entry above
+
 # ---------- Models ----------
 @dataclass
 class FileInfo:
@@ -103,11 +110,7 @@ def safe_text_preview(p: Path, max_bytes: int) -> Tuple[Optional[str], Optional[
 
 def compute_sha256(p: Path) -> Optional[str]:
     try:
-        h = hashlib.sha256()
-        with p.open("rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                h.update(chunk)
-        return h.hexdigest()
+        return hash_file(p, "sha256")
     except Exception:
         return None
 
@@ -175,13 +178,18 @@ def collect_snapshot(root: Path, excludes: Iterable[str], max_preview_bytes: int
             preview, line_count = (None, None)
             if ext in TEXT_EXTS and size <= max_preview_bytes:
                 preview, line_count = safe_text_preview(p, max_preview_bytes)
-            sha256 = compute_sha256(p) if hashes else None
 
-            files.append(FileInfo(rel, size, mtime, ext, line_count, preview, sha256))
+            files.append(FileInfo(rel, size, mtime, ext, line_count, preview, None))
             ext_bucket = by_ext.setdefault(ext, {"files": 0, "bytes": 0})
             ext_bucket["files"] += 1
             ext_bucket["bytes"] += size
 
+    if hashes:
+        # hash the whole listing at once on the engine's thread pool
+        digests = hash_files([root / fi.rel_path for fi in files], "sha256")
+        for fi in files:
+            fi.sha256 = digests.get(root / fi.rel_path)
+
     return Snapshot(
         root=str(root),
         generated_at=datetime.now(timezone.utc).isoformat(),